@@ -0,0 +1,41 @@
+"""monthly rollups
+
+Revision ID: 3b9e1f7c2a10
+Revises: 6a253aeef0cb
+Create Date: 2026-10-17 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1f7c2a10'
+down_revision: Union[str, Sequence[str], None] = '6a253aeef0cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monthly_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month_start', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('type', postgresql.ENUM('income', 'expense', name='txn_type', create_type=False), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.Column('max_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name=op.f('fk_monthly_rollups_category_id_categories'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_monthly_rollups_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'month_start', 'category_id', 'type', name='pk_monthly_rollups')
+    )
+    # mevcut veriler için: python -m app.cli rebuild-rollups
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_rollups')
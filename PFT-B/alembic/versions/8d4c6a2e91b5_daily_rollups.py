@@ -0,0 +1,38 @@
+"""daily rollups
+
+Revision ID: 8d4c6a2e91b5
+Revises: 3b9e1f7c2a10
+Create Date: 2026-10-17 11:03:27.904115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4c6a2e91b5'
+down_revision: Union[str, Sequence[str], None] = '3b9e1f7c2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('type', postgresql.ENUM('income', 'expense', name='txn_type', create_type=False), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_daily_rollups_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'type', name='pk_daily_rollups')
+    )
+    # mevcut veriler için: python -m app.cli rebuild-rollups
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_rollups')
@@ -0,0 +1,51 @@
+"""transaction archives and deleted_at index
+
+Revision ID: a3c7e9f1d254
+Revises: f6b0d1e8a925
+Create Date: 2026-10-17 17:52:09.614203
+
+- transaction_archives: `python -m app.cli archive` ile taşınan işlemler
+  (kullanıcı × ay başına zlib ile sıkıştırılmış NDJSON)
+- ix_tx_deleted_at (deleted_at) WHERE deleted_at IS NOT NULL: `python -m app.cli purge-deleted`
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9f1d254'
+down_revision: Union[str, Sequence[str], None] = 'f6b0d1e8a925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DELETED = sa.text("deleted_at IS NOT NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month_start', sa.Date(), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.Column('codec', sa.String(length=16), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_transaction_archives_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_transaction_archives'))
+    )
+    op.create_index('ix_tx_archives_user_month', 'transaction_archives', ['user_id', 'month_start'], unique=False)
+    op.create_index(
+        'ix_tx_deleted_at', 'transactions', ['deleted_at'], unique=False,
+        postgresql_where=DELETED, sqlite_where=DELETED,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tx_deleted_at', table_name='transactions')
+    op.drop_index('ix_tx_archives_user_month', table_name='transaction_archives')
+    op.drop_table('transaction_archives')
@@ -0,0 +1,28 @@
+"""user data_version
+
+Revision ID: a71f3c9d05e2
+Revises: 8d4c6a2e91b5
+Create Date: 2026-10-17 13:41:09.226840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71f3c9d05e2'
+down_revision: Union[str, Sequence[str], None] = '8d4c6a2e91b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'data_version')
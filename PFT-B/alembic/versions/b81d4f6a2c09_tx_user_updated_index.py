@@ -0,0 +1,31 @@
+"""transactions (user_id, updated_at) index
+
+Revision ID: b81d4f6a2c09
+Revises: a3c7e9f1d254
+Create Date: 2026-10-17 18:31:47.208416
+
+/reports `recurring` tespiti (app/services/recurring.py) kullanıcının son değişen
+satırlarını `updated_at >= watermark` ile okur; soft-delete edilmiş satırlar da dahil
+olduğu için partial değil.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d4f6a2c09'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e9f1d254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tx_user_updated', 'transactions', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tx_user_updated', table_name='transactions')
@@ -0,0 +1,66 @@
+"""transaction search index
+
+Revision ID: c4e82b17f6d3
+Revises: a71f3c9d05e2
+Create Date: 2026-10-17 14:27:52.113904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e82b17f6d3'
+down_revision: Union[str, Sequence[str], None] = 'a71f3c9d05e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# app/services/search.py ile aynı ifade/DDL (migration'lar app koduna bağlı kalmasın diye kopya)
+PG_DOCUMENT = "to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(note, ''))"
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        title, note, content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, title, note) VALUES (new.id, new.title, new.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, title, note) VALUES ('delete', old.id, old.title, old.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF title, note ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, title, note) VALUES ('delete', old.id, old.title, old.note);
+        INSERT INTO transactions_fts(rowid, title, note) VALUES (new.id, new.title, new.note);
+    END""",
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_tx_search_fts ON transactions USING gin ({PG_DOCUMENT})")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_tx_title_trgm ON transactions USING gin (title gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_tx_note_trgm ON transactions USING gin (note gin_trgm_ops)")
+    elif dialect == "sqlite":
+        for ddl in SQLITE_DDL:
+            op.execute(ddl)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tx_note_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_tx_title_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_tx_search_fts")
+    elif dialect == "sqlite":
+        for trg in ("transactions_fts_au", "transactions_fts_ad", "transactions_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trg}")
+        op.execute("DROP TABLE IF EXISTS transactions_fts")
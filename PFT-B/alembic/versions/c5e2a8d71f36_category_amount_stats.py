@@ -0,0 +1,45 @@
+"""category amount stats
+
+Revision ID: c5e2a8d71f36
+Revises: b81d4f6a2c09
+Create Date: 2026-10-17 19:06:12.553870
+
+/reports `anomalies` için (kullanıcı, kategori) başına gider tutarlarının Welford momentleri.
+ln() SQLite'ta her derlemede olmadığı için doldurma uygulama tarafında yapılır; upgrade'den sonra:
+
+    python -m app.cli backfill-anomaly-stats
+
+Doldurulana kadar anomalies boş döner; yeni yazmalar satırları kendiliğinden açar.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a8d71f36'
+down_revision: Union[str, Sequence[str], None] = 'b81d4f6a2c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_amount_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('n', sa.Integer(), nullable=False),
+    sa.Column('mean', sa.Float(), nullable=False),
+    sa.Column('m2', sa.Float(), nullable=False),
+    sa.Column('log_mean', sa.Float(), nullable=False),
+    sa.Column('log_m2', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name=op.f('fk_category_amount_stats_category_id_categories'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_category_amount_stats_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'category_id', name='pk_category_amount_stats')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('category_amount_stats')
@@ -0,0 +1,71 @@
+"""budget counters and notifications
+
+Revision ID: d93b5e0a7c41
+Revises: c4e82b17f6d3
+Create Date: 2026-10-17 16:05:31.482117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93b5e0a7c41'
+down_revision: Union[str, Sequence[str], None] = 'c4e82b17f6d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# app/services/budgets.py recount() ile aynı hesap (bildirim üretilmez)
+BACKFILL_SPENT = """
+UPDATE budgets SET spent_amount = (
+    SELECT COALESCE(SUM(r.total), 0) FROM monthly_rollups r
+    WHERE r.user_id = budgets.user_id
+      AND r.month_start = budgets.month_start
+      AND r.type = 'expense'
+      AND (budgets.category_id IS NULL OR r.category_id = budgets.category_id)
+)
+"""
+BACKFILL_LEVEL = """
+UPDATE budgets SET alert_level = CASE
+    WHEN limit_amount > 0 AND spent_amount * 100 >= limit_amount * 100 THEN 100
+    WHEN limit_amount > 0 AND spent_amount * 100 >= limit_amount * 80 THEN 80
+    ELSE 0
+END
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('budgets', sa.Column('spent_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False))
+    op.add_column('budgets', sa.Column('alert_level', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('budget_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('month_start', sa.Date(), nullable=True),
+    sa.Column('threshold', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('limit_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], name=op.f('fk_notifications_budget_id_budgets'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name=op.f('fk_notifications_category_id_categories'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_notifications_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_notifications'))
+    )
+    op.create_index('ix_notifications_user_created', 'notifications', ['user_id', 'created_at'], unique=False)
+    op.execute(BACKFILL_SPENT)
+    op.execute(BACKFILL_LEVEL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_column('budgets', 'alert_level')
+    op.drop_column('budgets', 'spent_amount')
@@ -0,0 +1,132 @@
+"""partition transactions by month
+
+Revision ID: e2a9c4f7b310
+Revises: d93b5e0a7c41
+Create Date: 2026-10-17 16:48:12.905513
+
+Postgres: `transactions` PARTITION BY RANGE (occurred_at) olarak yeniden kurulur.
+- aylık partition'lar: ilk işlemin ayından bu ay + FUTURE_MONTHS'a kadar; sonrakiler
+  `python -m app.cli partitions` (app/db/partitions.py) ile açılır
+- aralık dışı satırlar için DEFAULT partition
+- partitioned tabloda PK partition anahtarını içermek zorunda: (id, occurred_at).
+  id hâlâ tek başına benzersiz (aynı sequence); ORM tarafı id'yi PK olarak kullanmaya devam eder
+- tüm indexler parent'ta (partitioned index) tanımlanır, her partition'a kendiliğinden iner;
+  `occurred_at` üzerindeki tüm aralık filtreleri (reports/dashboard/transactions) partition
+  pruning'e uygun
+Veri INSERT ... SELECT ile tek transaction'da kopyalanır; büyük tablolarda bakım penceresinde
+çalıştırılmalı.
+
+SQLite: düz tablo olarak kalır (no-op).
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4f7b310'
+down_revision: Union[str, Sequence[str], None] = 'd93b5e0a7c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FUTURE_MONTHS = 3
+COLUMNS = "id, user_id, category_id, type, title, amount, occurred_at, note, deleted_at, created_at, updated_at"
+
+TABLE_DDL = """
+CREATE TABLE {name} (
+    id          INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+    user_id     INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    type        txn_type NOT NULL,
+    title       VARCHAR(120) NOT NULL,
+    amount      NUMERIC(12, 2) NOT NULL,
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    note        VARCHAR(300),
+    deleted_at  TIMESTAMP WITH TIME ZONE,
+    created_at  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+){suffix}
+"""
+
+# tablo adı `transactions` olduktan sonra (isimler eski tabloyla çakışmasın diye)
+CONSTRAINTS_AND_INDEXES = [
+    "ALTER TABLE transactions ADD CONSTRAINT ck_transactions_ck_transactions_amount_pos CHECK (amount > 0)",
+    "ALTER TABLE transactions ADD CONSTRAINT ck_transactions_ck_transactions_not_future CHECK (occurred_at <= NOW())",
+    "ALTER TABLE transactions ADD CONSTRAINT fk_transactions_user_id_users "
+    "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+    "ALTER TABLE transactions ADD CONSTRAINT fk_transactions_category_id_categories "
+    "FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE RESTRICT",
+    "CREATE INDEX ix_transactions_user_id ON transactions (user_id)",
+    "CREATE INDEX ix_tx_category ON transactions (category_id)",
+    "CREATE INDEX ix_tx_type ON transactions (type)",
+    "CREATE INDEX ix_tx_user_date ON transactions (user_id, occurred_at)",
+    # c4e82b17f6d3 ile aynı arama indexleri
+    "CREATE INDEX ix_tx_search_fts ON transactions USING gin "
+    "(to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(note, '')))",
+    "CREATE INDEX ix_tx_title_trgm ON transactions USING gin (title gin_trgm_ops)",
+    "CREATE INDEX ix_tx_note_trgm ON transactions USING gin (note gin_trgm_ops)",
+]
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def _bound(d: date) -> str:
+    return f"'{d.isoformat()} 00:00:00+00'"
+
+
+def _swap(new_table_ddl_suffix: str, pk: str, after_create) -> None:
+    """Yeni `transactions_new`i kur, veriyi kopyala, eskisini düşür, adını değiştir."""
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+    op.execute(TABLE_DDL.format(name="transactions_new", suffix=new_table_ddl_suffix))
+    after_create()
+    op.execute(f"INSERT INTO transactions_new ({COLUMNS}) SELECT {COLUMNS} FROM transactions")
+    op.execute("DROP TABLE transactions")
+    op.execute("ALTER TABLE transactions_new RENAME TO transactions")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute(f"ALTER TABLE transactions ADD CONSTRAINT pk_transactions PRIMARY KEY ({pk})")
+    for ddl in CONSTRAINTS_AND_INDEXES:
+        op.execute(ddl)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    first = bind.scalar(sa.text(
+        "SELECT min(date_trunc('month', occurred_at AT TIME ZONE 'UTC'))::date FROM transactions"
+    ))
+    today = datetime.now(timezone.utc).date()
+    month = first or date(today.year, today.month, 1)
+    last = date(today.year, today.month, 1)
+    for _ in range(FUTURE_MONTHS):
+        last = _next_month(last)
+
+    def create_partitions():
+        m = month
+        while m <= last:
+            op.execute(
+                f"CREATE TABLE transactions_y{m.year:04d}m{m.month:02d} PARTITION OF transactions_new "
+                f"FOR VALUES FROM ({_bound(m)}) TO ({_bound(_next_month(m))})"
+            )
+            m = _next_month(m)
+        op.execute("CREATE TABLE transactions_default PARTITION OF transactions_new DEFAULT")
+
+    _swap(" PARTITION BY RANGE (occurred_at)", "id, occurred_at", create_partitions)
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    # partition'lar parent ile birlikte düşer
+    _swap("", "id", lambda: None)
+    op.execute("ANALYZE transactions")
@@ -0,0 +1,55 @@
+"""partial covering transaction indexes
+
+Revision ID: f6b0d1e8a925
+Revises: e2a9c4f7b310
+Create Date: 2026-10-17 17:20:44.310876
+
+- ix_tx_live_user_date (user_id, occurred_at, id) INCLUDE (amount, type, category_id)
+  WHERE deleted_at IS NULL: liste/cursor, son işlemler, en büyük gider, export
+- ix_tx_live_user_cat_date (user_id, category_id, occurred_at) INCLUDE (amount, type)
+  WHERE deleted_at IS NULL: kategori filtresi, rollup max_amount yeniden hesabı
+- ix_tx_user_date: yerini ix_tx_live_user_date aldı (user FK cascade için ix_transactions_user_id kalır)
+- ix_tx_type: iki değerli kolon, hiçbir sorgu tek başına kullanmıyor
+SQLite INCLUDE desteklemez; orada sadece partial index kurulur.
+Partitioned tabloda CREATE INDEX CONCURRENTLY yok; index'ler kısa bir yazma kilidiyle kurulur.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b0d1e8a925'
+down_revision: Union[str, Sequence[str], None] = 'e2a9c4f7b310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tx_live_user_date', 'transactions', ['user_id', 'occurred_at', 'id'], unique=False,
+        postgresql_include=['amount', 'type', 'category_id'],
+        postgresql_where=LIVE, sqlite_where=LIVE,
+    )
+    op.create_index(
+        'ix_tx_live_user_cat_date', 'transactions', ['user_id', 'category_id', 'occurred_at'], unique=False,
+        postgresql_include=['amount', 'type'],
+        postgresql_where=LIVE, sqlite_where=LIVE,
+    )
+    op.drop_index('ix_tx_user_date', table_name='transactions')
+    op.drop_index('ix_tx_type', table_name='transactions')
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tx_type', 'transactions', ['type'], unique=False)
+    op.create_index('ix_tx_user_date', 'transactions', ['user_id', 'occurred_at'], unique=False)
+    op.drop_index('ix_tx_live_user_cat_date', table_name='transactions')
+    op.drop_index('ix_tx_live_user_date', table_name='transactions')
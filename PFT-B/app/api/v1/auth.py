@@ -2,19 +2,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserOut
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    PasswordHasherBusy,
+    hash_password_pooled,
+    verify_password_pooled,
     create_access_token,
     create_refresh_token,
 )
 from app.core.config import settings
+from app.core.principal import Principal, auth_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer()
@@ -27,6 +27,13 @@ def get_db():
     finally:
         db.close()
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 # --- REGISTER ---------------------------------------------------------------
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 def register(user: UserCreate, db: Session = Depends(get_db)):
@@ -34,10 +41,15 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     if exists:
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    try:
+        password_hash = hash_password_pooled(user.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
     new_user = User(
         name=user.name,
         email=user.email,
-        password_hash=get_password_hash(user.password),
+        password_hash=password_hash,
     )
     db.add(new_user)
     db.commit()
@@ -48,8 +60,18 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login")
 def login(user: UserLogin, response: Response, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password_hash):
+    if not db_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        ok, new_hash = verify_password_pooled(user.password, db_user.password_hash)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # BCRYPT_ROUNDS değişmiş: şifre elimizdeyken şeffafça yeniden hash'le
+        db_user.password_hash = new_hash
+        db.commit()
 
     # short-lived access, long-lived refresh
     access_token = create_access_token(subject=str(db_user.id))     # typ=access
@@ -84,6 +106,8 @@ def refresh_token(
     if not refresh_token:
         raise HTTPException(status_code=401, detail="No refresh token")
 
+    from jose import jwt, JWTError                       # lazy: import maliyeti ilk istekte
+    from jose.exceptions import ExpiredSignatureError, JWTClaimsError
     try:
         payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         sub = payload.get("sub")
@@ -111,9 +135,15 @@ def logout(response: Response):
 # --- Protected helper -------------------------------------------------------
 def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-):
+) -> Principal:
+    """Principal döner (ORM User değil). Cache'te varsa JWT decode ve DB sorgusu yapılmaz."""
     token = creds.credentials
+    principal = auth_cache.get(token)
+    if principal is not None:
+        return principal
+
+    from jose import jwt, JWTError                       # lazy: cache hit'te hiç gerekmez
+    from jose.exceptions import ExpiredSignatureError, JWTClaimsError
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         sub = payload.get("sub")
@@ -131,11 +161,19 @@ def get_current_user(
     except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    with SessionLocal() as db:
+        row = db.query(
+            User.id, User.name, User.email, User.is_active, User.created_at
+        ).filter(User.id == user_id).first()
+    if not row:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    if not row.is_active:
+        raise HTTPException(status_code=401, detail="Inactive user")
+
+    principal = Principal(*row)
+    auth_cache.set(token, principal, payload.get("exp"))
+    return principal
 
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
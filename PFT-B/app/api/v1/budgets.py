@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from decimal import Decimal
 from datetime import date
 from app.db.session import SessionLocal
 from app.models.budget import Budget
-from app.models.category import Category
+from app.core.catalog import category_catalog
 from app.schemas.budget import BudgetCreate, BudgetOut, BudgetUpdate
+from app.core.cache import bump_user_version
+from app.services import budgets as budget_counters
 from .auth import get_current_user
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
@@ -25,13 +28,22 @@ def _ym_to_date(ym: str) -> date:
 def _date_to_ym(d: date) -> str:
     return d.strftime("%Y-%m")
 
+def _write_conflict(db: Session, user_id: int, category_id: int | None):
+    # FK: cache'te duran kategori başka worker'da silinmiş; değilse aynı kapsamda eşzamanlı
+    # oluşturulmuş bütçe (unique)
+    db.rollback()
+    category_catalog.drop_stale(user_id)
+    if category_id is not None and category_id not in category_catalog.for_write(db, user_id, (category_id,)):
+        raise HTTPException(status_code=400, detail="Invalid categoryId")
+    raise HTTPException(status_code=400, detail="Budget already exists for this scope")
+
 def _to_out(b: Budget) -> BudgetOut:
     return BudgetOut(
         id=b.id,
         categoryId=b.category_id,
         month=_date_to_ym(b.month_start),  # <-- burada stringe çevir
         limit=float(b.limit_amount),
-
+        spent=float(b.spent_amount or 0),
         notify=b.notify,
     )
 
@@ -69,12 +81,8 @@ def create_budget(
 
     if body.categoryId is not None:
         # kategori kullanıcının mı veya global mi?
-        cat = db.query(Category).filter(
-            Category.id == body.categoryId,
-            # kullanıcının kategorisi veya global
-            (Category.user_id == user.id) | (Category.user_id.is_(None))
-        ).first()
-        if not cat:
+        # kullanıcının kategorisi veya global
+        if body.categoryId not in category_catalog.for_write(db, user.id, (body.categoryId,)):
             raise HTTPException(status_code=400, detail="Invalid categoryId")
 
     exists = db.query(Budget).filter(
@@ -93,6 +101,12 @@ def create_budget(
         notify=body.notify,
     )
     db.add(obj)
+    try:
+        db.flush()
+    except IntegrityError:
+        _write_conflict(db, user.id, body.categoryId)
+    budget_counters.sync(db, obj)   # ayın mevcut harcaması + eşik
+    bump_user_version(db, user.id)
     db.commit()
     db.refresh(obj)
     return _to_out(obj)
@@ -110,23 +124,30 @@ def update_budget(
 
     if body.categoryId is not None:
         if body.categoryId is not None:
-            cat = db.query(Category).filter(
-                Category.id == body.categoryId,
-                (Category.user_id == user.id) | (Category.user_id.is_(None))
-            ).first()
-            if not cat:
+            if body.categoryId not in category_catalog.for_write(db, user.id, (body.categoryId,)):
                 raise HTTPException(status_code=400, detail="Invalid categoryId")
         obj.category_id = body.categoryId
 
     if body.month is not None:
         obj.month_start = _ym_to_date(body.month)
 
+    if body.categoryId is not None or body.month is not None:
+        try:
+            db.flush()
+        except IntegrityError:
+            _write_conflict(db, user.id, body.categoryId)
+
     if body.limit is not None:
         obj.limit_amount = Decimal(str(body.limit))
 
     if body.notify is not None:
         obj.notify = body.notify
 
+    if body.categoryId is not None or body.month is not None:
+        obj.alert_level = 0             # yeni kapsam: eşikler baştan
+    if body.categoryId is not None or body.month is not None or body.limit is not None:
+        budget_counters.sync(db, obj)
+    bump_user_version(db, user.id)
     db.commit()
     db.refresh(obj)
     return _to_out(obj)
@@ -141,5 +162,6 @@ def delete_budget(
     if not obj:
         raise HTTPException(status_code=404, detail="Budget not found")
     db.delete(obj)
+    bump_user_version(db, user.id)
     db.commit()
     return {"id": budget_id}
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from app.db.session import SessionLocal
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryOut, CategoryUpdate
+from app.core.cache import bump_user_version
+from app.core.catalog import category_catalog
 from .auth import get_current_user  # senin mevcut auth dependency
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -33,16 +34,7 @@ def list_categories(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    rows = (
-        db.query(Category)
-        .filter(
-            Category.is_archived == False,
-            or_(Category.user_id == user.id, Category.user_id.is_(None)),
-        )
-        .order_by(Category.is_default.desc(), Category.name.asc())
-        .all()
-    )
-    return [_to_out(c) for c in rows]
+    return [_to_out(c) for c in category_catalog.for_user(db, user.id).active()]
 
 @router.post("", response_model=CategoryOut, status_code=status.HTTP_201_CREATED)
 def create_category(
@@ -69,7 +61,9 @@ def create_category(
         is_archived=False,
     )
     db.add(obj)
+    bump_user_version(db, user.id)
     db.commit()
+    category_catalog.invalidate_user(user.id)
     db.refresh(obj)
     return _to_out(obj)
 
@@ -107,7 +101,9 @@ def update_category(
     if body.isArchived is not None:
         obj.is_archived = body.isArchived
 
+    bump_user_version(db, user.id)
     db.commit()
+    category_catalog.invalidate_user(user.id)
     db.refresh(obj)
     return _to_out(obj)
 
@@ -125,4 +121,6 @@ def delete_category(
     if not obj:
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(obj)
+    bump_user_version(db, user.id)
     db.commit()
+    category_catalog.invalidate_user(user.id)
@@ -1,15 +1,14 @@
 # app/api/v1/dashboard.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_, or_
-from datetime import date, datetime, timezone
-from decimal import Decimal
+from datetime import date
 
 from app.db.session import SessionLocal
-from app.models.transaction import Transaction, TxnType
-from app.models.category import Category
-from app.models.budget import Budget
+from app.models.transaction import TxnType
 from app.schemas.dashboard import DashboardSummaryOut, CatStat, TxMini, BudgetUsage
+from app.core.cache import data_version, result_cache
+from app.core.etag import check_not_modified
+from app.services import analytics
 from .auth import get_current_user
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -19,136 +18,76 @@ def get_db():
     try: yield db
     finally: db.close()
 
-def _ym_to_dates(ym: str):
-    y, m = int(ym[:4]), int(ym[5:7])
-    start = date(y, m, 1)
-    if m == 12:
-        end = date(y+1, 1, 1)
-    else:
-        end = date(y, m+1, 1)
-    return start, end
+def _month_start(ym: str) -> date:
+    return date(int(ym[:4]), int(ym[5:7]), 1)
 
 def _date_str(dt) -> str:
     return dt.date().isoformat()
 
 @router.get("/summary", response_model=DashboardSummaryOut)
 def dashboard_summary(
+    request: Request,
+    response: Response,
     month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),  # YYYY-MM
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    start, end = _ym_to_dates(month)
+    version = data_version(db, user.id)
+    not_modified = check_not_modified(request, response, user.id, version)
+    if not_modified is not None:
+        return not_modified
+
+    start = _month_start(month)
+
+    cache_key = result_cache.key(user.id, version, "dashboard.summary", month=month)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # totals + kategori + bütçe + son 10 işlem: analytics üzerinden 2 sorgu
+    summary = analytics.summarize(db, user.id, start, start, recent_limit=10, largest=False)
 
     # ---- Toplam gelir/gider ----
-    totals = (
-        db.query(
-            func.coalesce(func.sum(case((Transaction.type == TxnType.income, Transaction.amount), else_=0)), 0).label("inc"),
-            func.coalesce(func.sum(case((Transaction.type == TxnType.expense, Transaction.amount), else_=0)), 0).label("exp"),
-        )
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.deleted_at.is_(None),
-            Transaction.occurred_at >= start,
-            Transaction.occurred_at < end,
-        )
-        .one()
-    )
-    income_total = float(totals.inc or 0)
-    expense_total = float(totals.exp or 0)
+    income_total = float(summary.income)
+    expense_total = float(summary.expense)
     net = income_total - expense_total
 
     # ---- Kategori kırılımı ----
-    cat_rows = (
-        db.query(
-            Category.id.label("cid"),
-            Category.name,
-            Category.icon,
-            Category.color_hex,
-            Category.is_expense,
-            func.coalesce(func.sum(Transaction.amount), 0).label("total"),
-        )
-        .join(Transaction, Transaction.category_id == Category.id)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.deleted_at.is_(None),
-            Transaction.occurred_at >= start,
-            Transaction.occurred_at < end,
-        )
-        .group_by(Category.id, Category.name, Category.icon, Category.color_hex, Category.is_expense)
-        .order_by(func.sum(Transaction.amount).desc())
-        .all()
-    )
     by_category = [
         CatStat(
-            categoryId=r.cid,
-            name=r.name,
-            emoji=r.icon,
-            color=r.color_hex,
-            type="expense" if r.is_expense else "income",
-            total=float(r.total or 0),
+            categoryId=c["id"],
+            name=c["name"],
+            emoji=c["icon"],
+            color=c["color"],
+            type="expense" if c["is_expense"] else "income",
+            total=float(c["total"]),
         )
-        for r in cat_rows
+        for c in summary.categories_sorted()
     ]
 
     # ---- Son işlemler (10 adet) ----
-    recent_rows = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.deleted_at.is_(None),
-            Transaction.occurred_at >= start,
-            Transaction.occurred_at < end,
-        )
-        .order_by(Transaction.occurred_at.desc(), Transaction.id.desc())
-        .limit(10)
-        .all()
-    )
     recent = [
         TxMini(
-            id=tx.id,
-            title=tx.title,
-            amount=float(tx.amount),
-            categoryId=tx.category_id,
-            date=_date_str(tx.occurred_at),
-            type=tx.type.value,
+            id=r.id,
+            title=r.title,
+            amount=float(r.amount),
+            categoryId=r.category_id,
+            date=_date_str(r.occurred_at),
+            type=TxnType(r.type).value,
         )
-        for tx in recent_rows
+        for r in summary.recent
     ]
 
     # ---- Bütçe kullanımı ----
-    # Bu ay için kullanıcının bütçeleri
-    budgets = (
-        db.query(Budget)
-        .filter(Budget.user_id == user.id, Budget.month_start == start)
-        .all()
-    )
-
-    # Kategori başına harcama (expense) bu ay
-    cat_spent = dict(
-        db.query(
-            Transaction.category_id,
-            func.coalesce(func.sum(Transaction.amount), 0)
-        )
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.deleted_at.is_(None),
-            Transaction.occurred_at >= start,
-            Transaction.occurred_at < end,
-            Transaction.type == TxnType.expense,
-        )
-        .group_by(Transaction.category_id)
-        .all()
-    )
-
     budget_usage = []
-    for b in budgets:
-        spent = float(cat_spent.get(b.category_id, 0.0))
-        limit_ = float(b.limit_amount)
+    for b in summary.budgets:
+        spent = float(b["spent"])
+        limit_ = float(b["limit"])
         usage = 0.0 if limit_ <= 0 else (spent / limit_) * 100.0
         budget_usage.append(
             BudgetUsage(
-                budgetId=b.id,
-                categoryId=b.category_id,
+                budgetId=b["id"],
+                categoryId=b["category_id"],
                 month=month,
                 limit=limit_,
                 spent=spent,
@@ -156,7 +95,7 @@ def dashboard_summary(
             )
         )
 
-    return DashboardSummaryOut(
+    out = DashboardSummaryOut(
         month=month,
         incomeTotal=round(income_total, 2),
         expenseTotal=round(expense_total, 2),
@@ -165,3 +104,5 @@ def dashboard_summary(
         recent=recent,
         budgetUsage=budget_usage,
     )
+    result_cache.set(cache_key, out)
+    return out
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.models.notification import Notification
+from app.schemas.notification import NotificationOut
+from .auth import get_current_user
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _to_out(n: Notification) -> NotificationOut:
+    return NotificationOut(
+        id=n.id,
+        kind=n.kind,
+        budgetId=n.budget_id,
+        categoryId=n.category_id,
+        month=n.month_start.strftime("%Y-%m") if n.month_start else None,
+        threshold=n.threshold,
+        spent=float(n.amount) if n.amount is not None else None,
+        limit=float(n.limit_amount) if n.limit_amount is not None else None,
+        createdAt=n.created_at.isoformat(),
+        read=n.read_at is not None,
+    )
+
+@router.get("", response_model=list[NotificationOut])
+def list_notifications(
+    unread: bool = Query(default=False, description="Sadece okunmamışlar"),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    q = db.query(Notification).filter(Notification.user_id == user.id)
+    if unread:
+        q = q.filter(Notification.read_at.is_(None))
+    rows = q.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit).all()
+    return [_to_out(n) for n in rows]
+
+@router.post("/{notification_id}/read", response_model=NotificationOut)
+def mark_read(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    n = db.query(Notification).filter(
+        Notification.id == notification_id, Notification.user_id == user.id
+    ).first()
+    if not n:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    if n.read_at is None:
+        n.read_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(n)
+    return _to_out(n)
+
+@router.post("/read-all")
+def mark_all_read(
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    res = db.execute(
+        update(Notification)
+        .where(Notification.user_id == user.id, Notification.read_at.is_(None))
+        .values(read_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    return {"updated": res.rowcount}
@@ -1,17 +1,28 @@
+import base64
+import csv
+import io
+import json
+from types import SimpleNamespace
 from datetime import date, datetime, time, timezone
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional, List, Literal, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, bindparam, insert, or_, update
+from sqlalchemy.exc import IntegrityError
 
 from app.db.session import SessionLocal
 from app.models.transaction import Transaction, TxnType
-from app.models.category import Category
+from app.core.catalog import CategoryInfo, category_catalog
 from app.schemas.transaction import (
-    TransactionCreate, TransactionUpdate, TransactionOut
+    TransactionCreate, TransactionUpdate, TransactionOut, TransactionPage, ImportResult,
+    TransactionBatchIn, TransactionBatchOut, BatchItemResult,
 )
+from app.services import importer, rollups, search
+from app.core.cache import bump_user_version, data_version
+from app.core.etag import check_not_modified
 from .auth import get_current_user
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
@@ -34,9 +45,50 @@ def _parse_date(d: str) -> datetime:
 def _date_str(dt: datetime) -> str:
     return dt.date().isoformat()
 
-def _derive_type_from_category(cat: Category) -> TxnType:
+def _derive_type_from_category(cat: CategoryInfo) -> TxnType:
     return TxnType.expense if cat.is_expense else TxnType.income
 
+def _category_gone(db: Session, user_id: int):
+    # cache'te duran kategori başka worker'da silinmiş: FK yazmayı reddetti
+    db.rollback()
+    category_catalog.drop_stale(user_id)
+    raise HTTPException(status_code=404, detail="Category not found")
+
+def _encode_cursor(tx: Transaction) -> str:
+    raw = f"{tx.occurred_at.isoformat()}|{tx.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, tx_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(tx_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _filtered(db: Session, user_id: int, start: Optional[str], end: Optional[str],
+              categoryId: Optional[int], type: Optional[str], q: Optional[str]):
+    """list / export ortak filtreleri. (query, alaka sıralaması | None) döner."""
+    qs = db.query(Transaction).filter(
+        Transaction.user_id == user_id,
+        Transaction.deleted_at.is_(None),
+    )
+
+    if start:
+        qs = qs.filter(Transaction.occurred_at >= _parse_date(start))
+    if end:
+        # gün sonu
+        end_dt = _parse_date(end).replace(hour=23, minute=59, second=59)
+        qs = qs.filter(Transaction.occurred_at <= end_dt)
+    if categoryId is not None:
+        qs = qs.filter(Transaction.category_id == categoryId)
+    if type:
+        qs = qs.filter(Transaction.type == TxnType(type))
+    relevance = None
+    if q:
+        qs, relevance = search.apply(db, qs, q)
+    return qs, relevance
+
 def _to_out(tx: Transaction) -> TransactionOut:
     return TransactionOut(
         id=tx.id,
@@ -50,8 +102,10 @@ def _to_out(tx: Transaction) -> TransactionOut:
 
 
 # ---------- list ----------
-@router.get("", response_model=List[TransactionOut])
+@router.get("", response_model=Union[List[TransactionOut], TransactionPage])
 def list_transactions(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
     start: Optional[str] = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
@@ -61,28 +115,129 @@ def list_transactions(
     q: Optional[str] = Query(default=None, min_length=1, max_length=120),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, max_length=200),
+    sort: Literal["date", "relevance"] = Query(default="date"),
 ):
-    qs = db.query(Transaction).filter(
-        Transaction.user_id == user.id,
-        Transaction.deleted_at.is_(None),
+    """
+    Offset modu (geriye uyumlu):  ?limit=100&offset=200  -> TransactionOut[]
+    Cursor modu:                 ?cursor=  (ilk sayfa, boş değer) -> {items, nextCursor}
+                                 ?cursor=<nextCursor>            -> sonraki sayfa
+    Cursor modu (occurred_at, id) üzerinde seek yapar; ix_tx_live_user_date her sayfada
+    aynı maliyetle kullanılır, offset yok sayılır.
+    Arama:                       ?q=mark  (kelime başı, FTS indeksi; ya da alt dizgi) &sort=relevance
+    """
+    version = data_version(db, user.id)
+    not_modified = check_not_modified(request, response, user.id, version)
+    if not_modified is not None:
+        return not_modified
+
+    qs, relevance = _filtered(db, user.id, start, end, categoryId, type, q)
+
+    if sort == "relevance":
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="sort=relevance is not supported with cursor pagination")
+        if relevance is not None:
+            qs = qs.order_by(relevance)
+    qs = qs.order_by(Transaction.occurred_at.desc(), Transaction.id.desc())
+
+    if cursor is None:
+        rows = qs.offset(offset).limit(limit).all()
+        return [_to_out(tx) for tx in rows]
+
+    if cursor:
+        c_ts, c_id = _decode_cursor(cursor)
+        # (occurred_at, id) < (c_ts, c_id); ilk koşul index aralığını daraltır
+        qs = qs.filter(
+            Transaction.occurred_at <= c_ts,
+            or_(Transaction.occurred_at < c_ts, Transaction.id < c_id),
+        )
+    rows = qs.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return TransactionPage(
+        items=[_to_out(tx) for tx in rows],
+        nextCursor=_encode_cursor(rows[-1]) if has_more else None,
     )
 
-    if start:
-        qs = qs.filter(Transaction.occurred_at >= _parse_date(start))
-    if end:
-        # gün sonu
-        end_dt = _parse_date(end).replace(hour=23, minute=59, second=59)
-        qs = qs.filter(Transaction.occurred_at <= end_dt)
-    if categoryId is not None:
-        qs = qs.filter(Transaction.category_id == categoryId)
-    if type:
-        qs = qs.filter(Transaction.type == TxnType(type))
-    if q:
-        like = f"%{q.lower()}%"
-        qs = qs.filter(or_(Transaction.title.ilike(like), Transaction.note.ilike(like)))
 
-    rows = qs.order_by(Transaction.occurred_at.desc(), Transaction.id.desc()).offset(offset).limit(limit).all()
-    return [_to_out(tx) for tx in rows]
+# ---------- export (CSV / NDJSON) ----------
+EXPORT_COLUMNS = ("id", "date", "title", "amount", "type", "categoryId", "note")
+EXPORT_CHUNK_ROWS = 500     # bu kadar satırda bir parça gönderilir
+EXPORT_YIELD_PER = 1000     # server-side cursor'dan tek seferde çekilen satır
+
+
+def _export_rows(user_id: int, start, end, categoryId, type, q):
+    # Stream, endpoint döndükten sonra tüketilir -> request'in session'ı değil, kendi session'ı
+    db = SessionLocal()
+    try:
+        qs, _ = _filtered(db, user_id, start, end, categoryId, type, q)
+        qs = (
+            qs.with_entities(
+                Transaction.id, Transaction.occurred_at, Transaction.title, Transaction.amount,
+                Transaction.type, Transaction.category_id, Transaction.note,
+            )
+            .order_by(Transaction.occurred_at.desc(), Transaction.id.desc())
+            .yield_per(EXPORT_YIELD_PER)        # postgres: stream_results (named cursor)
+        )
+        for r in qs:
+            yield (r.id, _date_str(r.occurred_at), r.title, r.amount,
+                   r.type.value, r.category_id, r.note)
+    finally:
+        db.close()
+
+
+def _export_csv(rows):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(rows, start=1):
+        w.writerow(row)
+        if i % EXPORT_CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _export_ndjson(rows):
+    lines = []
+    for row in rows:
+        item = dict(zip(EXPORT_COLUMNS, row))
+        item["amount"] = float(item["amount"])          # TransactionOut ile aynı
+        lines.append(json.dumps(item, ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+@router.get("/export")
+def export_transactions(
+    user = Depends(get_current_user),
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+    start: Optional[str] = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    end:   Optional[str] = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    categoryId: Optional[int] = Query(default=None),
+    type: Optional[str] = Query(default=None, pattern=r"^(income|expense)$"),
+    q: Optional[str] = Query(default=None, min_length=1, max_length=120),
+):
+    """
+    list_transactions ile aynı filtreler; tüm eşleşen satırlar (limit yok), tarih azalan.
+    Bellek kullanımı geçmiş büyüklüğünden bağımsızdır: satırlar server-side cursor'dan
+    parça parça okunup ilk parça sorgu bitmeden gönderilir.
+    """
+    rows = _export_rows(user.id, start, end, categoryId, type, q)
+    if format == "ndjson":
+        body, media_type = _export_ndjson(rows), "application/x-ndjson"
+    else:
+        body, media_type = _export_csv(rows), "text/csv; charset=utf-8"
+    filename = f"transactions-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # ---------- create ----------
@@ -92,12 +247,8 @@ def create_transaction(
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
 ):
-    cat = db.query(Category).filter(
-        or_(Category.user_id == user.id, Category.user_id.is_(None)),
-        Category.id == body.categoryId,
-        Category.is_archived == False,
-    ).first()
-    if not cat:
+    cat = category_catalog.for_write(db, user.id, (body.categoryId,)).get(body.categoryId)
+    if not cat or cat.is_archived:
         raise HTTPException(status_code=404, detail="Category not found")
 
     tx = Transaction(
@@ -110,11 +261,188 @@ def create_transaction(
         note=body.note,
     )
     db.add(tx)
+    try:
+        db.flush()
+    except IntegrityError:
+        _category_gone(db, user.id)
+    rollups.add(db, rollups.key_of(tx))
+    bump_user_version(db, user.id)
     db.commit()
     db.refresh(tx)
     return _to_out(tx)
 
 
+# ---------- bulk import (CSV / OFX) ----------
+@router.post("/import", response_model=ImportResult)
+def import_transactions(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ofx"]] = Form(default=None),   # yoksa dosya uzantısından
+    expenseCategoryId: Optional[int] = Form(default=None),         # kategorisiz negatif satırlar
+    incomeCategoryId: Optional[int] = Form(default=None),          # kategorisiz pozitif satırlar
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    fmt = format
+    if fmt is None:
+        name = (file.filename or "").lower()
+        fmt = "ofx" if name.endswith((".ofx", ".qfx")) else "csv"
+
+    rows = importer.iter_ofx(file.file) if fmt == "ofx" else importer.iter_csv(file.file)
+    stats = importer.import_rows(
+        db, user.id, rows,
+        expense_category_id=expenseCategoryId,
+        income_category_id=incomeCategoryId,
+    )
+    return ImportResult(imported=stats.imported, failed=stats.failed, errors=stats.errors, batches=stats.batches)
+
+
+# ---------- batch (create / update / delete) ----------
+@router.post("/batch", response_model=TransactionBatchOut)
+def batch_transactions(
+    body: TransactionBatchIn,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Create/update/delete işlemlerini tek istekte ve tek DB transaction'ında uygular.
+    Geçersiz öğeler (bilinmeyen kategori, bulunamayan ya da tekrarlanan işlem) atlanır ve
+    sonuçta hata olarak döner; geçerli olanlar uygulanır.
+    Sorgu sayısı öğe sayısından bağımsızdır: kategoriler katalogdan, mevcut satırlar tek
+    sorguyla okunur, yazmalar executemany / IN (...) ile, rollup'lar kova başına tek upsert ile yapılır.
+    """
+    try:
+        return _apply_batch(db, user.id, body.ops)
+    except IntegrityError:
+        # cache'teki bir kategori başka worker'da silinmiş: güncel katalogla bir kez daha;
+        # o kategoriye giden öğeler bu sefer doğrulamada 404 olur
+        db.rollback()
+        category_catalog.drop_stale(user.id)
+        return _apply_batch(db, user.id, body.ops)
+
+
+def _apply_batch(db: Session, user_id: int, ops) -> TransactionBatchOut:
+    results: List[Optional[BatchItemResult]] = [None] * len(ops)
+
+    def fail(i, op, code: int, msg: str, tx_id: Optional[int] = None):
+        results[i] = BatchItemResult(index=i, op=op.op, status=code, id=tx_id, error=msg)
+
+    # ---- 1) kategoriler (katalog) + mevcut satırlar (tek sorgu) ----
+    cat_ids = {op.data.categoryId for op in ops if op.op != "delete" and op.data.categoryId is not None}
+    cats = {cid: c for cid, c in category_catalog.for_write(db, user_id, cat_ids).items() if not c.is_archived}
+    tx_ids = {op.id for op in ops if op.op != "create"}
+    existing = {}
+    if tx_ids:
+        existing = {r.id: r for r in db.query(
+            Transaction.id, Transaction.user_id, Transaction.category_id, Transaction.type,
+            Transaction.title, Transaction.amount, Transaction.occurred_at, Transaction.note,
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.deleted_at.is_(None),
+            Transaction.id.in_(tx_ids),
+        )}
+
+    # ---- 2) doğrulama ----
+    creates, updates, deletes = [], [], []
+    seen = set()
+    for i, op in enumerate(ops):
+        if op.op == "create":
+            cat = cats.get(op.data.categoryId)
+            if cat is None:
+                fail(i, op, 404, "Category not found")
+                continue
+            creates.append((i, {
+                "user_id": user_id,
+                "category_id": cat.id,
+                "type": _derive_type_from_category(cat),
+                "title": op.data.title,
+                "amount": Decimal(str(op.data.amount)),
+                "occurred_at": _parse_date(op.data.date),
+                "note": op.data.note,
+            }))
+            continue
+
+        row = existing.get(op.id)
+        if row is None:
+            fail(i, op, 404, "Transaction not found", op.id)
+            continue
+        if op.id in seen:
+            fail(i, op, 409, "Transaction appears more than once in batch", op.id)
+            continue
+        seen.add(op.id)
+        if op.op == "delete":
+            deletes.append((i, row))
+            continue
+
+        d = op.data
+        values = dict(row._mapping)
+        if d.categoryId is not None and d.categoryId != row.category_id:
+            cat = cats.get(d.categoryId)
+            if cat is None:
+                fail(i, op, 404, "Category not found", op.id)
+                continue
+            values["category_id"] = cat.id
+            values["type"] = _derive_type_from_category(cat)
+        if d.title is not None:
+            values["title"] = d.title
+        if d.amount is not None:
+            values["amount"] = Decimal(str(d.amount))
+        if d.date is not None:
+            values["occurred_at"] = _parse_date(d.date)
+        if d.note is not None:
+            values["note"] = d.note
+        updates.append((i, row, values))
+
+    # ---- 3) set-based yazmalar ----
+    t = Transaction.__table__
+    if creates:
+        new_ids = db.execute(
+            insert(t).returning(t.c.id, sort_by_parameter_order=True),
+            [v for _, v in creates],
+        ).scalars().all()
+        for (i, v), new_id in zip(creates, new_ids):
+            v["id"] = new_id
+            results[i] = BatchItemResult(
+                index=i, op="create", status=201, id=new_id, item=_to_out(SimpleNamespace(**v)),
+            )
+    if updates:
+        db.execute(
+            update(t).where(t.c.id == bindparam("b_id")).values(
+                {c: bindparam(f"b_{c}") for c in ("category_id", "type", "title", "amount", "occurred_at", "note")}
+            ),
+            [{f"b_{k}": v for k, v in values.items()} for _, _, values in updates],
+        )
+        for i, _, values in updates:
+            results[i] = BatchItemResult(
+                index=i, op="update", status=200, id=values["id"], item=_to_out(SimpleNamespace(**values)),
+            )
+    if deletes:
+        db.execute(
+            update(t)
+            .where(t.c.id.in_([row.id for _, row in deletes]))
+            .values(deleted_at=datetime.now(tz=timezone.utc))
+        )
+        for i, row in deletes:
+            results[i] = BatchItemResult(index=i, op="delete", status=204, id=row.id)
+
+    # ---- 4) rollup'lar: eski halleri düş, yenileri ekle ----
+    removed = [rollups.key_of(row) for _, row in deletes]
+    added = [rollups.key_of(SimpleNamespace(**v)) for _, v in creates]
+    for _, row, values in updates:
+        old, new = rollups.key_of(row), rollups.key_of(SimpleNamespace(**values))
+        if old != new:
+            removed.append(old)
+            added.append(new)
+    rollups.remove_many(db, removed)
+    rollups.add_many(db, added)
+
+    if creates or updates or deletes:
+        bump_user_version(db, user_id)
+    db.commit()
+
+    failed = sum(1 for r in results if r.error is not None)
+    return TransactionBatchOut(succeeded=len(ops) - failed, failed=failed, results=results)
+
+
 # ---------- update ----------
 @router.patch("/{tx_id}", response_model=TransactionOut)
 def update_transaction(
@@ -131,16 +459,18 @@ def update_transaction(
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
+    old_key = rollups.key_of(tx)
+
     if body.categoryId is not None and body.categoryId != tx.category_id:
-        cat = db.query(Category).filter(
-            or_(Category.user_id == user.id, Category.user_id.is_(None)),
-            Category.id == body.categoryId,
-            Category.is_archived == False,
-        ).first()
-        if not cat:
+        cat = category_catalog.for_write(db, user.id, (body.categoryId,)).get(body.categoryId)
+        if not cat or cat.is_archived:
             raise HTTPException(status_code=404, detail="Category not found")
         tx.category_id = body.categoryId
         tx.type = _derive_type_from_category(cat)
+        try:
+            db.flush()
+        except IntegrityError:
+            _category_gone(db, user.id)
 
     if body.title is not None:
         tx.title = body.title
@@ -151,6 +481,8 @@ def update_transaction(
     if body.note is not None:
         tx.note = body.note
 
+    rollups.move(db, old_key, rollups.key_of(tx))
+    bump_user_version(db, user.id)
     db.commit()
     db.refresh(tx)
     return _to_out(tx)
@@ -172,4 +504,6 @@ def delete_transaction(
         raise HTTPException(status_code=404, detail="Transaction not found")
 
     tx.deleted_at = datetime.now(tz=timezone.utc)
+    rollups.remove(db, rollups.key_of(tx))
+    bump_user_version(db, user.id)
     db.commit()
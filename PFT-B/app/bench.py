@@ -0,0 +1,182 @@
+# app/bench.py
+"""
+In-process endpoint benchmark'ı (TestClient, ağ yok).
+
+    python -m app.cli seed --users 5 --tx-per-user 20000
+    python -m app.cli bench --out bench.json
+    python -m app.cli bench --out new.json --baseline bench.json   # farkları yazdır
+
+Her senaryo için p50/p95/p99/ortalama gecikme (ms), throughput (istek/sn) ve tek istekte
+ayrılan en yüksek Python belleği (tracemalloc, KiB) ölçülür. Varsayılan olarak sonuç cache'i
+her istekten önce temizlenir (soğuk hesaplama); --warm ile cache açık ölçülür.
+"""
+from __future__ import annotations
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+
+from app.services.seed import DEFAULT_PASSWORD
+
+
+def _percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def _ym(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _scenarios(months: int) -> list[tuple[str, str, str, dict, int]]:
+    """(ad, method, path, istek kwargs, varsayılan tekrar)"""
+    today = datetime.now(timezone.utc).date()
+    this_month = _ym(today)
+    y, m = today.year, today.month - (months - 1)
+    while m <= 0:
+        m += 12
+        y -= 1
+    first = f"{y:04d}-{m:02d}"
+    return [
+        ("transactions.list", "GET", "/transactions", {"params": {"limit": 100}}, 200),
+        ("transactions.list_deep_offset", "GET", "/transactions", {"params": {"limit": 100, "offset": 5000}}, 100),
+        ("transactions.cursor", "GET", "/transactions", {"params": {"limit": 100, "cursor": ""}}, 200),
+        ("transactions.search", "GET", "/transactions", {"params": {"q": "migros", "limit": 50}}, 200),
+        ("dashboard.summary", "GET", "/dashboard/summary", {"params": {"month": this_month}}, 200),
+        ("reports.month", "GET", "/reports", {"params": {"month": this_month}}, 200),
+        ("reports.multi_year", "GET", "/reports", {"params": {"start": first, "end": this_month}}, 100),
+        ("auth.login", "POST", "/auth/login", {"json": None}, 20),
+    ]
+
+
+def run(*, email: str, months: int = 24, iterations: Optional[int] = None, warm: bool = False,
+        only: Optional[list[str]] = None, log: Callable[[str], None] = print) -> dict:
+    from fastapi.testclient import TestClient      # httpx gerektirir (sadece benchmark için)
+
+    from app.main import app
+
+    with TestClient(app) as client:          # lifespan: engine kurulumu / kapanışı
+        return _run(client, email, months, iterations, warm, only, log)
+
+
+def _run(client, email, months, iterations, warm, only, log) -> dict:
+    from app.core.cache import result_cache
+    from app.core.config import settings
+    from app.db.session import get_engine
+
+    prefix = settings.API_PREFIX or ""
+    credentials = {"email": email, "password": DEFAULT_PASSWORD}
+    r = client.post(f"{prefix}/auth/login", json=credentials)
+    if r.status_code != 200:
+        raise SystemExit(f"login failed for {email} ({r.status_code}); run `python -m app.cli seed` first")
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    results = {}
+    for name, method, path, kwargs, default_n in _scenarios(months):
+        if only and name not in only:
+            continue
+        n = iterations or default_n
+        if "json" in kwargs:
+            kwargs = {"json": credentials}
+        url = prefix + path
+
+        def call():
+            if not warm:
+                result_cache.clear()
+            resp = client.request(method, url, headers=headers, **kwargs)
+            if resp.status_code >= 400:
+                raise SystemExit(f"{name}: HTTP {resp.status_code} {resp.text[:200]}")
+
+        call()                                    # ısınma (bağlantı, import, plan cache)
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lat = []
+        t_start = time.perf_counter()
+        for _ in range(n):
+            t0 = time.perf_counter()
+            call()
+            lat.append((time.perf_counter() - t0) * 1000)
+        wall = time.perf_counter() - t_start
+        lat.sort()
+        results[name] = {
+            "n": n,
+            "p50Ms": round(_percentile(lat, 0.50), 3),
+            "p95Ms": round(_percentile(lat, 0.95), 3),
+            "p99Ms": round(_percentile(lat, 0.99), 3),
+            "meanMs": round(statistics.fmean(lat), 3),
+            "throughputRps": round(n / wall, 2),
+            "peakAllocKiB": round(peak / 1024, 1),
+        }
+        log(f"{name:32s} p50={results[name]['p50Ms']:>9.2f}ms p95={results[name]['p95Ms']:>9.2f}ms "
+            f"p99={results[name]['p99Ms']:>9.2f}ms {results[name]['throughputRps']:>8.1f} rps")
+
+    return {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "gitRev": _git_rev(),
+            "python": platform.python_version(),
+            "dialect": get_engine().dialect.name,
+            "user": email,
+            "warm": warm,
+        },
+        "scenarios": results,
+    }
+
+
+# ---------- baseline karşılaştırma ----------
+COMPARED = (("p50Ms", 1), ("p95Ms", 1), ("p99Ms", 1), ("throughputRps", -1), ("peakAllocKiB", 1))
+
+
+def compare(baseline: dict, current: dict, threshold_pct: float = 10.0,
+            log: Callable[[str], None] = print) -> list[str]:
+    """Eşiği aşan kötüleşmeleri döner. direction 1: büyümesi kötü, -1: düşmesi kötü."""
+    regressions = []
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            log(f"{name:32s} (baseline'da yok)")
+            continue
+        parts = []
+        for key, direction in COMPARED:
+            old, new = base.get(key), cur.get(key)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old * 100
+            flag = ""
+            if delta * direction > threshold_pct:
+                flag = " !"
+                regressions.append(f"{name}.{key} {old} -> {new} ({delta:+.1f}%)")
+            parts.append(f"{key}={delta:+.1f}%{flag}")
+        log(f"{name:32s} " + "  ".join(parts))
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str, data: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
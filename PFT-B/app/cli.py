@@ -0,0 +1,289 @@
+# app/cli.py
+"""
+Yönetim komutları:
+
+    python -m app.cli rebuild-rollups [--user-id N]
+    python -m app.cli backfill-anomaly-stats [--user-id N]   # rebuild-rollups da yapar
+    python -m app.cli seed --users N --tx-per-user M [--months 24] [--seed 42] [--email-prefix bench]
+    python -m app.cli bench [--email bench1@example.com] [--out bench.json] [--baseline old.json]
+    python -m app.cli create-schema          # sadece geliştirme; production: alembic upgrade head
+    python -m app.cli import-time [--runs 5] [--max-ms 1500] [--out import.json]
+    python -m app.cli partitions [--ahead 3] [--from 2020-01]   # postgres: aylık partition'lar
+    python -m app.cli explain [--email bench1@example.com] [--verbose]   # seq scan varsa exit 1
+    python -m app.cli purge-deleted [--days 30] [--chunk-size 1000] [--pause-ms 0]
+    python -m app.cli archive [--months 36] [--user-id N] [--chunk-size 1000] [--pause-ms 0]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import rollups
+
+
+def _rebuild_rollups(args) -> None:
+    db = SessionLocal()
+    try:
+        n = rollups.rebuild(db, user_id=args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"monthly_rollups rebuilt: {n} buckets")
+
+
+def _backfill_anomaly_stats(args) -> None:
+    from app.services import anomalies
+
+    db = SessionLocal()
+    try:
+        n = anomalies.backfill(db, user_id=args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"category_amount_stats rebuilt: {n} rows")
+
+
+def _seed(args) -> None:
+    from app.services import seed
+
+    def progress(stats):
+        print(f"  users={stats.users} transactions={stats.transactions} budgets={stats.budgets}", flush=True)
+
+    db = SessionLocal()
+    try:
+        stats = seed.seed(
+            db,
+            users=args.users,
+            tx_per_user=args.tx_per_user,
+            months=args.months,
+            email_prefix=args.email_prefix,
+            seed=args.seed,
+            progress=progress,
+        )
+    finally:
+        db.close()
+    print(f"seeded {stats.users} users, {stats.transactions} transactions "
+          f"(password: {seed.DEFAULT_PASSWORD})")
+
+
+def _bench(args) -> None:
+    from app import bench
+
+    result = bench.run(
+        email=args.email,
+        months=args.months,
+        iterations=args.iterations,
+        warm=args.warm,
+        only=args.only,
+    )
+    if args.out:
+        bench.save(args.out, result)
+        print(f"results written to {args.out}")
+    if args.baseline:
+        print(f"\ncompared to {args.baseline} (threshold {args.threshold}%):")
+        regressions = bench.compare(bench.load(args.baseline), result, args.threshold)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+def _explain(args) -> None:
+    from app import explain
+
+    failures = explain.run(email=args.email, months=args.months, verbose=args.verbose)
+    if failures:
+        print("\nqueries without a usable index:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nall endpoint queries use an index")
+
+
+def _create_schema(args) -> None:
+    from app.db.init_db import create_schema
+    from app.db.session import get_engine
+
+    create_schema(get_engine())
+    print("schema created")
+
+
+def _partitions(args) -> None:
+    from datetime import date
+
+    from app.db import partitions
+    from app.db.session import get_engine
+
+    start = None
+    if args.start:
+        y, m = args.start.split("-")
+        start = date(int(y), int(m), 1)
+    with get_engine().begin() as conn:
+        if not partitions.is_partitioned(conn):
+            print("transactions is not partitioned (sqlite or pre-partitioning schema); nothing to do")
+            return
+        created = partitions.ensure_partitions(conn, ahead=args.ahead, start=start)
+    print(f"created {len(created)} partitions" + (": " + ", ".join(created) if created else ""))
+
+
+def _purge_deleted(args) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from app.services import retention
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=args.days)
+    db = SessionLocal()
+    try:
+        stats = retention.purge_deleted(
+            db, older_than=older_than, chunk_size=args.chunk_size, pause=args.pause_ms / 1000,
+            progress=lambda s: print(f"  purged {s.rows} rows ({s.chunks} chunks)"),
+        )
+    finally:
+        db.close()
+    print(f"purged {stats.rows} soft-deleted transactions (deleted before {older_than:%Y-%m-%d})")
+
+
+def _archive(args) -> None:
+    from datetime import date, datetime, timezone
+
+    from app.services import retention
+
+    today = datetime.now(timezone.utc).date()
+    months = today.year * 12 + (today.month - 1) - args.months
+    cutoff = date(months // 12, months % 12 + 1, 1)
+    db = SessionLocal()
+    try:
+        stats = retention.archive_before(
+            db, cutoff=cutoff, chunk_size=args.chunk_size, user_id=args.user_id, pause=args.pause_ms / 1000,
+            progress=lambda s: print(f"  archived {s.rows} rows ({s.chunks} chunks)"),
+        )
+    finally:
+        db.close()
+    print(f"archived {stats.rows} transactions of {stats.users} users (before {cutoff:%Y-%m})")
+
+
+# `import app.main` yan etkisiz olmalı: engine kurulmamış, bağlantı açılmamış olmalı
+_IMPORT_PROBE = (
+    "import app.main, app.db.session as s, sys; "
+    "sys.exit(0 if s._engine is None else 3)"
+)
+
+
+def _import_time(args) -> None:
+    def run(code: str, importtime: bool = False) -> tuple[float, str]:
+        cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if proc.returncode == 3:
+            sys.exit("import app.main created the DB engine (import-time side effect)")
+        if proc.returncode != 0:
+            sys.exit(proc.stderr[-2000:])
+        return elapsed, proc.stderr
+
+    interpreter = min(run("pass")[0] for _ in range(args.runs))
+    totals = sorted(run(_IMPORT_PROBE)[0] for _ in range(args.runs))
+    median = totals[len(totals) // 2]
+
+    # -X importtime: "import time: self | cumulative | module"
+    _, trace = run(_IMPORT_PROBE, importtime=True)
+    modules = []
+    for line in trace.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            self_us = int(parts[0].rsplit(":", 1)[1])
+            modules.append((self_us / 1000, parts[2].strip()))
+    top = sorted(modules, reverse=True)[:args.top]
+
+    result = {
+        "runs": args.runs,
+        "interpreterMs": round(interpreter, 1),
+        "importAppMainMs": round(median - interpreter, 1),
+        "wallMedianMs": round(median, 1),
+        "topSelf": [{"module": name, "selfMs": round(ms, 1)} for ms, name in top],
+    }
+    print(f"import app.main: {result['importAppMainMs']} ms "
+          f"(wall {result['wallMedianMs']} ms, interpreter {result['interpreterMs']} ms)")
+    print("slowest modules (self time):")
+    for item in result["topSelf"]:
+        print(f"  {item['selfMs']:>8.1f} ms  {item['module']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.max_ms is not None and result["importAppMainMs"] > args.max_ms:
+        sys.exit(f"import time {result['importAppMainMs']} ms exceeds --max-ms {args.max_ms}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rebuild-rollups", help="monthly_rollups + daily_rollups tablolarını transactions'tan baştan üret")
+    p.add_argument("--user-id", type=int, default=None, help="sadece bu kullanıcı")
+    p.set_defaults(func=_rebuild_rollups)
+
+    p = sub.add_parser("backfill-anomaly-stats", help="category_amount_stats'ı transactions + arşivden baştan üret")
+    p.add_argument("--user-id", type=int, default=None, help="sadece bu kullanıcı")
+    p.set_defaults(func=_backfill_anomaly_stats)
+
+    p = sub.add_parser("seed", help="benchmark için sentetik kullanıcı/kategori/işlem/bütçe üret")
+    p.add_argument("--users", type=int, required=True)
+    p.add_argument("--tx-per-user", type=int, required=True)
+    p.add_argument("--months", type=int, default=24, help="geçmiş kaç ayı kapsasın")
+    p.add_argument("--seed", type=int, default=42, help="aynı seed -> aynı veri")
+    p.add_argument("--email-prefix", default="bench")
+    p.set_defaults(func=_seed)
+
+    p = sub.add_parser("bench", help="endpoint'leri in-process ölç, JSON baseline yaz / karşılaştır")
+    p.add_argument("--email", default="bench1@example.com", help="seed edilmiş kullanıcı")
+    p.add_argument("--months", type=int, default=24, help="multi-year rapor aralığı (seed ile aynı)")
+    p.add_argument("--iterations", type=int, default=None, help="senaryo başına istek (varsayılan senaryoya göre)")
+    p.add_argument("--only", nargs="*", default=None, help="sadece bu senaryolar (örn. reports.month)")
+    p.add_argument("--warm", action="store_true", help="sonuç cache'ini temizleme")
+    p.add_argument("--out", default=None, help="sonuç JSON dosyası")
+    p.add_argument("--baseline", default=None, help="karşılaştırılacak önceki sonuç")
+    p.add_argument("--threshold", type=float, default=10.0, help="kötüleşme eşiği (%%)")
+    p.add_argument("--fail-on-regression", action="store_true", help="eşik aşılırsa exit 1")
+    p.set_defaults(func=_bench)
+
+    p = sub.add_parser("explain", help="okuma endpoint'lerinin sorgularını EXPLAIN et, seq scan varsa exit 1")
+    p.add_argument("--email", default="bench1@example.com")
+    p.add_argument("--months", type=int, default=24)
+    p.add_argument("--verbose", action="store_true", help="tüm planları yazdır")
+    p.set_defaults(func=_explain)
+
+    p = sub.add_parser("create-schema", help="create_all + SQLite FTS (geliştirme; production'da alembic)")
+    p.set_defaults(func=_create_schema)
+
+    p = sub.add_parser("import-time", help="`import app.main` süresini ve yan etkisizliğini ölç")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--top", type=int, default=15, help="self süresi en yüksek kaç modül listelensin")
+    p.add_argument("--max-ms", type=float, default=None, help="aşılırsa exit 1")
+    p.add_argument("--out", default=None, help="sonuç JSON dosyası")
+    p.set_defaults(func=_import_time)
+
+    p = sub.add_parser("partitions", help="transactions için eksik aylık partition'ları aç (postgres)")
+    p.add_argument("--ahead", type=int, default=3, help="bu aydan sonra kaç ay önceden açılsın")
+    p.add_argument("--from", dest="start", default=None, help="YYYY-MM; verilmezse bu ay")
+    p.set_defaults(func=_partitions)
+
+    p = sub.add_parser("purge-deleted", help="saklama süresi geçmiş soft-delete işlemleri kalıcı sil")
+    p.add_argument("--days", type=int, default=settings.PURGE_DELETED_AFTER_DAYS, help="kaç gün önce silinmiş olanlar")
+    p.add_argument("--chunk-size", type=int, default=settings.RETENTION_CHUNK_SIZE)
+    p.add_argument("--pause-ms", type=int, default=0, help="parçalar arası bekleme")
+    p.set_defaults(func=_purge_deleted)
+
+    p = sub.add_parser("archive", help="eski işlemleri sıkıştırılmış transaction_archives'a taşı (rollup'lar kalır)")
+    p.add_argument("--months", type=int, default=settings.ARCHIVE_AFTER_MONTHS, help="bu aydan kaç ay öncesi arşivlensin")
+    p.add_argument("--user-id", type=int, default=None)
+    p.add_argument("--chunk-size", type=int, default=settings.RETENTION_CHUNK_SIZE)
+    p.add_argument("--pause-ms", type=int, default=0, help="parçalar arası bekleme")
+    p.set_defaults(func=_archive)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
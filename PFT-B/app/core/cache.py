@@ -0,0 +1,99 @@
+# app/core/cache.py
+"""
+Process içi, kullanıcı bazlı versiyonlu sonuç cache'i (LRU + TTL).
+
+Anahtar: (user_id, endpoint, params, data_version). data_version `users.data_version`
+kolonudur (istek başında `data_version()` ile okunur); kullanıcının işlem/bütçe/kategori verisini değiştiren endpoint'ler commit'ten
+önce, aynı DB transaction'ında `bump_user_version` çağırır. Versiyon DB'de tutulduğu için
+tüm worker'lar aynı değeri görür; eski versiyonlu kayıtlar bir daha okunmaz ve LRU/TTL ile düşer.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class ResultCache:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, user_id: int, version: int, endpoint: str, **params) -> tuple:
+        # versiyon `data_version` ile hesaplamadan ÖNCE okunmuş olmalı
+        return (user_id, endpoint, tuple(sorted(params.items())), version)
+
+    # ---------- get / set ----------
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at < now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": (self.hits / total) if total else 0.0,
+        }
+
+
+result_cache = ResultCache(
+    maxsize=settings.RESULT_CACHE_MAXSIZE,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+)
+
+
+def data_version(db: Session, user_id: int) -> int:
+    """Kullanıcının güncel veri versiyonu (tek kolonluk PK sorgusu).
+    Auth principal'ı cache'lendiği için versiyon her istekte buradan okunur."""
+    return db.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+def bump_user_version(db: Session, user_id: int) -> None:
+    """Yazma endpoint'leri commit'ten ÖNCE, aynı transaction içinde çağırır."""
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,169 @@
+# app/core/catalog.py
+"""
+Process içi kategori kataloğu.
+
+Kategori doğrulaması (transaction/bütçe yazma yolu) ve rapor/dashboard'daki ad/ikon/renk
+bilgisi her istekte `categories`e gitmek yerine buradan okunur:
+- global (user_id NULL) kategoriler ilk ihtiyaçta bir kez yüklenir
+- kullanıcı kategorileri kullanıcı başına LRU + TTL ile tutulur; categories.py'deki yazma
+  endpoint'leri commit'ten SONRA `invalidate_user` çağırır
+- başka bir worker'da oluşturulmuş kategori için `get` bir kez yeniden yükler; diğer
+  değişiklikler (ad, arşiv, silme) başka worker'lara en geç TTL sonunda yansır
+Yazma yolu (transaction create/update/batch, bütçe) da kategoriyi `for_write` ile cache'ten
+doğrular, DB'ye gitmez. Başka worker'da silinmiş ama cache'te duran kategoriye yazma FK ile
+reddedilir: çağıran IntegrityError'da rollback + `drop_stale` yapıp 404/400 döner. Başka
+worker'da arşivlenmiş kategoriye yazma TTL dolana kadar kabul edilebilir.
+Toplu içe aktarma parça başına `refresh` ile DB'den okur (parça başına tek sorgu).
+Arşivlenmiş kategoriler de katalogdadır (geçmiş işlemlerin raporu için); yeni yazmalarda
+kabul edip etmemek çağıranın kararı (`is_archived`).
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.category import Category
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryInfo:
+    # alan adları model ile aynı; _to_out gibi yardımcılar ikisini de kabul eder
+    id: int
+    user_id: Optional[int]
+    name: str
+    icon: Optional[str]
+    color_hex: Optional[str]
+    is_expense: bool
+    is_default: bool
+    is_archived: bool
+
+
+_COLUMNS = (
+    Category.id, Category.user_id, Category.name, Category.icon, Category.color_hex,
+    Category.is_expense, Category.is_default, Category.is_archived,
+)
+
+
+def _load(db: Session, user_id: Optional[int]) -> dict[int, CategoryInfo]:
+    owner = Category.user_id.is_(None) if user_id is None else Category.user_id == user_id
+    return {r.id: CategoryInfo(*r) for r in db.execute(select(*_COLUMNS).where(owner))}
+
+
+class UserCatalog:
+    """Bir kullanıcının görebildiği kategoriler (global + kendi); değişmez anlık görüntü."""
+    __slots__ = ("_globals", "_own")
+
+    def __init__(self, globals_: dict[int, CategoryInfo], own: dict[int, CategoryInfo]):
+        self._globals = globals_
+        self._own = own
+
+    def get(self, category_id: int) -> Optional[CategoryInfo]:
+        return self._own.get(category_id) or self._globals.get(category_id)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self._own or category_id in self._globals
+
+    def all(self) -> list[CategoryInfo]:
+        return [*self._globals.values(), *self._own.values()]
+
+    def active(self) -> list[CategoryInfo]:
+        """list_categories sırası: önce varsayılanlar, sonra ada göre."""
+        rows = [c for c in self.all() if not c.is_archived]
+        rows.sort(key=lambda c: (not c.is_default, c.name))
+        return rows
+
+
+class CategoryCatalog:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._globals: Optional[dict[int, CategoryInfo]] = None
+        self._users: OrderedDict[int, tuple[float, dict[int, CategoryInfo]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def for_user(self, db: Session, user_id: int) -> UserCatalog:
+        globals_ = self._globals
+        if globals_ is None:
+            globals_ = self._globals = _load(db, None)
+
+        now = time.monotonic()
+        with self._lock:
+            item = self._users.get(user_id)
+            if item is not None and item[0] >= now:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return UserCatalog(globals_, item[1])
+            self.misses += 1
+        return UserCatalog(globals_, self._reload(db, user_id))
+
+    def get(self, db: Session, user_id: int, category_id: int) -> Optional[CategoryInfo]:
+        """Kullanıcının görebildiği kategori; katalogda yoksa bir kez DB'den yeniler."""
+        catalog = self.for_user(db, user_id)
+        if category_id in catalog:
+            return catalog.get(category_id)
+        return UserCatalog(catalog._globals, self._reload(db, user_id)).get(category_id)
+
+    def for_write(self, db: Session, user_id: int, category_ids) -> dict[int, CategoryInfo]:
+        """Yazma yolu doğrulaması: `category_ids`ten kullanıcının görebildikleri, cache'ten.
+        Katalogda olmayan id varsa (başka worker'da yeni oluşturulmuş) bir kez yeniler."""
+        ids = set(category_ids)
+        catalog = self.for_user(db, user_id)
+        if not all(cid in catalog for cid in ids):
+            catalog = UserCatalog(catalog._globals, self._reload(db, user_id))
+        return {cid: c for cid in ids if (c := catalog.get(cid)) is not None}
+
+    def refresh(self, db: Session, user_id: int) -> UserCatalog:
+        """Kullanıcı kategorilerini DB'den yeniden yükler (cache de güncellenir)."""
+        catalog = self.for_user(db, user_id)
+        return UserCatalog(catalog._globals, self._reload(db, user_id))
+
+    def drop_stale(self, user_id: int) -> None:
+        """Yazma FK ile reddedildi (kategori başka worker'da silinmiş): cache'i bırak."""
+        self.invalidate_user(user_id)
+        self.invalidate_globals()
+
+    def _reload(self, db: Session, user_id: int) -> dict[int, CategoryInfo]:
+        own = _load(db, user_id)          # sorgu lock dışında
+        if self.maxsize > 0:
+            with self._lock:
+                self._users[user_id] = (time.monotonic() + self.ttl, own)
+                self._users.move_to_end(user_id)
+                while len(self._users) > self.maxsize:
+                    self._users.popitem(last=False)
+        return own
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def invalidate_globals(self) -> None:
+        self._globals = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+        self._globals = None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._users),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": (self.hits / total) if total else 0.0,
+        }
+
+
+category_catalog = CategoryCatalog(
+    maxsize=settings.CATEGORY_CACHE_MAXSIZE,
+    ttl_seconds=settings.CATEGORY_CACHE_TTL_SECONDS,
+)
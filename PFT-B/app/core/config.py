@@ -9,8 +9,62 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     DATABASE_URL: str = "sqlite:///./app.db"
+    # şema Alembic ile yönetilir; true ise startup'ta create_all (sadece geliştirme).
+    # Boş = sqlite URL'lerinde açık: Alembic baseline'ı sqlite'ta çalışmaz (ALTER COLUMN ... TYPE)
+    DB_AUTO_CREATE: bool | None = None
+    # postgres: startup'ta transactions için bu ay + N ayın partition'larını aç (0 = kapalı;
+    # tercihen cron ile `python -m app.cli partitions`)
+    DB_PARTITION_AHEAD_MONTHS: int = 0
+
+    # DB bağlantı havuzu: worker başına pool_size + max_overflow bağlantı açılabilir;
+    # toplam (uvicorn worker sayısı × bu değer) DB'nin max_connections'ının altında kalmalı
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30            # boş bağlantı bekleme süresi (sn), sonra TimeoutError
+    DB_POOL_RECYCLE: int = 1800            # sn; -1 = kapalı
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000   # postgres statement_timeout; 0 = kapalı
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # istek logu (JSON, app.request) + Server-Timing; yavaş sorgu logu opt-in (0 = kapalı)
+    LOG_LEVEL: str = "INFO"
+    REQUEST_LOG: bool = True
+    SLOW_QUERY_MS: float = 0
     ALLOW_ORIGINS: list[AnyHttpUrl] | list[str] = []
 
+    # dashboard/reports sonuç cache'i (process içi, LRU + TTL)
+    RESULT_CACHE_MAXSIZE: int = 1024
+    RESULT_CACHE_TTL_SECONDS: int = 300
+
+    # get_current_user token -> principal cache'i; TTL token ömrünü asla aşmaz
+    AUTH_CACHE_MAXSIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # kategori kataloğu (kullanıcı başına; globaller bir kez yüklenir)
+    CATEGORY_CACHE_MAXSIZE: int = 10000
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+
+    # /reports `recurring`: kullanıcı başına process içi tespit durumu
+    RECURRING_LOOKBACK_MONTHS: int = 18
+    RECURRING_CACHE_MAXSIZE: int = 2000
+    RECURRING_STATE_TTL_SECONDS: int = 3600   # dolunca baştan yüklenir
+
+    # /reports `anomalies`: kategori başına log-tutar z-skoru
+    ANOMALY_Z: float = 3.0
+    ANOMALY_MIN_SAMPLES: int = 10           # daha az işlemi olan kategoride işaretleme yok
+    ANOMALY_MIN_RATIO: float = 2.0          # tipik (geometrik ortalama) tutarın en az bu katı
+
+    # retention işleri (python -m app.cli purge-deleted / archive)
+    PURGE_DELETED_AFTER_DAYS: int = 30      # soft-delete edilmiş satırlar bu kadar gün sonra silinir
+    ARCHIVE_AFTER_MONTHS: int = 36          # bu aydan bu kadar ay eski aylar soğuk depolamaya
+    RETENTION_CHUNK_SIZE: int = 1000        # her chunk ayrı transaction (kısa kilit)
+
+    # bcrypt: maliyet + ayrı process pool (0 worker = senkron, pool yok)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8        # dolunca login/register 503
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10
+
     @field_validator("ALLOW_ORIGINS", mode="before")
     @classmethod
     def split_origins(cls, v):
@@ -0,0 +1,49 @@
+# app/core/etag.py
+"""
+Kullanıcı veri versiyonundan (users.data_version) türetilen güçlü ETag'ler.
+
+ETag = hash(user_id, data_version, path, sıralı query[, vary]). `vary`: yanıt veriden başka bir
+şeye de bağlıysa (ör. bugünün tarihi) onu da ETag'e katar. Veri değişmediyse aynı URL için
+aynı ETag üretilir; If-None-Match eşleşirse endpoint versiyon sorgusu dışında hiçbir
+sorgu/serileştirme yapmadan 304 döner.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"   # her seferinde revalidate et, ara cache'lerde tutma
+
+
+def user_etag(request: Request, user_id: int, version: int, vary: str = "") -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    raw = f"{user_id}:{version}:{request.url.path}?{query}"
+    if vary:
+        raw += f"#{vary}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak karşılaştırma (RFC 9110 §13.1.2): W/ öneki yok sayılır
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def check_not_modified(
+    request: Request, response: Response, user_id: int, version: int, vary: str = ""
+) -> Optional[Response]:
+    """ETag header'ını yanıta yazar; istemcideki kopya güncelse 304 yanıtı döner."""
+    etag = user_etag(request, user_id, version, vary)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    inm = request.headers.get("if-none-match")
+    if inm and _matches(inm, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
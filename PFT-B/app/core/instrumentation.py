@@ -0,0 +1,133 @@
+# app/core/instrumentation.py
+"""
+İstek bazlı SQL ölçümü.
+
+- Engine hook'ları (app/db/session.py'de bağlanır) her statement'ın süresini o anki
+  isteğin sayaçlarına yazar. İstek durumu ContextVar'da; sync endpoint'ler threadpool'da
+  kopyalanan context ile çalıştığından aynı nesneyi görür.
+- RequestTimingMiddleware yanıta `Server-Timing: db;dur=..;desc="N queries", app;dur=.., total;dur=..`
+  ekler ve istek bitince tek satır JSON log yazar (logger: app.request).
+- Aynı middleware /metrics sayaçlarını da günceller (app/core/metrics.py).
+- SLOW_QUERY_MS > 0 ise eşiği aşan sorgular SQL + parametreleriyle app.sql.slow'a yazılır.
+Streaming yanıtlarda header'lar body'den önce gittiği için Server-Timing o ana kadarki
+süreyi gösterir; log satırı ise tüm akışı kapsar.
+"""
+from __future__ import annotations
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import request_metrics, route_label
+
+request_log = logging.getLogger("app.request")
+slow_log = logging.getLogger("app.sql.slow")
+
+
+class RequestStats:
+    __slots__ = ("db_count", "db_seconds")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def configure_logging() -> None:
+    # uvicorn sadece kendi logger'larını kurar; app.* logları için handler yoksa ekle
+    logger = logging.getLogger("app")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(settings.LOG_LEVEL)
+        logger.propagate = False
+
+
+# ---------- engine hooks ----------
+def _truncate(value, limit: int = 2000) -> str:
+    s = repr(value)
+    return s if len(s) <= limit else s[:limit] + "..."
+
+
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._t0 = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._t0
+        stats = _current.get()
+        if stats is not None:
+            stats.db_count += 1
+            stats.db_seconds += elapsed
+        if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            slow_log.warning(json.dumps({
+                "durationMs": round(elapsed * 1000, 2),
+                "executemany": executemany,
+                "sql": statement,
+                "params": _truncate(parameters),
+            }, ensure_ascii=False))
+
+
+# ---------- middleware ----------
+class RequestTimingMiddleware:
+    """Pure ASGI middleware (BaseHTTPMiddleware context'i endpoint'e taşımaz)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        t0 = time.perf_counter()
+        status_code = 500
+        request_metrics.in_progress += 1
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - t0) * 1000
+                db_ms = stats.db_seconds * 1000
+                timing = (
+                    f'db;dur={db_ms:.1f};desc="{stats.db_count} queries", '
+                    f"app;dur={max(total_ms - db_ms, 0):.1f}, total;dur={total_ms:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - t0
+            request_metrics.in_progress -= 1
+            request_metrics.observe(
+                scope["method"], route_label(scope), status_code, elapsed, stats.db_seconds, stats.db_count,
+            )
+            if settings.REQUEST_LOG:
+                request_log.info(json.dumps({
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "durationMs": round(elapsed * 1000, 2),
+                    "dbMs": round(stats.db_seconds * 1000, 2),
+                    "dbQueries": stats.db_count,
+                }))
@@ -0,0 +1,144 @@
+# app/core/metrics.py
+"""
+Prometheus text formatında (/metrics) istek metrikleri.
+
+Sayaçlar sadece RequestTimingMiddleware'den, yani event loop thread'inden güncellenir;
+tek thread olduğu için kilit yok, gözlem başına birkaç dict işlemi + bisect.
+Route etiketi path şablonudur (/api/v1/transactions/{tx_id}); eşleşmeyen istekler
+"unmatched" altında toplanır, böylece etiket kardinalitesi route sayısıyla sınırlı kalır.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+
+from app.core.cache import result_cache
+from app.core.catalog import category_catalog
+from app.core.config import settings
+from app.core.principal import auth_cache
+from app.services.recurring import recurring_detector
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)   # son kova: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.in_progress = 0
+        self.requests: dict[tuple, int] = {}          # (method, route, status) -> n
+        self.latency: dict[tuple, _Histogram] = {}     # (method, route) -> histogram
+        self.db_seconds: dict[tuple, float] = {}       # (method, route) -> toplam DB süresi
+        self.db_queries: dict[tuple, int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float,
+                db_seconds: float, db_queries: int) -> None:
+        key = (method, route)
+        rkey = (method, route, status)
+        self.requests[rkey] = self.requests.get(rkey, 0) + 1
+        h = self.latency.get(key)
+        if h is None:
+            h = self.latency[key] = _Histogram()
+        h.observe(seconds)
+        self.db_seconds[key] = self.db_seconds.get(key, 0.0) + db_seconds
+        self.db_queries[key] = self.db_queries.get(key, 0) + db_queries
+
+
+request_metrics = RequestMetrics()
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    label = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if label is None:
+        return "unmatched"
+    # yeni FastAPI sürümlerinde include edilen router'ın route'u prefix'siz gelir
+    prefix = settings.API_PREFIX
+    if prefix and scope["path"].startswith(prefix) and not label.startswith(prefix):
+        label = prefix + label
+    return label
+
+
+# ---------- exposition ----------
+def _labels(**kw) -> str:
+    inner = ",".join(f'{k}="{str(v)}"' for k, v in kw.items())
+    return "{" + inner + "}"
+
+
+def _family(lines: list, name: str, typ: str, help_: str) -> None:
+    lines.append(f"# HELP {name} {help_}")
+    lines.append(f"# TYPE {name} {typ}")
+
+
+def render() -> str:
+    m = request_metrics
+    lines: list[str] = []
+
+    _family(lines, "http_requests_in_progress", "gauge", "Requests currently being served.")
+    lines.append(f"http_requests_in_progress {m.in_progress}")
+
+    _family(lines, "http_requests_total", "counter", "Requests by method, route and status.")
+    for (method, route, status), n in list(m.requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+
+    _family(lines, "http_request_duration_seconds", "histogram", "Request latency.")
+    for (method, route), h in list(m.latency.items()):
+        cum = 0
+        for le, c in zip(LATENCY_BUCKETS + ("+Inf",), h.counts):
+            cum += c
+            lines.append(
+                f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cum}"
+            )
+        lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {h.sum}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {h.count}")
+
+    _family(lines, "http_request_db_seconds_total", "counter", "DB time spent per route.")
+    for (method, route), v in list(m.db_seconds.items()):
+        lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {v}")
+    _family(lines, "http_request_db_queries_total", "counter", "SQL statements executed per route.")
+    for (method, route), v in list(m.db_queries.items()):
+        lines.append(f"http_request_db_queries_total{_labels(method=method, route=route)} {v}")
+
+    from app.db.session import pool_status   # session -> instrumentation -> metrics döngüsü
+    pool = pool_status()
+    for key, name, typ, help_ in (
+        ("size", "db_pool_size", "gauge", "Configured pool size."),
+        ("checkedOut", "db_pool_checked_out", "gauge", "Connections currently checked out."),
+        ("checkedIn", "db_pool_checked_in", "gauge", "Idle connections in the pool."),
+        ("overflow", "db_pool_overflow", "gauge", "Overflow connections currently open."),
+        ("checkouts", "db_pool_checkouts_total", "counter", "Connection checkouts."),
+        ("timeouts", "db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+        ("waitSecondsTotal", "db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection."),
+        ("waitSecondsMax", "db_pool_wait_seconds_max", "gauge", "Longest single checkout wait."),
+    ):
+        if key in pool:
+            _family(lines, name, typ, help_)
+            lines.append(f"{name} {pool[key]}")
+
+    caches = (
+        ("result", result_cache.stats()),
+        ("auth", auth_cache.stats()),
+        ("category", category_catalog.stats()),
+        ("recurring", recurring_detector.stats()),
+    )
+    for key, name, typ, help_ in (
+        ("hits", "cache_hits_total", "counter", "Cache hits."),
+        ("misses", "cache_misses_total", "counter", "Cache misses."),
+        ("size", "cache_size", "gauge", "Entries currently cached."),
+        ("hitRatio", "cache_hit_ratio", "gauge", "hits / (hits + misses) since start."),
+    ):
+        _family(lines, name, typ, help_)
+        for cache_name, stats in caches:
+            lines.append(f"{name}{_labels(cache=cache_name)} {stats[key]}")
+
+    return "\n".join(lines) + "\n"
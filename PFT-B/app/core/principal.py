@@ -0,0 +1,113 @@
+# app/core/principal.py
+"""
+Kimliği doğrulanmış kullanıcının hafif temsili (Principal) ve token -> principal cache'i.
+
+get_current_user her istekte JWT decode + users sorgusu yapmak yerine bu cache'e bakar:
+- anahtar access token'ın kendisi; TTL = min(AUTH_CACHE_TTL_SECONDS, token'ın kalan ömrü),
+  yani süresi dolmuş bir token cache'ten asla kabul edilmez
+- User satırı ORM üzerinden güncellenince/silinince (is_active dahil) o kullanıcının tüm
+  kayıtları düşer. Başka worker'lardaki kopyalar en geç TTL sonunda yenilenir.
+Principal ORM nesnesi değildir; sadece user.id'ye ihtiyaç duyan endpoint'ler User yüklemez.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    name: str
+    email: str
+    is_active: bool
+    created_at: datetime
+
+
+class AuthCache:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(token)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, principal = item
+            if expires_at < now:
+                self._drop(token)
+                self.misses += 1
+                return None
+            self._data.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: Principal, token_exp: Optional[int]) -> None:
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[token] = (time.monotonic() + ttl, principal)
+            self._data.move_to_end(token)
+            self._by_user.setdefault(principal.id, set()).add(token)
+            while len(self._data) > self.maxsize:
+                self._drop(next(iter(self._data)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in self._by_user.pop(user_id, ()):
+                self._data.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._by_user.clear()
+
+    def _drop(self, token: str) -> None:
+        # lock tutulurken çağrılır
+        _, principal = self._data.pop(token)
+        tokens = self._by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[principal.id]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": (self.hits / total) if total else 0.0,
+        }
+
+
+auth_cache = AuthCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target) -> None:
+    auth_cache.invalidate_user(target.id)
@@ -1,16 +1,102 @@
 # app/core/security.py
+# passlib / jose / multiprocessing ilk kullanımda import edilir: worker cold start'ı ve
+# app'i import eden CLI/testler bunların yükleme maliyetini ödemez.
+import threading
 from datetime import datetime, timedelta, timezone
-from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    # min_rounds = rounds -> maliyet artırılınca eski hash'ler login'de yeniden hash'lenir
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    )
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+# --- bcrypt process pool -----------------------------------------------------
+# bcrypt CPU'yu ve (senkron çağrılınca) FastAPI'nin ortak threadpool'unu tüketir.
+# İşler ayrı, boyutu sınırlı bir process pool'da çalışır; aynı anda bekleyen iş sayısı
+# PASSWORD_HASH_MAX_PENDING ile sınırlıdır, doluysa PasswordHasherBusy (-> 503) atılır.
+# Böylece bir login fırtınasında hashing'i bekleyen thread sayısı da bu sınırı aşmaz.
+class PasswordHasherBusy(Exception):
+    pass
+
+# (ProcessPoolExecutor, BoundedSemaphore) | None: ikisi tek referansta kurulur ve birlikte
+# değiştirilir; okuyan hiçbir zaman bir pool'u başka pool'un slot'larıyla (ya da None) görmez.
+# Slot'u alan iş, shutdown sonrası da aldığı semaforu bırakır. (Import sonrası ayarlar geçerli.)
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    """(pool, slots)"""
+    global _pool
+    state = _pool
+    if state is None:
+        with _pool_lock:
+            state = _pool
+            if state is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                state = _pool = (
+                    ProcessPoolExecutor(
+                        max_workers=settings.PASSWORD_HASH_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),  # thread'li process'ten fork yok
+                    ),
+                    threading.BoundedSemaphore(max(settings.PASSWORD_HASH_MAX_PENDING, 1)),
+                )
+    return state
+
+def shutdown_hash_pool() -> None:
+    global _pool
+    with _pool_lock:
+        state, _pool = _pool, None
+    if state is not None:
+        state[0].shutdown(wait=False, cancel_futures=True)
+
+def _run_hashing(fn, *args):
+    from concurrent.futures import CancelledError, TimeoutError as FutureTimeout
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)            # pool kapalı: eski senkron davranış
+    pool, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = pool.submit(fn, *args)
+    except RuntimeError:
+        slots.release()             # arada shutdown edildi (uygulama kapanıyor)
+        raise PasswordHasherBusy()
+    except BaseException:
+        slots.release()
+        raise
+    # slot iş bitince (ya da iptal edilince) boşalır; timeout'ta istek döner ama iş hâlâ
+    # pool'da çalışıyor/sırada, sınır gerçekten bekleyen işi saymalı
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except (FutureTimeout, CancelledError):      # CancelledError: shutdown sıradakini iptal etti
+        raise PasswordHasherBusy()
+
+def hash_password_pooled(password: str) -> str:
+    return _run_hashing(get_password_hash, password)
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(doğru mu, yeni hash | None). Yeni hash, mevcut hash eski parametrelerle üretilmişse döner."""
+    return _run_hashing(_verify_and_update, plain_password, hashed_password)
 
 def _now():
     # timezone-aware tek tip kullanım
@@ -25,6 +111,7 @@ def create_access_token(subject: str) -> str:
         "nbf": int(now.timestamp()),
         "exp": int(exp.timestamp()),
     }
+    from jose import jwt
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 def create_refresh_token(subject: str) -> str:
@@ -37,4 +124,5 @@ def create_refresh_token(subject: str) -> str:
         "exp": int(exp.timestamp()),
         "typ": "refresh",
     }
+    from jose import jwt
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
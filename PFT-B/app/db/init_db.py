@@ -0,0 +1,20 @@
+# app/db/init_db.py
+"""
+Geliştirme için şema kurulumu. Production şeması Alembic ile yönetilir
+(`alembic upgrade head`); bu yol startup'ta DB_AUTO_CREATE ile (varsayılan: sadece sqlite
+URL'lerinde) ya da `python -m app.cli create-schema` ile çalışır. create_all idempotent'tir.
+"""
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+
+
+def create_schema(engine: Engine) -> None:
+    import app.models  # noqa: F401  (tüm tablolar metadata'ya kaydolsun)
+    from app.services import search
+
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        # FTS5 sanal tablo + trigger'lar metadata'da yok; create_all onları kurmaz
+        with engine.begin() as conn:
+            search.install_sqlite(conn)
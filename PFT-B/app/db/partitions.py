@@ -0,0 +1,106 @@
+# app/db/partitions.py
+"""
+Postgres'te `transactions` tablosunun aylık range partition bakımı.
+
+Şema alembic e2a9c4f7b310 ile kurulur: parent `transactions` PARTITION BY RANGE (occurred_at),
+aylık `transactions_yYYYYmMM` partition'ları ve aralık dışı satırlar için `transactions_default`.
+Yeni ayların partition'ları önceden açılmalı; açılmamışsa satırlar default partition'a düşer
+(yazma hata vermez) ve bir sonraki `ensure_partitions` onları kendi partition'ına taşır.
+
+    python -m app.cli partitions --ahead 3      # cron / deploy adımı
+    DB_PARTITION_AHEAD_MONTHS=3                 # ya da uygulama başlangıcında
+
+SQLite'ta (ve partition'sız Postgres şemasında) hiçbir şey yapmaz.
+"""
+from __future__ import annotations
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARENT = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+_LOCK_KEY = 0x7478_7061   # pg_advisory_xact_lock: aynı anda tek bakım (worker'lar / cron)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def _bound(d: date) -> str:
+    # partition sınırları DDL'de literal olmalı (bind parametresi kabul edilmez)
+    return f"'{d.isoformat()} 00:00:00+00'"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :t AND pg_table_is_visible(c.oid))"
+    ), {"t": PARENT}))
+
+
+def existing_partitions(conn: Connection) -> set[str]:
+    return set(conn.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :t AND pg_table_is_visible(p.oid)"
+    ), {"t": PARENT}))
+
+
+def create_partition(conn: Connection, month: date) -> str:
+    """`month` için partition açar. Default partition'da o aya ait satır varsa önce
+    ayrı tabloya taşınır, sonra ATTACH edilir (aksi halde CREATE ... PARTITION OF hata verir)."""
+    name = partition_name(month)
+    lo, hi = _bound(month), _bound(_next_month(month))
+    stray = conn.scalar(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE occurred_at >= {lo} AND occurred_at < {hi})"
+    ))
+    if not stray:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} FOR VALUES FROM ({lo}) TO ({hi})"))
+        return name
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at >= {lo} AND occurred_at < {hi} "
+        f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+    ))
+    conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({lo}) TO ({hi})"))
+    return name
+
+
+def ensure_partitions(conn: Connection, ahead: int = 3, start: Optional[date] = None) -> list[str]:
+    """[start, bu ay + ahead] aralığındaki eksik aylık partition'ları açar; açılanları döner.
+    start verilmezse bu ay. Çağıranın transaction'ında çalışır (DDL Postgres'te transactional)."""
+    if not is_partitioned(conn):
+        return []
+    conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _LOCK_KEY})
+
+    today = datetime.now(timezone.utc).date()
+    month = date(today.year, today.month, 1)
+    last = month
+    for _ in range(ahead):
+        last = _next_month(last)
+    month = date(start.year, start.month, 1) if start is not None else month
+
+    have = existing_partitions(conn)
+    created = []
+    while month <= last:
+        if partition_name(month) not in have:
+            created.append(create_partition(conn, month))
+        month = _next_month(month)
+
+    # default'ta kalan satırlar partition'ı olmayan (genelde aralıktan eski, import edilmiş)
+    # aylara aittir; onlara da partition aç ki default küçük kalsın
+    stray_months = conn.scalars(text(
+        f"SELECT DISTINCT date_trunc('month', occurred_at AT TIME ZONE 'UTC')::date FROM {DEFAULT_PARTITION}"
+    )).all()
+    for m in sorted(stray_months):
+        created.append(create_partition(conn, m))
+    return created
@@ -1,7 +1,158 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+
+
+# ---------- pool metrics ----------
+class PoolStats:
+    """Bağlantı bekleme süresi / timeout sayaçları. Anlık doluluk için `pool_status()`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # havuzdan bağlantı alma süresi (boş bağlantı / overflow beklemesi dahil)
+    # logger adı normalde modül + sınıf adı olur (app.db.session...) ve app.* handler'ına düşer;
+    # QueuePool'unkiyle aynı kalsın ki echo_pool / sqlalchemy.pool log ayarları geçerli olsun
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - t0)
+
+
+# ---------- engine ----------
+def _engine_kwargs(url) -> dict:
+    kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return kwargs   # :memory: -> SingletonThreadPool; pool ayarları uygulanmaz
+
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_backend_name() == "sqlite":
+        # FastAPI threadpool'u bağlantıları thread'ler arasında taşır
+        kwargs["connect_args"] = {"check_same_thread": False}
+    elif url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def _sqlite_now() -> str:
+    # SQLAlchemy'nin sqlite DateTime metin biçimi (UTC); string karşılaştırması doğru sıralar
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _create_engine() -> Engine:
+    url = make_url(settings.DATABASE_URL)
+    engine = create_engine(url, **_engine_kwargs(url))
+
+    if url.get_backend_name() == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_con, _record):
+            cur = dbapi_con.cursor()
+            if url.database not in (None, "", ":memory:"):
+                cur.execute("PRAGMA journal_mode=WAL")      # okuyucular yazarı beklemez
+            cur.execute("PRAGMA synchronous=NORMAL")        # WAL ile güvenli, fsync'i azaltır
+            cur.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cur.execute("PRAGMA foreign_keys=ON")           # ondelete CASCADE/RESTRICT postgres'teki gibi
+            cur.close()
+            # ck_transactions_not_future postgres'in NOW()'unu kullanır; sqlite'ta yok
+            dbapi_con.create_function("NOW", 0, _sqlite_now)
+
+    instrument_engine(engine)   # istek başı sorgu sayısı / DB süresi (Server-Timing)
+    return engine
+
+
+def get_engine() -> Engine:
+    """Engine ilk ihtiyaçta kurulur (import sırasında bağlantı/engine yok).
+    Uygulamada lifespan başlangıcında, CLI'da ilk SessionLocal() çağrısında."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+    return _engine
+
+
+def dispose_engine() -> None:
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            SessionLocal.configure(bind=None)
+
+
+class _LazySessionMaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
+
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def pool_status() -> dict:
+    if _engine is None:
+        return {"class": None}
+    pool = _engine.pool
+    out = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        out.update(
+            size=pool.size(),
+            checkedOut=pool.checkedout(),
+            checkedIn=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            maxOverflow=settings.DB_MAX_OVERFLOW,
+        )
+    out.update(
+        checkouts=pool_stats.checkouts,
+        timeouts=pool_stats.timeouts,
+        waitSecondsTotal=round(pool_stats.wait_seconds_total, 6),
+        waitSecondsMax=round(pool_stats.wait_seconds_max, 6),
+    )
+    return out
@@ -0,0 +1,14 @@
+# app/db/upsert.py
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session):
+    """ON CONFLICT DO UPDATE destekleyen dialect'lerin insert'ü; diğerlerinde None (ORM fallback)."""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    return None
@@ -0,0 +1,167 @@
+# app/explain.py
+"""
+Endpoint sorgularının plan kontrolü (EXPLAIN), index regresyonlarını yakalamak için.
+
+    python -m app.cli seed --users 2 --tx-per-user 5000
+    python -m app.cli explain [--email bench1@example.com] [--verbose]
+
+Okuma endpoint'leri TestClient ile çağrılır, engine'e giden her SELECT yakalanır ve aynı
+parametrelerle EXPLAIN edilir. Uygulama tablolarından birinde (partition'lar dahil)
+sequential scan görülürse sorgu başarısız sayılır; komut exit 1 ile biter (CI kapısı).
+- postgres: `EXPLAIN (FORMAT JSON)`, `enable_seqscan = off` ile — küçük tablolarda planner
+  seq scan'i zaten seçer; kapalıyken hâlâ Seq Scan ya da koşulsuz (tam) Index Scan varsa
+  kullanılabilir index yoktur
+- sqlite: `EXPLAIN QUERY PLAN`, `SCAN <tablo>` satırları (index'in tamamını okuyan
+  `SCAN <tablo> USING INDEX` dahil; index'li erişim `SEARCH` olarak görünür)
+"""
+from __future__ import annotations
+import re
+from typing import Callable, Optional
+
+from app.bench import _scenarios
+from app.services.seed import DEFAULT_PASSWORD
+
+# bench senaryolarına ek olarak planı kontrol edilen okuma endpoint'leri
+EXTRA_SCENARIOS = [
+    ("transactions.by_category", "GET", "/transactions", {"params": {"limit": 100, "categoryId": None}}),
+    ("transactions.by_type", "GET", "/transactions", {"params": {"limit": 100, "type": "expense"}}),
+    ("transactions.range", "GET", "/transactions", {"params": {"start": "2024-01-01", "end": "2024-03-31"}}),
+    ("transactions.export", "GET", "/transactions/export", {"params": {"format": "ndjson"}}),
+    ("categories.list", "GET", "/categories", {}),
+    ("budgets.list", "GET", "/budgets", {}),
+    ("notifications.list", "GET", "/notifications", {"params": {"unread": "true"}}),
+]
+
+# SCAN = tablonun ya da bir index'in tamamı okunur (index'li arama SEARCH olarak görünür)
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX \w+)?$")
+_PG_INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+def _tables() -> set[str]:
+    from app.db.base import Base
+    import app.models  # noqa: F401  (metadata'yı doldurur)
+    return set(Base.metadata.tables)
+
+
+def _owner(relation: str, tables: set[str]) -> Optional[str]:
+    # partition'lar (transactions_y2025m01, transactions_default) parent'a sayılır
+    if relation in tables:
+        return relation
+    for t in tables:
+        if relation.startswith(t + "_"):
+            return t
+    return None
+
+
+def _pg_seq_scans(plan, tables: set[str]) -> list[str]:
+    # enable_seqscan=off iken planner seq scan yerine koşulsuz (tam) index taraması seçebilir
+    found = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        kind = node.get("Node Type")
+        full = kind == "Seq Scan" or (kind in _PG_INDEX_SCANS and "Index Cond" not in node)
+        if full and _owner(node.get("Relation Name", ""), tables):
+            found.append(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return found
+
+
+def explain(conn, statement: str, parameters, tables: set[str]) -> tuple[list[str], str]:
+    """(seq scan yapılan tablolar, okunabilir plan) döner."""
+    if conn.dialect.name == "postgresql":
+        with conn.begin():
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            raw = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        plan = raw[0]["Plan"] if isinstance(raw, list) else raw
+        text_plan = repr(plan)
+        return _pg_seq_scans(plan, tables), text_plan
+
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    details = [r[-1] for r in rows]
+    scans = []
+    for d in details:
+        m = _SQLITE_SCAN.match(d)
+        if m and _owner(m.group(1), tables):
+            scans.append(m.group(1))
+    return scans, "\n".join(details)
+
+
+def run(*, email: str, months: int = 24, verbose: bool = False,
+        log: Callable[[str], None] = print) -> list[str]:
+    """Başarısız (seq scan yapan) sorguların açıklamalarını döner."""
+    from fastapi.testclient import TestClient      # httpx gerektirir
+
+    from app.main import app
+
+    with TestClient(app) as client:          # lifespan: engine kurulumu / kapanışı
+        failures = []
+        for name, statement, scans, plan in plans(client, email, months):
+            status = "SEQ SCAN " + ",".join(sorted(set(scans))) if scans else "ok"
+            log(f"{name:32s} {status}")
+            if verbose or scans:
+                log("    " + " ".join(statement.split())[:400])
+                log("    " + plan.replace("\n", "\n    "))
+            if scans:
+                failures.append(f"{name}: seq scan on {', '.join(sorted(set(scans)))}")
+    return failures
+
+
+def plans(client, email: str, months: int = 24) -> list[tuple[str, str, list[str], str]]:
+    """Senaryoları `client` ile çalıştırır; her farklı SELECT için
+    (senaryo, sorgu, seq scan yapılan tablolar, okunabilir plan) döner."""
+    from sqlalchemy import event
+
+    from app.core.cache import result_cache
+    from app.core.config import settings
+    from app.db.session import get_engine
+    from app.services.recurring import recurring_detector
+
+    prefix = settings.API_PREFIX or ""
+    captured: list[tuple[str, str, object]] = []
+    current = {"name": None}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if current["name"] and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            params = parameters[0] if executemany else parameters
+            captured.append((current["name"], statement, params))
+
+    r = client.post(f"{prefix}/auth/login", json={"email": email, "password": DEFAULT_PASSWORD})
+    if r.status_code != 200:
+        raise SystemExit(f"login failed for {email} ({r.status_code}); run `python -m app.cli seed` first")
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    cats = client.get(f"{prefix}/categories", headers=headers).json()
+    category_id = next((c["id"] for c in cats if c["type"] == "expense"), None)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        scenarios = [s[:4] for s in _scenarios(months)] + EXTRA_SCENARIOS
+        for name, method, path, kwargs in scenarios:
+            kwargs = dict(kwargs)
+            if "json" in kwargs:
+                kwargs["json"] = {"email": email, "password": DEFAULT_PASSWORD}
+            if "params" in kwargs and "categoryId" in kwargs["params"]:
+                kwargs["params"] = {**kwargs["params"], "categoryId": category_id}
+            result_cache.clear()           # cache'ten dönülürse sorgu atılmaz
+            recurring_detector.clear()
+            current["name"] = name
+            resp = client.request(method, prefix + path, headers=headers, **kwargs)
+            current["name"] = None
+            if resp.status_code >= 400:
+                raise SystemExit(f"{name}: HTTP {resp.status_code} {resp.text[:200]}")
+    finally:
+        current["name"] = None
+        event.remove(engine, "before_cursor_execute", capture)
+
+    tables = _tables()
+    out = []
+    seen = set()
+    with engine.connect() as conn:
+        for name, statement, params in captured:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            scans, plan = explain(conn, statement, params, tables)
+            out.append((name, statement, scans, plan))
+    return out
@@ -1,37 +1,92 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import auth
-from app.db.base import Base
-from app.db.session import engine
-from app.api.v1.categories import router as categories_router
-from app.api.v1.budgets import router as budgets_router
-from app.api.v1.transaction import router as transactions_router
-from app.api.v1.dashboard import router as dashboard_router
-from app.api.v1.reports import router as reports_router
-
-app = FastAPI(title=settings.APP_NAME)
-
-
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOW_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# DB tablolarını oluştur
-Base.metadata.create_all(bind=engine)
-
-# Routers
-app.include_router(auth.router, prefix=settings.API_PREFIX)
-app.include_router(categories_router, prefix=settings.API_PREFIX) 
-app.include_router(budgets_router, prefix=settings.API_PREFIX) 
-app.include_router(transactions_router, prefix=settings.API_PREFIX)
-app.include_router(dashboard_router, prefix=settings.API_PREFIX) 
-app.include_router(reports_router, prefix=settings.API_PREFIX) 
-@app.get("/")
-def root():
-    return {"message": f"Welcome to {settings.APP_NAME}!"}
+from app.core.instrumentation import RequestTimingMiddleware, configure_logging
+from app.core import metrics
+from app.db.session import dispose_engine, get_engine, pool_status
+
+log = logging.getLogger("app")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import sırasında DB'ye dokunulmaz; engine worker başlarken kurulur
+    engine = get_engine()
+    auto_create = settings.DB_AUTO_CREATE
+    if auto_create is None:
+        auto_create = engine.dialect.name == "sqlite"
+    if auto_create:
+        from app.db.init_db import create_schema
+        create_schema(engine)
+    else:
+        from sqlalchemy import inspect
+        if not inspect(engine).has_table("users"):
+            log.warning("database has no schema: run `alembic upgrade head` "
+                        "(development: `python -m app.cli create-schema` or DB_AUTO_CREATE=true)")
+    if settings.DB_PARTITION_AHEAD_MONTHS > 0 and engine.dialect.name == "postgresql":
+        from app.db.partitions import ensure_partitions
+        with engine.begin() as conn:
+            ensure_partitions(conn, ahead=settings.DB_PARTITION_AHEAD_MONTHS)
+    try:
+        yield
+    finally:
+        from app.core.security import shutdown_hash_pool
+        shutdown_hash_pool()
+        dispose_engine()
+
+
+def create_app() -> FastAPI:
+    from app.api.v1 import auth
+    from app.api.v1.categories import router as categories_router
+    from app.api.v1.budgets import router as budgets_router
+    from app.api.v1.transaction import router as transactions_router
+    from app.api.v1.dashboard import router as dashboard_router
+    from app.api.v1.reports import router as reports_router
+    from app.api.v1.notifications import router as notifications_router
+
+    configure_logging()
+    app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOW_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Server-Timing + istek logu (en dışta: CORS dahil tüm süreyi ölçer)
+    app.add_middleware(RequestTimingMiddleware)
+
+    # Routers
+    app.include_router(auth.router, prefix=settings.API_PREFIX)
+    app.include_router(categories_router, prefix=settings.API_PREFIX)
+    app.include_router(budgets_router, prefix=settings.API_PREFIX)
+    app.include_router(transactions_router, prefix=settings.API_PREFIX)
+    app.include_router(dashboard_router, prefix=settings.API_PREFIX)
+    app.include_router(reports_router, prefix=settings.API_PREFIX)
+    app.include_router(notifications_router, prefix=settings.API_PREFIX)
+
+    @app.get("/")
+    def root():
+        return {"message": f"Welcome to {settings.APP_NAME}!"}
+
+    @app.get("/health")
+    def health():
+        # pool doluluğu / bekleme süreleri: pool'u worker sayısına göre boyutlandırmak için
+        return {"status": "ok", "dbPool": pool_status()}
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+# `uvicorn app.main:app` için; fabrika ile: `uvicorn --factory app.main:create_app`
+app = create_app()
@@ -4,6 +4,10 @@ from .user_settings import UserSettings
 from .category import Category
 from .transaction import Transaction, TxnType   # <-- dosya adı transaction.py ise bu böyle kalır
 from .budget import Budget
+from .rollup import MonthlyRollup, DailyRollup
+from .notification import Notification
+from .archive import TransactionArchive
+from .category_stats import CategoryAmountStats
 
 __all__ = [
     "User",
@@ -12,4 +16,9 @@ __all__ = [
     "Transaction",
     "TxnType",
     "Budget",
+    "MonthlyRollup",
+    "DailyRollup",
+    "Notification",
+    "TransactionArchive",
+    "CategoryAmountStats",
 ]
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, LargeBinary, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class TransactionArchive(Base):
+    """Soğuk depolama: arşivlenmiş işlemler, (kullanıcı, ay) başına sıkıştırılmış NDJSON parçaları.
+
+    Satırlar transactions'tan silinir, özetleri monthly/daily rollup'larda kalır;
+    rollups.rebuild bu parçaları da okur. Yazma/okuma: app/services/retention.py
+    """
+    __tablename__ = "transaction_archives"
+    __table_args__ = (
+        Index("ix_tx_archives_user_month", "user_id", "month_start"),
+    )
+
+    id          = Column(Integer, primary_key=True)
+    user_id     = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    month_start = Column(Date, nullable=False)
+    tx_count    = Column(Integer, nullable=False)
+    codec       = Column(String(16), nullable=False)       # "ndjson+zlib"
+    payload     = Column(LargeBinary, nullable=False)
+    created_at  = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
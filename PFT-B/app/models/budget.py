@@ -19,6 +19,9 @@ class Budget(Base):
     month_start  = Column(Date, nullable=False)                 # örn: 2025-08-01
     limit_amount = Column(Numeric(12, 2), nullable=False)
     notify       = Column(Boolean, nullable=False, default=True)
+    # ayın gider toplamı; transaction yazma yolunda güncellenir (app/services/budgets.py)
+    spent_amount = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    alert_level  = Column(Integer, nullable=False, default=0, server_default="0")   # 0 | 80 | 100
     created_at   = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user     = relationship("User", backref="budgets")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, PrimaryKeyConstraint
+from app.db.base import Base
+
+
+class CategoryAmountStats(Base):
+    """(user, gider kategorisi) başına tutarların akan istatistikleri (Welford).
+
+    n / mean / m2 tutarların, log_mean / log_m2 ln(tutar)'ların momentleri (varyans = m2 / (n - 1)).
+    Rollup'larla aynı yazma yolunda güncellenir; /reports `anomalies` buradan eşik hesaplar.
+    Yazma/okuma: app/services/anomalies.py
+    """
+    __tablename__ = "category_amount_stats"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "category_id", name="pk_category_amount_stats"),
+    )
+
+    user_id     = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    n           = Column(Integer, nullable=False, default=0)
+    mean        = Column(Float, nullable=False, default=0)
+    m2          = Column(Float, nullable=False, default=0)
+    log_mean    = Column(Float, nullable=False, default=0)
+    log_m2      = Column(Float, nullable=False, default=0)
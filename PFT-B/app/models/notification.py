@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class Notification(Base):
+    """Kullanıcıya gösterilecek olaylar (şimdilik bütçe eşiği: kind="budget_threshold").
+
+    Satırlar yazma yolunda üretilir; okuma tarafı sadece listeler / okundu işaretler.
+    """
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+    )
+
+    id           = Column(Integer, primary_key=True)
+    user_id      = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind         = Column(String(32), nullable=False)
+    budget_id    = Column(Integer, ForeignKey("budgets.id", ondelete="CASCADE"), nullable=True)
+    category_id  = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=True)
+    month_start  = Column(Date, nullable=True)
+    threshold    = Column(Integer, nullable=True)                # geçilen eşik (%)
+    amount       = Column(Numeric(14, 2), nullable=True)         # o anki harcama
+    limit_amount = Column(Numeric(12, 2), nullable=True)
+    created_at   = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    read_at      = Column(DateTime(timezone=True), nullable=True)
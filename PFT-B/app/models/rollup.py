@@ -0,0 +1,39 @@
+from sqlalchemy import (
+    Column, Integer, Date, ForeignKey, Enum as SAEnum, Numeric, PrimaryKeyConstraint
+)
+from app.db.base import Base
+from app.models.transaction import TxnType
+
+
+class MonthlyRollup(Base):
+    """(user, ay, kategori, tip) başına önceden toplanmış işlem özeti.
+
+    transaction yazma yolunda aynı DB transaction'ı içinde güncellenir;
+    rapor/dashboard KPI ve kategori kırılımları ham satırlar yerine buradan okunur.
+    """
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "month_start", "category_id", "type", name="pk_monthly_rollups"),
+    )
+
+    user_id     = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    month_start = Column(Date, nullable=False)                  # örn: 2025-08-01
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    type        = Column(SAEnum(TxnType, name="txn_type"), nullable=False)
+    total       = Column(Numeric(14, 2), nullable=False, default=0)
+    tx_count    = Column(Integer, nullable=False, default=0)
+    max_amount  = Column(Numeric(12, 2), nullable=False, default=0)
+
+
+class DailyRollup(Base):
+    """(user, gün, tip) başına günlük nakit akışı; rapor grafikleri için."""
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "day", "type", name="pk_daily_rollups"),
+    )
+
+    user_id  = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    day      = Column(Date, nullable=False)
+    type     = Column(SAEnum(TxnType, name="txn_type"), nullable=False)
+    total    = Column(Numeric(14, 2), nullable=False, default=0)
+    tx_count = Column(Integer, nullable=False, default=0)
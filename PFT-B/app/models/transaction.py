@@ -2,7 +2,7 @@ from enum import Enum
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, DateTime, ForeignKey, Enum as SAEnum,
-    Numeric, Index, CheckConstraint
+    Numeric, Index, CheckConstraint, text
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -16,12 +16,36 @@ class TxnType(str, Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # postgres'te occurred_at'e göre aylık range partition (alembic e2a9c4f7b310, app/db/partitions.py);
+    # orada PK (id, occurred_at). create_all / SQLite düz tablo üretir.
     __table_args__ = (
         CheckConstraint("amount > 0", name="ck_transactions_amount_pos"),
         CheckConstraint("occurred_at <= NOW()", name="ck_transactions_not_future"),
-        Index("ix_tx_user_date", "user_id", "occurred_at"),
-        Index("ix_tx_type", "type"),
-        Index("ix_tx_category", "category_id"),
+        # sıcak sorguların hepsi silinmemiş satırlarda (deleted_at IS NULL) -> partial index'ler;
+        # INCLUDE kolonları (postgres) rollup/analitik sorgularını index-only scan'e çevirir.
+        # liste / cursor / son işlemler / en büyük gider / export
+        Index(
+            "ix_tx_live_user_date", "user_id", "occurred_at", "id",
+            postgresql_include=["amount", "type", "category_id"],
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # kategori filtresi + rollup max_amount yeniden hesabı
+        Index(
+            "ix_tx_live_user_cat_date", "user_id", "category_id", "occurred_at",
+            postgresql_include=["amount", "type"],
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_tx_category", "category_id"),     # categories FK (ON DELETE RESTRICT) kontrolü
+        # /reports recurring: son değişen satırlar (app/services/recurring.py)
+        Index("ix_tx_user_updated", "user_id", "updated_at"),
+        # purge işi: sadece silinmiş satırlar (küçük)
+        Index(
+            "ix_tx_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
     )
 
     id          = Column(Integer, primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -13,3 +13,5 @@ class User(Base):
     created_at    = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at    = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     last_login_at = Column(DateTime(timezone=True))
+    # işlem/bütçe/kategori her yazmada +1; ETag ve sonuç cache anahtarı buradan türetilir
+    data_version  = Column(BigInteger, nullable=False, default=0, server_default="0")
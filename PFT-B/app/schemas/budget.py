@@ -26,6 +26,7 @@ class BudgetUpdate(BaseModel):
 class BudgetOut(BudgetBase):
     id: int
     notify: bool
+    spent: float = 0                # ayın gider toplamı (sayaç)
     # month DB'den date gelirse "YYYY-MM" olarak serileştir
     @field_serializer("month")
     def serialize_month(self, v):
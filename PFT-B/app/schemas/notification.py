@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class NotificationOut(BaseModel):
+    id: int
+    kind: str                       # "budget_threshold"
+    budgetId: int | None = None
+    categoryId: int | None = None
+    month: str | None = None        # "YYYY-MM"
+    threshold: int | None = None    # geçilen eşik (%)
+    spent: float | None = None
+    limit: float | None = None
+    createdAt: str
+    read: bool
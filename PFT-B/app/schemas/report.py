@@ -50,13 +50,39 @@ class BudgetUsage(BaseModel):
     usagePct: float
     status: Literal["ok", "hit", "over"]
 
+class RecurringItem(BaseModel):
+    title: str                    # serinin son kaydındaki başlık
+    type: Literal["income", "expense"]
+    categoryId: Optional[int] = None
+    cadence: Literal["weekly", "biweekly", "monthly", "quarterly", "yearly"]
+    intervalDays: int             # aralıkların medyanı
+    amount: float                 # tutarların medyanı
+    lastAmount: float
+    count: int
+    firstDate: str                # YYYY-MM-DD
+    lastDate: str
+    nextDate: str                 # beklenen sonraki tarih
+    active: bool                  # nextDate (+ tolerans) henüz geçmedi
+
+class AnomalyItem(BaseModel):
+    transactionId: int
+    title: str
+    categoryId: Optional[int] = None
+    amount: float
+    date: str                     # YYYY-MM-DD
+    score: Optional[float] = None # ln(tutar) z-skoru (işlem hariç); None: kategoride sapma yok
+    typicalAmount: float          # kategorinin geometrik ortalaması
+    p95Amount: float              # log-normal varsayımıyla %95'lik
+    reason: Literal["amount"]
+
 class ReportOut(BaseModel):
+    # period/currency hep döner; diğerleri ?include= ile seçilebilir (seçilmeyen alan yanıtta yok)
     period: dict            # { start: "YYYY-MM", end: "YYYY-MM" }
     currency: str
-    kpis: ReportKpis
-    cashflow: dict          # { daily: CashflowDaily[], monthly: CashflowMonthly[] }
-    byCategory: List[CatStat]
-    budgetUsage: List[BudgetUsage]
-    recent: List[ReportTxMini]
-    recurring: List[dict]   # opsiyonel: basit çıkarım
-    anomalies: List[dict]   # opsiyonel: basit çıkarım
+    kpis: Optional[ReportKpis] = None
+    cashflow: Optional[dict] = None          # { daily: CashflowDaily[], monthly: CashflowMonthly[], granularity: "day"|"week"|"month"|"quarter" }
+    byCategory: Optional[List[CatStat]] = None
+    budgetUsage: Optional[List[BudgetUsage]] = None
+    recent: Optional[List[ReportTxMini]] = None
+    recurring: Optional[List[RecurringItem]] = None   # app/services/recurring.py
+    anomalies: Optional[List[AnomalyItem]] = None   # app/services/anomalies.py
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_serializer
-from typing import Optional
+from typing import Annotated, Optional, List, Literal, Union
 
 
 class TransactionBase(BaseModel):
@@ -39,3 +39,67 @@ class TransactionOut(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+class TransactionPage(BaseModel):
+    # keyset (cursor) sayfalama yanıtı; nextCursor None ise son sayfa
+    items: List[TransactionOut]
+    nextCursor: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    row: int        # CSV: dosyadaki satır no (başlık = 1); OFX: kaçıncı STMTTRN
+    error: str
+
+
+class ImportBatch(BaseModel):
+    # [firstRow, lastRow] aralığındaki geçerli satırlar commit edildi (hatalı satırlar `errors`da)
+    firstRow: int
+    lastRow: int
+    imported: int
+
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]   # en fazla 500 satır raporlanır
+    batches: List[ImportBatch] = []
+
+
+# ---------- batch ----------
+class BatchCreateOp(BaseModel):
+    op: Literal["create"]
+    data: TransactionCreate
+
+
+class BatchUpdateOp(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TransactionUpdate
+
+
+class BatchDeleteOp(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+BatchOp = Annotated[Union[BatchCreateOp, BatchUpdateOp, BatchDeleteOp], Field(discriminator="op")]
+
+
+class TransactionBatchIn(BaseModel):
+    ops: List[BatchOp] = Field(min_length=1, max_length=1000)
+
+
+class BatchItemResult(BaseModel):
+    index: int                            # ops listesindeki sıra
+    op: str
+    status: int                           # tekil endpoint'in döneceği HTTP kodu (201/200/204/404)
+    id: Optional[int] = None
+    item: Optional[TransactionOut] = None  # create/update sonucu
+    error: Optional[str] = None
+
+
+class TransactionBatchOut(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
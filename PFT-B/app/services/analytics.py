@@ -0,0 +1,321 @@
+# app/services/analytics.py
+"""
+Dashboard ve raporların ortak analitik katmanı.
+
+Bir dönem için gereken her şey iki round trip'te toplanır:
+  1) aggregates: monthly_rollups (+ daily_rollups) + budgets, tek UNION ALL;
+     kategori ad/ikon/renk bilgisi process içi katalogdan (app/core/catalog.py)
+  2) rows: son işlemler + en büyük gider, tek UNION ALL
+Toplamlar, kategori kırılımı ve nakit akışı Python'da bu satırlardan türetilir;
+satır sayısı işlem sayısına değil ay×kategori sayısına bağlıdır. Bütçe harcaması
+budgets.spent_amount sayacından okunur (app/services/budgets.py).
+"""
+from __future__ import annotations
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Integer, Numeric, String, cast, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.catalog import category_catalog
+from app.models.budget import Budget
+from app.models.rollup import DailyRollup, MonthlyRollup
+from app.models.transaction import Transaction, TxnType
+from app.services.rollups import month_key, next_month
+
+ZERO = Decimal(0)
+
+GRANULARITIES = ("day", "week", "month", "quarter")
+
+
+# ---------- granularity ----------
+def pick_granularity(start: date, end: date) -> str:
+    """Aralık uzunluğuna göre kova boyutu; grafik noktası ~100 civarında kalır."""
+    days = (end - start).days + 1
+    if days <= 92:
+        return "day"
+    if days <= 731:
+        return "week"
+    if days <= 366 * 8:
+        return "month"
+    return "quarter"
+
+
+def bucket_start(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())   # ISO: pazartesi
+    if granularity == "month":
+        return date(d.year, d.month, 1)
+    if granularity == "quarter":
+        return date(d.year, (d.month - 1) // 3 * 3 + 1, 1)
+    return d
+
+
+def _utc(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+# ---------- result ----------
+class PeriodSummary:
+    """`summarize` çıktısı. Tutarlar Decimal; şemaya çevirmek endpoint'lerin işi."""
+
+    def __init__(self, start: date, end: date):
+        self.start = start                      # ilk ay başı
+        self.end = end                          # son ay başı (dahil)
+        self.totals = {TxnType.income: ZERO, TxnType.expense: ZERO}
+        self.counts = {TxnType.income: 0, TxnType.expense: 0}
+        self.max_expense = ZERO
+        self.prev_totals: Optional[dict] = None  # {TxnType: Decimal}, prev_month=True ise
+        self.monthly: dict[date, list] = {}      # month_start -> [income, expense]
+        self.categories: dict[int, dict] = {}    # cid -> {name, icon, color, is_expense, total}
+        self.granularity: Optional[str] = None
+        self.series: list[tuple] = []            # [(bucket_start, income, expense)]
+        self.budgets: list[dict] = []            # {id, category_id, month, limit, spent, notify}
+        self.recent: list = []                   # Transaction satırları (Row)
+        self.largest = None                      # en büyük gider satırı (Row) | None
+
+    @property
+    def income(self) -> Decimal:
+        return self.totals[TxnType.income]
+
+    @property
+    def expense(self) -> Decimal:
+        return self.totals[TxnType.expense]
+
+    @property
+    def tx_count(self) -> int:
+        return self.counts[TxnType.income] + self.counts[TxnType.expense]
+
+    def categories_sorted(self) -> list[dict]:
+        return sorted(self.categories.values(), key=lambda c: c["total"], reverse=True)
+
+
+# ---------- queries ----------
+def _agg_select(kind: str, d, category_id, typ, amount, n, mx, ref_id):
+    # UNION parçalarının ortak kolon düzeni
+    return select(
+        literal(kind, String).label("kind"),
+        d.label("d"),
+        category_id.label("category_id"),
+        typ.label("type"),
+        amount.label("amount"),
+        n.label("n"),
+        mx.label("mx"),
+        ref_id.label("ref_id"),
+    )
+
+
+def _aggregates_stmt(user_id: int, months: Optional[tuple[date, date]],
+                     days: Optional[tuple[date, date]], budget_months: Optional[tuple[date, date]]):
+    parts = []
+    if months is not None:
+        parts.append(
+            _agg_select(
+                "m",
+                MonthlyRollup.month_start,
+                MonthlyRollup.category_id,
+                MonthlyRollup.type,
+                MonthlyRollup.total,
+                MonthlyRollup.tx_count,
+                MonthlyRollup.max_amount,
+                cast(null(), Integer),
+            ).where(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.month_start >= months[0],
+                MonthlyRollup.month_start <= months[1],
+            )
+        )
+    if days is not None:
+        parts.append(
+            _agg_select(
+                "d",
+                DailyRollup.day,
+                cast(null(), Integer),
+                DailyRollup.type,
+                DailyRollup.total,
+                DailyRollup.tx_count,
+                cast(null(), Numeric(12, 2)),
+                cast(null(), Integer),
+            ).where(
+                DailyRollup.user_id == user_id,
+                DailyRollup.day >= days[0],
+                DailyRollup.day <= days[1],
+            )
+        )
+    if budget_months is not None:
+        parts.append(
+            _agg_select(
+                "b",
+                Budget.month_start,
+                Budget.category_id,
+                cast(null(), MonthlyRollup.type.type),
+                Budget.limit_amount,
+                cast(Budget.notify, Integer),
+                Budget.spent_amount,
+                Budget.id,
+            ).where(
+                Budget.user_id == user_id,
+                Budget.month_start >= budget_months[0],
+                Budget.month_start <= budget_months[1],
+            )
+        )
+    if not parts:
+        return None
+
+    return union_all(*parts) if len(parts) > 1 else parts[0]
+
+
+def _rows_stmt(user_id: int, start: date, end: date, recent_limit: int, max_expense: Decimal):
+    base = (
+        Transaction.user_id == user_id,
+        Transaction.deleted_at.is_(None),
+        Transaction.occurred_at >= _utc(start),
+        Transaction.occurred_at < _utc(next_month(end)),
+    )
+    cols = (
+        Transaction.id, Transaction.title, Transaction.amount,
+        Transaction.category_id, Transaction.occurred_at, Transaction.type,
+    )
+    order = (Transaction.occurred_at.desc(), Transaction.id.desc())
+
+    parts = []
+    if recent_limit > 0:
+        parts.append(
+            select(literal("r", String).label("kind"), *cols)
+            .where(*base).order_by(*order).limit(recent_limit).subquery()
+        )
+    if max_expense > 0:
+        parts.append(
+            select(literal("l", String).label("kind"), *cols)
+            .where(*base, Transaction.type == TxnType.expense, Transaction.amount == max_expense)
+            .order_by(*order).limit(1).subquery()
+        )
+    if not parts:
+        return None
+    # LIMIT'li parçalar SQLite'ta UNION içinde doğrudan kullanılamaz -> subquery üzerinden
+    selects = [select(p) for p in parts]
+    return union_all(*selects) if len(selects) > 1 else selects[0]
+
+
+# ---------- entry point ----------
+def summarize(
+    db: Session,
+    user_id: int,
+    start: date,
+    end: date,
+    *,
+    totals: bool = True,
+    prev_month: bool = False,
+    granularity: Optional[str] = None,
+    budgets: bool = True,
+    recent_limit: int = 10,
+    largest: bool = True,
+) -> PeriodSummary:
+    """[start, end] ay aralığı (ay başları, dahil) için analitik özet.
+
+    totals:      gelir/gider toplamları, aylık akış ve kategori kırılımı (aylık rollup)
+    prev_month:  bir önceki ayın gelir/gider toplamlarını da getir (MoM için)
+    granularity: None -> nakit akışı serisi üretilmez; "auto" aralığa göre seçer
+    budgets:     aralıktaki aylara ait bütçeler ve harcama sayaçları
+    recent_limit / largest: ham satır sorgusu; ikisi de kapalıysa atılmaz
+
+    Kapalı bölümler için sorgu parçası hiç üretilmez.
+    """
+    start, end = month_key(start), month_key(end)
+    out = PeriodSummary(start, end)
+
+    m_from = month_key(start - timedelta(days=1)) if prev_month else start
+    if granularity == "auto":
+        granularity = pick_granularity(start, next_month(end) - timedelta(days=1))
+    out.granularity = granularity
+    days = None
+    if granularity in ("day", "week"):
+        days = (start, next_month(end) - timedelta(days=1))
+
+    # ---- 1) aggregates ----
+    budget_rows = []
+    daily: dict[date, list] = {}
+    if prev_month:
+        out.prev_totals = {TxnType.income: ZERO, TxnType.expense: ZERO}
+
+    need_months = totals or largest or granularity in ("month", "quarter")
+    stmt = _aggregates_stmt(
+        user_id,
+        (m_from, end) if need_months else None,
+        days,
+        (start, end) if budgets else None,
+    )
+    catalog = None
+    for r in (db.execute(stmt) if stmt is not None else ()):
+        if r.kind == "b":
+            budget_rows.append(r)
+            continue
+        amount = Decimal(r.amount or 0)
+        typ = TxnType(r.type)
+        if r.kind == "d":
+            b = daily.setdefault(r.d, [ZERO, ZERO])
+            b[0 if typ == TxnType.income else 1] += amount
+            continue
+
+        if r.d < start:
+            out.prev_totals[typ] += amount
+            continue
+
+        out.totals[typ] += amount
+        out.counts[typ] += int(r.n or 0)
+        mb = out.monthly.setdefault(r.d, [ZERO, ZERO])
+        if typ == TxnType.income:
+            mb[0] += amount
+        else:
+            mb[1] += amount
+            out.max_expense = max(out.max_expense, Decimal(r.mx or 0))
+
+        c = out.categories.get(r.category_id)
+        if c is None:
+            if catalog is None:
+                catalog = category_catalog.for_user(db, user_id)
+            info = catalog.get(r.category_id) or category_catalog.get(db, user_id, r.category_id)
+            c = out.categories[r.category_id] = {
+                "id": r.category_id,
+                "name": info.name if info else None,
+                "icon": info.icon if info else None,
+                "color": info.color_hex if info else None,
+                "is_expense": bool(info.is_expense) if info else typ == TxnType.expense,
+                "total": ZERO,
+            }
+        c["total"] += amount
+
+    out.monthly = dict(sorted(out.monthly.items()))
+
+    for r in budget_rows:
+        out.budgets.append({
+            "id": r.ref_id,
+            "category_id": r.category_id,
+            "month": r.d,
+            "limit": Decimal(r.amount),
+            "spent": Decimal(r.mx or 0),
+            "notify": bool(r.n),
+        })
+
+    if granularity is not None:
+        source = daily.items() if days is not None else out.monthly.items()
+        series: dict[date, list] = {}
+        for d, (inc, exp) in source:
+            b = series.setdefault(bucket_start(d, granularity), [ZERO, ZERO])
+            b[0] += inc
+            b[1] += exp
+        out.series = [(k, v[0], v[1]) for k, v in sorted(series.items())]
+
+    # ---- 2) rows ----
+    stmt = _rows_stmt(user_id, start, end, recent_limit, out.max_expense if largest else ZERO)
+    if stmt is not None:
+        for r in db.execute(stmt):
+            if r.kind == "l":
+                out.largest = r
+            else:
+                out.recent.append(r)
+        # UNION ALL sırayı garanti etmez
+        out.recent.sort(key=lambda r: (r.occurred_at, r.id), reverse=True)
+
+    return out
@@ -0,0 +1,255 @@
+# app/services/anomalies.py
+"""
+Olağandışı gider tespiti -> /reports `anomalies`.
+
+category_amount_stats (kullanıcı × gider kategorisi) tutarların ve ln(tutar)'ların akan
+momentlerini (Welford: n, mean, m2) tutar. Rollup'larla aynı yazma yolunda güncellenir:
+rollups.add_many / remove_many işlemleri `apply`a verir; parti kendi içinde Welford ile
+özetlenir ve satıra tek SQL ifadesiyle birleştirilir (Chan), silme/düzenleme bunun tersi.
+Geçmiş hiçbir istekte yeniden toplanmaz.
+
+Okuma: kategori başına eşik O(1) hesaplanır. Harcamalar log-normale yakın olduğu için skor
+ln(tutar) üzerinde z-skorudur ve işlemin kendisi istatistikten çıkarılarak (leave-one-out)
+hesaplanır; aksi halde küçük örneklerde tek bir uç değer kendi eşiğini yukarı çeker. Dönemdeki
+adaylar tek sorguda, kategori başına `amount > eşik` koşuluyla dönemin index aralığından
+(ix_tx_live_user_date ya da ix_tx_live_user_cat_date) okunur.
+
+Mevcut veri için:  python -m app.cli backfill-anomaly-stats [--user-id N]
+(rebuild-rollups da aynı işi yapar.)
+"""
+from __future__ import annotations
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import dialect_insert
+from app.models.category_stats import CategoryAmountStats
+from app.models.transaction import Transaction, TxnType
+from app.services.retention import iter_archived
+
+P95_Z = 1.645
+_MOMENTS = ("n", "mean", "m2", "log_mean", "log_m2")
+
+
+class Moments:
+    """Welford: tek geçişte ortalama ve kareli sapma toplamı."""
+    __slots__ = ("n", "mean", "m2", "log_mean", "log_m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = self.m2 = self.log_mean = self.log_m2 = 0.0
+
+    def push(self, amount) -> None:
+        x = float(amount)
+        lx = math.log(max(x, 0.01))
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        d = lx - self.log_mean
+        self.log_mean += d / self.n
+        self.log_m2 += d * (lx - self.log_mean)
+
+    def values(self) -> dict:
+        return {c: getattr(self, c) for c in _MOMENTS}
+
+
+def _batches(keys) -> dict[tuple[int, int], Moments]:
+    out: dict[tuple[int, int], Moments] = {}
+    for k in keys:
+        if k.type == TxnType.expense:
+            out.setdefault((k.user_id, k.category_id), Moments()).push(k.amount)
+    return out
+
+
+# ---------- write path ----------
+def apply(db: Session, keys, sign: int) -> None:
+    """keys: rollups.TxKey'ler; sign=1 ekleme, -1 çıkarma. Commit çağırana ait."""
+    batches = _batches(keys)
+    if not batches:
+        return
+    if sign > 0:
+        _merge(db, [dict(user_id=uid, category_id=cid, **m.values()) for (uid, cid), m in batches.items()])
+    else:
+        _unmerge(db, [
+            {"b_user_id": uid, "b_category_id": cid, **{f"b_{c}": v for c, v in m.values().items()}}
+            for (uid, cid), m in batches.items()
+        ])
+
+
+def _merged(n, mean, m2, nb, mb, qb):
+    # (n, mean, m2) + (nb, mb, qb); float sütun önce gelir ki SQL'de tamsayı bölmesi olmasın
+    delta = mb - mean
+    return (
+        mean + delta * nb / (n + nb),
+        m2 + qb + delta * delta * n * nb / (n + nb),
+    )
+
+
+def _merge(db: Session, rows: list[dict]) -> None:
+    model = CategoryAmountStats
+    insert_ = dialect_insert(db)
+    if insert_ is None:
+        for values in rows:
+            row = db.get(model, (values["user_id"], values["category_id"]))
+            if row is None:
+                db.add(model(**values))
+                continue
+            row.mean, row.m2 = _merged(row.n, row.mean, row.m2, values["n"], values["mean"], values["m2"])
+            row.log_mean, row.log_m2 = _merged(
+                row.n, row.log_mean, row.log_m2, values["n"], values["log_mean"], values["log_m2"])
+            row.n += values["n"]
+        db.flush()
+        return
+
+    stmt = insert_(model)
+    ex = stmt.excluded
+    mean, m2 = _merged(model.n, model.mean, model.m2, ex.n, ex.mean, ex.m2)
+    log_mean, log_m2 = _merged(model.n, model.log_mean, model.log_m2, ex.n, ex.log_mean, ex.log_m2)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "category_id"],
+        set_={"n": model.n + ex.n, "mean": mean, "m2": m2, "log_mean": log_mean, "log_m2": log_m2},
+    )
+    if len(rows) == 1:
+        db.execute(stmt.values(**rows[0]))
+    else:
+        db.execute(stmt, rows)
+
+
+def _unmerged(n, mean, m2, nb, mb, qb):
+    # _merged'in tersi; kalan n <= 1 ise m2 = 0, n = 0 ise mean = 0.
+    # CASE dalları değerlendirme sırası garantisi vermez (postgres sabitleri önceden katlar):
+    # bölen NULLIF ile sıfırdan korunur, NULL sonuç else_'e düşer
+    rest = n - nb
+    divisor = func.nullif(rest, 0)
+    new_m2 = m2 - qb - (mb - mean) * (mb - mean) * n * nb / divisor
+    return (
+        case((rest > 0, (mean * n - mb * nb) / divisor), else_=0.0),
+        case((and_(rest > 1, new_m2 > 0), new_m2), else_=0.0),
+    )
+
+
+def _unmerge(db: Session, rows: list[dict]) -> None:
+    st = CategoryAmountStats.__table__
+    pk = (st.c.user_id == bindparam("b_user_id"), st.c.category_id == bindparam("b_category_id"))
+    b = {c: bindparam(f"b_{c}") for c in _MOMENTS}
+    mean, m2 = _unmerged(st.c.n, st.c.mean, st.c.m2, b["n"], b["mean"], b["m2"])
+    log_mean, log_m2 = _unmerged(st.c.n, st.c.log_mean, st.c.log_m2, b["n"], b["log_mean"], b["log_m2"])
+    # satır yoksa ya da eksikse (backfill öncesi veri) dokunma; backfill düzeltir
+    db.execute(
+        update(st)
+        .where(*pk, st.c.n >= b["n"])
+        .values(n=st.c.n - b["n"], mean=mean, m2=m2, log_mean=log_mean, log_m2=log_m2),
+        rows,
+    )
+    db.execute(delete(st).where(*pk, st.c.n <= 0), rows)
+
+
+# ---------- backfill ----------
+def backfill(db: Session, user_id: Optional[int] = None, chunk_size: int = 1000) -> int:
+    """İstatistikleri silinmemiş işlemlerden ve arşivden baştan üretir. Commit çağırana ait.
+    Yazılan satır sayısını döner."""
+    wipe = delete(CategoryAmountStats)
+    if user_id is not None:
+        wipe = wipe.where(CategoryAmountStats.user_id == user_id)
+    db.execute(wipe)
+
+    q = select(Transaction.user_id, Transaction.category_id, Transaction.amount).where(
+        Transaction.deleted_at.is_(None),
+        Transaction.type == TxnType.expense,
+    )
+    if user_id is not None:
+        q = q.where(Transaction.user_id == user_id)
+
+    stats: dict[tuple[int, int], Moments] = {}
+    for r in db.execute(q.execution_options(yield_per=chunk_size)):
+        stats.setdefault((r.user_id, r.category_id), Moments()).push(r.amount)
+    for uid, item in iter_archived(db, user_id):
+        if item["type"] == TxnType.expense:
+            stats.setdefault((uid, item["categoryId"]), Moments()).push(item["amount"])
+
+    rows = [dict(user_id=uid, category_id=cid, **m.values()) for (uid, cid), m in stats.items()]
+    for i in range(0, len(rows), chunk_size):
+        db.execute(insert(CategoryAmountStats), rows[i:i + chunk_size])
+    return len(rows)
+
+
+# ---------- read path ----------
+class _Threshold:
+    __slots__ = ("n", "mu", "m2", "amount", "typical", "p95")
+
+    def __init__(self, s):
+        self.n, self.mu, self.m2 = s.n, s.log_mean, s.log_m2
+        z = settings.ANOMALY_Z
+        a = s.n / (s.n - 1)
+        # z_loo(d) = Z'yi sağlayan sapma (d = ln(tutar) - mu); z_loo d > 0 için artan
+        d = z * math.sqrt(self.m2 / (s.n - 2)) / math.sqrt(a * a + z * z * a / (s.n - 2))
+        self.typical = math.exp(self.mu)
+        self.p95 = math.exp(self.mu + P95_Z * math.sqrt(self.m2 / (s.n - 1)))
+        self.amount = max(math.exp(self.mu + d), self.typical * settings.ANOMALY_MIN_RATIO)
+
+    def score(self, amount) -> float:
+        """İşlemin kendisi çıkarılmış istatistiğe göre ln(tutar) z-skoru."""
+        d = math.log(float(amount)) - self.mu
+        a = self.n / (self.n - 1)
+        rest = self.m2 - d * d * a
+        if rest <= 0:
+            return math.inf
+        return d * a / math.sqrt(rest / (self.n - 2))
+
+
+def for_period(db: Session, user_id: int, start: date, end: date, limit: int = 20) -> list[dict]:
+    """[start, end] dönemindeki olağandışı giderler, skora göre azalan."""
+    thresholds = {
+        s.category_id: _Threshold(s)
+        for s in db.execute(
+            select(CategoryAmountStats).where(
+                CategoryAmountStats.user_id == user_id,
+                CategoryAmountStats.n >= max(settings.ANOMALY_MIN_SAMPLES, 3),
+            )
+        ).scalars()
+    }
+    if not thresholds:
+        return []
+
+    lo = datetime.combine(start, time.min, tzinfo=timezone.utc)
+    hi = datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    rows = db.execute(
+        select(Transaction.id, Transaction.title, Transaction.amount, Transaction.category_id,
+               Transaction.occurred_at)
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.deleted_at.is_(None),
+            Transaction.type == TxnType.expense,
+            Transaction.occurred_at >= lo,
+            Transaction.occurred_at < hi,
+            or_(*[
+                and_(Transaction.category_id == cid, Transaction.amount > Decimal(f"{t.amount:.2f}"))
+                for cid, t in thresholds.items()
+            ]),
+        )
+    ).all()
+
+    out = []
+    for r in rows:
+        t = thresholds[r.category_id]
+        score = t.score(r.amount)
+        out.append({
+            "transactionId": r.id,
+            "title": r.title,
+            "categoryId": r.category_id,
+            "amount": float(r.amount),
+            "date": r.occurred_at.date().isoformat(),
+            "score": round(score, 2) if math.isfinite(score) else None,
+            "typicalAmount": round(t.typical, 2),
+            "p95Amount": round(t.p95, 2),
+            "reason": "amount",
+        })
+    # score None: kategoride hiç sapma yok (tüm tutarlar aynı) -> en üstte
+    out.sort(key=lambda a: (a["score"] is None, a["score"] or 0), reverse=True)
+    return out[:limit]
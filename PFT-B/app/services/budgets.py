@@ -0,0 +1,160 @@
+# app/services/budgets.py
+"""
+Bütçe harcama sayaçları ve eşik uyarıları.
+
+budgets.spent_amount bütçenin ayındaki gider toplamıdır (kategori bütçesinde o kategori,
+genel bütçede tüm kategoriler). Rollup'larla aynı yazma yolunda, aynı DB transaction'ı
+içinde güncellenir: rollups.add_many / remove_many gider deltalarını `apply_expense`e verir.
+Böylece bütçe kullanımı okunurken işlemlere join gerekmez, bütçe satırı yeterlidir.
+
+alert_level son değerlendirilen eşiktir (0 / 80 / 100). Harcama bir eşiği yukarı doğru
+geçtiğinde notify açık bütçeler için notifications'a satır yazılır; harcama eşiğin altına
+inerse seviye sessizce düşer, tekrar geçilirse yeniden uyarılır.
+"""
+from __future__ import annotations
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, bindparam, case, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.budget import Budget
+from app.models.notification import Notification
+from app.models.rollup import MonthlyRollup
+from app.models.transaction import TxnType
+
+THRESHOLDS = (80, 100)      # artan sırada, %
+KIND_THRESHOLD = "budget_threshold"
+
+
+def level_for(spent: Decimal, limit: Decimal) -> int:
+    if limit is None or limit <= 0:
+        return 0
+    level = 0
+    for t in THRESHOLDS:
+        if spent * 100 >= limit * t:
+            level = t
+    return level
+
+
+def _alert_row(b, level: int) -> dict:
+    return {
+        "user_id": b.user_id,
+        "kind": KIND_THRESHOLD,
+        "budget_id": b.id,
+        "category_id": b.category_id,
+        "month_start": b.month_start,
+        "threshold": level,
+        "amount": b.spent_amount,
+        "limit_amount": b.limit_amount,
+    }
+
+
+# ---------- write path ----------
+def apply_expense(db: Session, deltas: dict[tuple[int, date, int], Decimal]) -> None:
+    """deltas: (user_id, month_start, category_id) -> gider değişimi (eksi = azalma).
+
+    Etkilenen bütçelere tek executemany UPDATE; sonra sadece o aylardaki bütçeler için
+    eşik değerlendirmesi. Commit çağırana ait.
+    """
+    rows = [
+        {"b_user_id": uid, "b_month": m, "b_category_id": cid, "b_delta": delta}
+        for (uid, m, cid), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    bt = Budget.__table__
+    res = db.execute(
+        update(bt)
+        .where(
+            bt.c.user_id == bindparam("b_user_id"),
+            bt.c.month_start == bindparam("b_month"),
+            or_(bt.c.category_id == bindparam("b_category_id"), bt.c.category_id.is_(None)),
+        )
+        .values(spent_amount=bt.c.spent_amount + bindparam("b_delta")),
+        rows,
+    )
+    # çoğu yazma bütçesi olmayan bir aya düşer; rowcount güvenilirse değerlendirmeyi atla
+    if res.rowcount == 0 and (len(rows) == 1 or db.get_bind().dialect.supports_sane_multi_rowcount):
+        return
+
+    evaluate(
+        db,
+        bt.c.user_id.in_({r["b_user_id"] for r in rows}),
+        bt.c.month_start.in_({r["b_month"] for r in rows}),
+    )
+
+
+def evaluate(db: Session, *where) -> int:
+    """Koşula uyan bütçelerin alert_level'ını harcamaya göre günceller, yukarı geçişlerde
+    bildirim yazar. Yazılan bildirim sayısını döner."""
+    bt = Budget.__table__
+    changed, alerts = [], []
+    q = select(
+        bt.c.id, bt.c.user_id, bt.c.category_id, bt.c.month_start,
+        bt.c.limit_amount, bt.c.spent_amount, bt.c.alert_level, bt.c.notify,
+    ).where(*where)
+    for b in db.execute(q):
+        level = level_for(Decimal(b.spent_amount), Decimal(b.limit_amount))
+        if level == b.alert_level:
+            continue
+        changed.append({"b_id": b.id, "b_level": level})
+        if level > b.alert_level and b.notify:
+            alerts.append(_alert_row(b, level))     # 80 ve 100 birlikte geçildiyse tek (100) bildirim
+
+    if changed:
+        db.execute(update(bt).where(bt.c.id == bindparam("b_id")).values(alert_level=bindparam("b_level")), changed)
+    if alerts:
+        db.execute(insert(Notification), alerts)
+    return len(alerts)
+
+
+def _spent_stmt(user_id, month_start, category_id):
+    q = select(func.coalesce(func.sum(MonthlyRollup.total), 0)).where(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.month_start == month_start,
+        MonthlyRollup.type == TxnType.expense,
+    )
+    if category_id is not None:
+        q = q.where(MonthlyRollup.category_id == category_id)
+    return q
+
+
+def sync(db: Session, budget: Budget) -> None:
+    """Oluşturulan / ayı, kategorisi ya da limiti değişen bütçenin sayacını rollup'tan
+    yeniden hesaplar ve eşiği değerlendirir. `budget` flush edilmiş olmalı (id gerekir)."""
+    budget.spent_amount = Decimal(db.scalar(_spent_stmt(budget.user_id, budget.month_start, budget.category_id)))
+    level = level_for(budget.spent_amount, Decimal(budget.limit_amount))
+    if level > (budget.alert_level or 0) and budget.notify:
+        db.add(Notification(**_alert_row(budget, level)))
+    budget.alert_level = level
+
+
+# ---------- rebuild ----------
+def recount(db: Session, user_id: Optional[int] = None) -> None:
+    """spent_amount / alert_level'ı monthly_rollups'tan baştan üretir (rollups.rebuild).
+    Bildirim üretmez. Commit çağırana ait."""
+    bt, mr = Budget.__table__, MonthlyRollup.__table__
+    spent = (
+        select(func.coalesce(func.sum(mr.c.total), 0))
+        .where(
+            mr.c.user_id == bt.c.user_id,
+            mr.c.month_start == bt.c.month_start,
+            mr.c.type == TxnType.expense,
+            or_(bt.c.category_id.is_(None), mr.c.category_id == bt.c.category_id),
+        )
+        .scalar_subquery()
+    )
+    level = case(
+        *[
+            (and_(bt.c.limit_amount > 0, bt.c.spent_amount * 100 >= bt.c.limit_amount * t), t)
+            for t in reversed(THRESHOLDS)
+        ],
+        else_=0,
+    )
+    scope = () if user_id is None else (bt.c.user_id == user_id,)
+    db.execute(update(bt).where(*scope).values(spent_amount=spent))
+    db.execute(update(bt).where(*scope).values(alert_level=level))
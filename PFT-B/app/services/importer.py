@@ -0,0 +1,274 @@
+# app/services/importer.py
+"""
+CSV / OFX banka ekstresi içe aktarımı.
+
+Dosya satır satır generator'larla okunur (hiçbir zaman tamamı belleğe alınmaz),
+satırlar `batch_size`'lık parçalar halinde executemany INSERT ile yazılır. Her parça kendi
+transaction'ında commit edilir; rollup'lar parça başına tek upsert ile güncellenir.
+Kategoriler her parçanın başında DB'den yeniden okunur: uzun bir import sırasında
+silinen/arşivlenen kategoriye sonraki parçalarda yazılmaz, o satırlar hata olarak raporlanır.
+Okuma ile INSERT arasında silinirse (FK hatası) parça güncel kategorilerle süzülüp bir kez
+daha denenir.
+Yanıttaki `batches` hangi satır aralıklarının commit edildiğini söyler.
+
+CSV başlıkları (büyük/küçük harf duyarsız):
+    date, title (veya description/name), amount, category (isim) | categoryId, note
+OFX: <STMTTRN> blokları (DTPOSTED, TRNAMT, NAME, MEMO); v1 SGML ve v2 XML.
+Negatif tutar gider, pozitif tutar gelir sayılır; kategori yoksa
+expense/income varsayılan kategorisi kullanılır.
+"""
+from __future__ import annotations
+import codecs
+import csv
+import io
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import IO, Iterator, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import bump_user_version
+from app.core.catalog import category_catalog
+from app.models.transaction import Transaction, TxnType
+from app.services import rollups
+
+MAX_REPORTED_ERRORS = 500
+
+
+class RowError(Exception):
+    pass
+
+
+# ---------- parsing helpers ----------
+_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y/%m/%d", "%Y%m%d")
+
+
+def parse_date(s: str) -> datetime:
+    s = (s or "").strip()
+    if len(s) >= 8 and s[:8].isdigit():
+        s = s[:8]                        # OFX: 20250912120000[-3:TRT]
+    for fmt in _DATE_FORMATS:
+        try:
+            d = datetime.strptime(s, fmt)
+            return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise RowError(f"Invalid date: {s!r}")
+
+
+def parse_amount(s: str) -> Decimal:
+    """'1.234,56' / '1,234.56' / '-45.00' / '₺ 12,5' biçimlerini kabul eder (işaret korunur)."""
+    s = re.sub(r"[^\d,.\-+]", "", (s or "").strip())
+    if not s:
+        raise RowError("Missing amount")
+    if "," in s and "." in s:
+        dec = "," if s.rfind(",") > s.rfind(".") else "."
+        thou = "." if dec == "," else ","
+        s = s.replace(thou, "").replace(dec, ".")
+    elif "," in s:
+        head, _, tail = s.rpartition(",")
+        s = f"{head.replace(',', '')}.{tail}" if len(tail) <= 2 else s.replace(",", "")
+    try:
+        return Decimal(s).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise RowError(f"Invalid amount: {s!r}")
+
+
+# ---------- readers ----------
+def _text_stream(fileobj: IO[bytes]) -> IO[str]:
+    return io.TextIOWrapper(fileobj, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def iter_csv(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    text = _text_stream(fileobj)
+    sample = text.read(4096)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    text.seek(0)
+    reader = csv.DictReader(text, dialect=dialect)
+    if reader.fieldnames:
+        reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+    for i, raw in enumerate(reader, start=2):       # 1. satır başlık
+        yield i, {
+            "date": raw.get("date"),
+            "title": raw.get("title") or raw.get("description") or raw.get("name"),
+            "amount": raw.get("amount"),
+            "category": raw.get("category"),
+            "categoryid": raw.get("categoryid"),
+            "note": raw.get("note") or raw.get("memo"),
+        }
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _ofx_tokens(fileobj: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[tuple[bool, str, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        buf += decoder.decode(chunk or b"", final=not chunk)
+        # son '<'den sonrası yarım etiket olabilir -> bir sonraki parçaya bırak
+        cut = len(buf) if not chunk else buf.rfind("<")
+        if cut > 0:
+            for m in _OFX_TAG.finditer(buf[:cut]):
+                yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+            buf = buf[cut:]
+        if not chunk:
+            return
+
+
+def iter_ofx(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    cur: Optional[dict] = None
+    n = 0
+    for closing, tag, value in _ofx_tokens(fileobj):
+        if tag == "STMTTRN":
+            if not closing:
+                cur = {}
+            elif cur is not None:
+                n += 1
+                yield n, {
+                    "date": cur.get("DTPOSTED"),
+                    "title": cur.get("NAME") or cur.get("MEMO") or cur.get("PAYEE"),
+                    "amount": cur.get("TRNAMT"),
+                    "category": None,
+                    "categoryid": None,
+                    "note": cur.get("MEMO") if cur.get("NAME") else None,
+                }
+                cur = None
+        elif cur is not None and not closing and value:
+            cur[tag] = value
+
+
+# ---------- import ----------
+class ImportStats:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self.batches: list[dict] = []    # commit edilen parçalar (satır aralığı, yazılan satır)
+
+    def error(self, row: int, msg: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": msg})
+
+
+def _load_categories(db: Session, user_id: int) -> tuple[dict, dict]:
+    # parça başına DB'den: uzun bir içe aktarma sırasında silinen/arşivlenen kategoriler görülür
+    cats = [c for c in category_catalog.refresh(db, user_id).all() if not c.is_archived]
+    by_id = {c.id: c for c in cats}
+    by_name: dict = {}
+    for c in cats:
+        by_name.setdefault(c.name.strip().lower(), c)   # kullanıcınınki ve global aynı isimdeyse ilki
+    return by_id, by_name
+
+
+def _build_row(raw: dict, user_id: int, by_id: dict, by_name: dict,
+               expense_cat: Optional[int], income_cat: Optional[int], today: date) -> dict:
+    title = (raw.get("title") or "").strip()
+    if not title:
+        raise RowError("Missing title")
+    occurred_at = parse_date(raw.get("date") or "")
+    if occurred_at.date() > today:
+        raise RowError("Date is in the future")
+    signed = parse_amount(raw.get("amount") or "")
+    if signed == 0:
+        raise RowError("Amount must be non-zero")
+
+    cat = None
+    if raw.get("categoryid"):
+        try:
+            cat = by_id.get(int(raw["categoryid"]))
+        except ValueError:
+            cat = None
+        if cat is None:
+            raise RowError(f"Unknown categoryId: {raw['categoryid']}")
+    elif raw.get("category"):
+        cat = by_name.get(raw["category"].strip().lower())
+        if cat is None:
+            raise RowError(f"Unknown category: {raw['category']}")
+    else:
+        cid = expense_cat if signed < 0 else income_cat
+        cat = by_id.get(cid) if cid is not None else None
+        if cat is None:
+            raise RowError("No category and no default category for this sign")
+
+    return {
+        "user_id": user_id,
+        "category_id": cat.id,
+        "type": TxnType.expense if cat.is_expense else TxnType.income,
+        "title": title[:120],
+        "amount": abs(signed),
+        "occurred_at": occurred_at,
+        "note": (raw.get("note") or "").strip()[:300] or None,
+    }
+
+
+def _write_batch(db: Session, user_id: int, batch: list[dict]) -> None:
+    db.execute(insert(Transaction), batch)
+    rollups.add_many(db, (
+        rollups.TxKey(r["user_id"], r["occurred_at"], r["category_id"], r["type"], r["amount"])
+        for r in batch
+    ))
+    bump_user_version(db, user_id)
+    db.commit()
+
+
+def _flush_batch(db: Session, user_id: int, batch: list[tuple[int, dict]], stats: ImportStats) -> None:
+    """batch: (satır no, satır). Commit eder; yazılamayan satırları hata olarak kaydeder."""
+    try:
+        _write_batch(db, user_id, [r for _, r in batch])
+    except IntegrityError:
+        # kategori parça okunduktan sonra silinmiş (FK): güncel kategorilerle süz, bir kez daha dene
+        db.rollback()
+        by_id, _ = _load_categories(db, user_id)
+        kept = []
+        for line_no, r in batch:
+            if r["category_id"] in by_id:
+                kept.append((line_no, r))
+            else:
+                stats.error(line_no, "Category was deleted during import")
+        batch = kept
+        if batch:
+            _write_batch(db, user_id, [r for _, r in batch])
+    if batch:
+        stats.imported += len(batch)
+        stats.batches.append({"firstRow": batch[0][0], "lastRow": batch[-1][0], "imported": len(batch)})
+
+
+def import_rows(
+    db: Session,
+    user_id: int,
+    rows: Iterator[tuple[int, dict]],
+    *,
+    expense_category_id: Optional[int] = None,
+    income_category_id: Optional[int] = None,
+    batch_size: int = 1000,
+) -> ImportStats:
+    stats = ImportStats()
+    today = datetime.now(timezone.utc).date()
+
+    cats: Optional[tuple[dict, dict]] = None
+    batch: list[tuple[int, dict]] = []
+    for line_no, raw in rows:
+        if cats is None:
+            cats = _load_categories(db, user_id)     # parçanın transaction'ı burada başlar
+        try:
+            row = _build_row(raw, user_id, *cats, expense_category_id, income_category_id, today)
+        except RowError as e:
+            stats.error(line_no, str(e))
+            continue
+        batch.append((line_no, row))
+        if len(batch) >= batch_size:
+            _flush_batch(db, user_id, batch, stats)
+            batch = []
+            cats = None
+    if batch:
+        _flush_batch(db, user_id, batch, stats)
+    return stats
@@ -0,0 +1,319 @@
+# app/services/recurring.py
+"""
+Tekrarlayan ödeme/gelir tespiti (abonelik, kira, fatura, maaş) -> /reports `recurring`.
+
+Gruplama: (tür, normalize başlık). Grubun tarihleri düzenli aralıklıysa (haftalık, iki haftalık,
+aylık, üç aylık, yıllık) seri sayılır; değilse tutarlara göre kümelenir ve her küme ayrıca
+denenir (aynı başlıkla iki ayrı abonelik gibi).
+
+Durum process içinde, kullanıcı başına tutulur (LRU + TTL):
+- ilk ihtiyaçta son RECURRING_LOOKBACK_MONTHS ayın silinmemiş işlemleri bir kez yüklenir
+- sonraki isteklerde `data_version` değişmemişse hazır sonuç döner (sorgu yok); gün dönmüşse
+  `active` bayrakları için seriler bellekteki satırlardan yeniden değerlendirilir
+- değişmişse sadece `updated_at >= watermark` satırları okunur (ix_tx_user_updated); yeni,
+  düzenlenmiş ve soft-delete edilmiş satırlar böylece gelir, sadece etkilenen gruplar
+  yeniden değerlendirilir
+- TTL dolunca (lookback penceresi kayar, geç commit edilen satırlar) baştan yüklenir
+Başka bir worker'daki yazmalar da `data_version` üzerinden görülür.
+"""
+from __future__ import annotations
+import re
+import threading
+import time
+import unicodedata
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from statistics import median
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.transaction import Transaction, TxnType
+
+# (ad, gün, tolerans gün, en az tekrar)
+CADENCES = (
+    ("weekly", 7, 1, 4),
+    ("biweekly", 14, 2, 3),
+    ("monthly", 30, 3, 3),
+    ("quarterly", 91, 7, 3),
+    ("yearly", 365, 10, 2),
+)
+REGULAR_SHARE = 0.8      # aralıkların en az bu kadarı toleransta olmalı
+AMOUNT_TOLERANCE = 0.2   # tutar kümesi: kümenin en küçüğünden en fazla %20 büyük
+# aynı anda açık kalmış transaction'ların updated_at'i watermark'tan biraz eski olabilir
+WATERMARK_SLACK = timedelta(minutes=5)
+
+_NON_WORD = re.compile(r"[\W\d_]+")
+
+
+def normalize_title(title: str) -> str:
+    """'NETFLIX.COM 03/2025' -> 'netflix com'; 'İnternet' -> 'internet'."""
+    s = unicodedata.normalize("NFKD", title.casefold())
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = _NON_WORD.sub(" ", s).strip()
+    return s or title.strip().casefold()
+
+
+class _Occ(NamedTuple):
+    updated_at: datetime
+    key: tuple            # (TxnType, normalize başlık)
+    day: date
+    amount: Decimal
+    category_id: int
+    title: str
+
+
+def _cadence(days: list[date], min_occurrences: int = 0) -> Optional[tuple[str, int, int]]:
+    intervals = [(b - a).days for a, b in zip(days, days[1:])]
+    if not intervals:
+        return None
+    mid = median(intervals)
+    for name, period, tol, min_count in CADENCES:
+        if len(days) < max(min_count, min_occurrences) or abs(mid - period) > tol:
+            continue
+        regular = sum(1 for i in intervals if abs(i - period) <= tol)
+        if regular >= REGULAR_SHARE * len(intervals):
+            return name, round(mid), tol
+    return None
+
+
+def _next_date(last: date, cadence: str, interval: int) -> date:
+    step = {"monthly": 1, "quarterly": 3, "yearly": 12}.get(cadence)
+    if step is None:
+        return last + timedelta(days=interval)
+    y, m = divmod(last.year * 12 + last.month - 1 + step, 12)
+    m += 1
+    return date(y, m, min(last.day, monthrange(y, m)[1]))
+
+
+def _series(occs: list[_Occ], today: date, min_occurrences: int = 0) -> Optional[dict]:
+    # aynı gün birden fazla kayıt tek tekrar sayılır
+    by_day: dict[date, _Occ] = {}
+    for o in occs:
+        by_day.setdefault(o.day, o)
+    days = sorted(by_day)
+    found = _cadence(days, min_occurrences)
+    if found is None:
+        return None
+    cadence, interval, tol = found
+    last = by_day[days[-1]]
+    next_date = _next_date(last.day, cadence, interval)
+    return {
+        "title": last.title,
+        "type": last.key[0].value,
+        "categoryId": last.category_id,
+        "cadence": cadence,
+        "intervalDays": interval,
+        "amount": float(median(o.amount for o in by_day.values())),
+        "lastAmount": float(last.amount),
+        "count": len(days),
+        "firstDate": days[0].isoformat(),
+        "lastDate": days[-1].isoformat(),
+        "nextDate": next_date.isoformat(),
+        "active": next_date + timedelta(days=tol) >= today,
+    }
+
+
+def detect(occs: list[_Occ], today: date) -> list[dict]:
+    """Tek bir (tür, başlık) grubunun serileri. Tutar kümelerinde en az 3 tekrar aranır;
+    sık görülen bir başlığın rastgele iki kaydı yıllık seri gibi görünebilir."""
+    whole = _series(occs, today)
+    if whole is not None:
+        return [whole]
+    out = []
+    cluster: list[_Occ] = []
+    for o in sorted(occs, key=lambda o: o.amount):
+        if cluster and o.amount > cluster[0].amount * Decimal(1 + AMOUNT_TOLERANCE):
+            if (s := _series(cluster, today, 3)) is not None:
+                out.append(s)
+            cluster = []
+        cluster.append(o)
+    if len(cluster) < len(occs) and (s := _series(cluster, today, 3)) is not None:
+        out.append(s)
+    return out
+
+
+class _UserState:
+    __slots__ = ("lock", "version", "today", "expires_at", "watermark", "rows", "groups", "series", "result")
+
+    def __init__(self, expires_at: float):
+        self.lock = threading.Lock()
+        self.version: Optional[int] = None
+        self.today: Optional[date] = None
+        self.expires_at = expires_at
+        self.watermark: Optional[datetime] = None
+        self.rows: dict[int, _Occ] = {}
+        self.groups: dict[tuple, set[int]] = {}
+        self.series: dict[tuple, list[dict]] = {}
+        self.result: list[dict] = []
+
+    def remove(self, tx_id: int, dirty: set) -> None:
+        old = self.rows.pop(tx_id, None)
+        if old is not None:
+            self.groups[old.key].discard(tx_id)
+            dirty.add(old.key)
+
+    def add(self, tx_id: int, occ: _Occ, dirty: set) -> None:
+        self.rows[tx_id] = occ
+        self.groups.setdefault(occ.key, set()).add(tx_id)
+        dirty.add(occ.key)
+
+    def recompute(self, dirty: set, today: date) -> None:
+        for key in dirty:
+            ids = self.groups.get(key)
+            if not ids:
+                self.groups.pop(key, None)
+                self.series.pop(key, None)
+                continue
+            found = detect([self.rows[i] for i in ids], today)
+            if found:
+                self.series[key] = found
+            else:
+                self.series.pop(key, None)
+        result = [s for found in self.series.values() for s in found]
+        result.sort(key=lambda s: (s["type"] != "expense", -s["amount"]))
+        self.result = result
+
+
+_COLUMNS = (
+    Transaction.id, Transaction.title, Transaction.type, Transaction.amount,
+    Transaction.occurred_at, Transaction.category_id, Transaction.updated_at,
+)
+
+
+def current_day() -> date:
+    """Tespitte kullanılan gün (UTC); `active` buna göre hesaplanır."""
+    return datetime.now(timezone.utc).date()
+
+
+def _lookback_start(today: date) -> datetime:
+    months = today.year * 12 + today.month - 1 - settings.RECURRING_LOOKBACK_MONTHS
+    return datetime(months // 12, months % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _occ(r) -> _Occ:
+    return _Occ(r.updated_at, (TxnType(r.type), normalize_title(r.title)), r.occurred_at.date(),
+                r.amount, r.category_id, r.title)
+
+
+class RecurringDetector:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._users: OrderedDict[int, _UserState] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.incremental = 0
+
+    def for_user(self, db: Session, user_id: int, version: int, today: Optional[date] = None) -> list[dict]:
+        """Kullanıcının tespit edilen serileri; `version` = data_version (istek başında okunmuş),
+        `today` = `active` için gün (verilmezse bugün; ETag/cache anahtarındakiyle aynı olmalı)."""
+        today = today or current_day()
+        now = time.monotonic()
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None or state.expires_at < now:
+                state = _UserState(now + self.ttl)
+                if self.maxsize > 0:
+                    self._users[user_id] = state
+                    while len(self._users) > self.maxsize:
+                        self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user_id)
+
+        with state.lock:                 # sadece bu kullanıcının isteklerini sıralar
+            if state.version == version:
+                if state.today != today:
+                    state.recompute(set(state.groups), today)   # sorgu yok
+                    state.today = today
+                self.hits += 1
+                return state.result
+            if state.version is None:
+                self.misses += 1
+                self._load(db, user_id, state, today)
+            else:
+                self.incremental += 1
+                self._apply_changes(db, user_id, state, today)
+                if state.today != today:
+                    state.recompute(set(state.groups), today)
+            state.version = version
+            state.today = today
+            return state.result
+
+    def _load(self, db: Session, user_id: int, state: _UserState, today: date) -> None:
+        # watermark satırlardan önce okunur: arada yazılanlar bir sonraki artımda gelir
+        state.watermark = db.scalar(
+            select(func.max(Transaction.updated_at)).where(Transaction.user_id == user_id)
+        )
+        rows = db.execute(
+            select(*_COLUMNS).where(
+                Transaction.user_id == user_id,
+                Transaction.deleted_at.is_(None),
+                Transaction.occurred_at >= _lookback_start(today),
+            )
+        )
+        dirty: set = set()
+        for r in rows:
+            state.add(r.id, _occ(r), dirty)
+        state.recompute(dirty, today)
+
+    def _apply_changes(self, db: Session, user_id: int, state: _UserState, today: date) -> None:
+        q = select(*_COLUMNS, Transaction.deleted_at).where(Transaction.user_id == user_id)
+        if state.watermark is not None:
+            q = q.where(Transaction.updated_at >= state.watermark - WATERMARK_SLACK)
+        lookback = _lookback_start(today).date()
+        dirty: set = set()
+        for r in db.execute(q):
+            if state.watermark is None or r.updated_at > state.watermark:
+                state.watermark = r.updated_at
+            # slack yüzünden aynı satırlar tekrar gelir; updated_at'e güvenilmez (SQLite'ta saniye
+            # çözünürlüğü), değişiklik içerikle anlaşılır
+            new = _occ(r) if r.deleted_at is None and r.occurred_at.date() >= lookback else None
+            old = state.rows.get(r.id)
+            if old == new:
+                continue
+            state.remove(r.id, dirty)
+            if new is not None:
+                state.add(r.id, new, dirty)
+        if dirty:
+            state.recompute(dirty, today)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses + self.incremental
+        return {
+            "size": len(self._users),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "incremental": self.incremental,
+            "hitRatio": (self.hits / total) if total else 0.0,
+        }
+
+
+recurring_detector = RecurringDetector(
+    maxsize=settings.RECURRING_CACHE_MAXSIZE,
+    ttl_seconds=settings.RECURRING_STATE_TTL_SECONDS,
+)
+
+
+def for_period(db: Session, user_id: int, version: int, start: date, end: date,
+               today: Optional[date] = None) -> list[dict]:
+    """[start, end] dönemiyle kesişen seriler (dönemde tekrarı olan ya da hâlâ süren)."""
+    lo, hi = start.isoformat(), end.isoformat()
+    return [
+        s for s in recurring_detector.for_user(db, user_id, version, today)
+        if s["firstDate"] <= hi and s["nextDate"] >= lo
+    ]
@@ -0,0 +1,213 @@
+# app/services/retention.py
+"""
+Sıcak tabloyu küçük tutan bakım işleri.
+
+purge_deleted: soft-delete edilmiş (deleted_at dolu) ve saklama süresi geçmiş satırları
+    kalıcı siler. Bu satırlar rollup'lara zaten dahil değil; görünür veri değişmez.
+archive_before: `cutoff` ayından eski, silinmemiş işlemleri transaction_archives'a
+    (kullanıcı × ay başına zlib ile sıkıştırılmış NDJSON) taşır ve transactions'tan siler.
+    Monthly/daily rollup'lar ve bütçe sayaçları olduğu gibi kalır: rapor/dashboard toplamları
+    değişmez; arşivlenmiş aylar için satır bazlı veriler (liste, son işlemler, en büyük
+    gider, export) artık gelmez. rollups.rebuild arşivi de okur.
+
+İkisi de `chunk_size` satırlık parçalar halinde çalışır, her parça kendi transaction'ında
+commit edilir; böylece uzun kilit/uzun transaction oluşmaz.
+
+    python -m app.cli purge-deleted [--days 30]
+    python -m app.cli archive [--months 36] [--user-id N]
+"""
+from __future__ import annotations
+import json
+import time
+import zlib
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import groupby
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.cache import bump_user_version
+from app.models.archive import TransactionArchive
+from app.models.transaction import Transaction, TxnType
+from app.models.user import User
+
+ARCHIVE_CODEC = "ndjson+zlib"
+
+_ARCHIVED_COLUMNS = (
+    Transaction.id, Transaction.user_id, Transaction.category_id, Transaction.type,
+    Transaction.title, Transaction.amount, Transaction.occurred_at, Transaction.note,
+    Transaction.created_at, Transaction.updated_at,
+)
+
+
+# ---------- payload ----------
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat() if dt is not None else None
+
+
+def encode_rows(rows) -> bytes:
+    lines = (
+        json.dumps({
+            "id": r.id,
+            "categoryId": r.category_id,
+            "type": TxnType(r.type).value,
+            "title": r.title,
+            "amount": str(r.amount),
+            "occurredAt": _iso(r.occurred_at),
+            "note": r.note,
+            "createdAt": _iso(r.created_at),
+            "updatedAt": _iso(r.updated_at),
+        }, ensure_ascii=False)
+        for r in rows
+    )
+    return zlib.compress("\n".join(lines).encode("utf-8"), 6)
+
+
+def decode_rows(payload: bytes) -> list[dict]:
+    text = zlib.decompress(payload).decode("utf-8")
+    out = []
+    for line in text.splitlines():
+        item = json.loads(line)
+        item["amount"] = Decimal(item["amount"])
+        item["type"] = TxnType(item["type"])
+        item["occurredAt"] = datetime.fromisoformat(item["occurredAt"])
+        out.append(item)
+    return out
+
+
+def iter_archived(db: Session, user_id: Optional[int] = None) -> Iterator[tuple[int, dict]]:
+    """(user_id, satır) çiftleri; parçalar teker teker açılır."""
+    q = select(TransactionArchive.user_id, TransactionArchive.payload).order_by(TransactionArchive.id)
+    if user_id is not None:
+        q = q.where(TransactionArchive.user_id == user_id)
+    for r in db.execute(q.execution_options(yield_per=50)):
+        for item in decode_rows(r.payload):
+            yield r.user_id, item
+
+
+def iter_archived_months(db: Session, months: set[tuple[int, date]]) -> Iterator[tuple[int, dict]]:
+    """Sadece verilen (user_id, ay başı) parçalarının satırları (ix_tx_archives_user_month)."""
+    if not months:
+        return
+    q = select(TransactionArchive.user_id, TransactionArchive.payload).where(
+        tuple_(TransactionArchive.user_id, TransactionArchive.month_start).in_(sorted(months))
+    )
+    for r in db.execute(q):
+        for item in decode_rows(r.payload):
+            yield r.user_id, item
+
+
+# ---------- jobs ----------
+class RetentionStats:
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+        self.users = 0
+
+
+def purge_deleted(db: Session, *, older_than: datetime, chunk_size: int = 1000, pause: float = 0.0,
+                  progress: Optional[Callable[[RetentionStats], None]] = None) -> RetentionStats:
+    """deleted_at < older_than olan satırları kalıcı siler (ix_tx_deleted_at)."""
+    stats = RetentionStats()
+    while True:
+        rows = db.execute(
+            select(Transaction.id, Transaction.occurred_at)
+            .where(Transaction.deleted_at.is_not(None), Transaction.deleted_at < older_than)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        db.execute(
+            delete(Transaction)
+            .where(
+                Transaction.id.in_([r.id for r in rows]),
+                # partition pruning: sadece bu satırların aralığındaki partition'lar
+                Transaction.occurred_at >= min(r.occurred_at for r in rows),
+                Transaction.occurred_at <= max(r.occurred_at for r in rows),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        stats.rows += len(rows)
+        stats.chunks += 1
+        if progress is not None:
+            progress(stats)
+        if len(rows) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return stats
+
+
+def _archive_chunk(db: Session, user_id: int, cutoff_dt: datetime, chunk_size: int) -> int:
+    rows = db.execute(
+        select(*_ARCHIVED_COLUMNS)
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.deleted_at.is_(None),
+            Transaction.occurred_at < cutoff_dt,
+        )
+        .order_by(Transaction.occurred_at, Transaction.id)
+        .limit(chunk_size)
+    ).all()
+    if not rows:
+        return 0
+
+    parts = []
+    for month, group in groupby(rows, key=lambda r: date(r.occurred_at.year, r.occurred_at.month, 1)):
+        group = list(group)
+        parts.append({
+            "user_id": user_id,
+            "month_start": month,
+            "tx_count": len(group),
+            "codec": ARCHIVE_CODEC,
+            "payload": encode_rows(group),
+        })
+    db.execute(insert(TransactionArchive), parts)
+    db.execute(
+        delete(Transaction)
+        .where(
+            Transaction.id.in_([r.id for r in rows]),
+            Transaction.occurred_at >= rows[0].occurred_at,
+            Transaction.occurred_at <= rows[-1].occurred_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # rollup'lar değişmez ama liste/export sonuçları değişir -> ETag / cache
+    bump_user_version(db, user_id)
+    db.commit()
+    return len(rows)
+
+
+def archive_before(db: Session, *, cutoff: date, chunk_size: int = 1000, user_id: Optional[int] = None,
+                   pause: float = 0.0,
+                   progress: Optional[Callable[[RetentionStats], None]] = None) -> RetentionStats:
+    """occurred_at < cutoff (ay başı) olan silinmemiş işlemleri arşive taşır.
+    Kullanıcı kullanıcı ilerler; her kullanıcıda ix_tx_live_user_date aralık taraması."""
+    stats = RetentionStats()
+    cutoff_dt = datetime(cutoff.year, cutoff.month, 1, tzinfo=timezone.utc)
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = db.scalars(select(User.id).order_by(User.id)).all()
+
+    for uid in user_ids:
+        moved = 0
+        while True:
+            n = _archive_chunk(db, uid, cutoff_dt, chunk_size)
+            if not n:
+                break
+            moved += n
+            stats.rows += n
+            stats.chunks += 1
+            if progress is not None:
+                progress(stats)
+            if n < chunk_size:
+                break
+            if pause:
+                time.sleep(pause)
+        if moved:
+            stats.users += 1
+    return stats
@@ -0,0 +1,293 @@
+# app/services/rollups.py
+"""
+Aylık (monthly_rollups) ve günlük (daily_rollups) rollup tablolarının bakımı.
+Okuma tarafı: app/services/analytics.py
+
+Yazma yolu (create/update/delete transaction) `add` / `remove` / `move` çağırır;
+hepsi çağıranın açık DB transaction'ı içinde çalışır, commit çağırana aittir.
+Aylık gider deltaları aynı adımda bütçe sayaçlarına da uygulanır (app/services/budgets.py),
+gider tutarları kategori istatistiklerine işlenir (app/services/anomalies.py).
+"""
+from __future__ import annotations
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from sqlalchemy import bindparam, case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.rollup import DailyRollup, MonthlyRollup
+from app.models.transaction import Transaction, TxnType
+from app.services import anomalies, budgets
+from app.services.retention import iter_archived, iter_archived_months
+
+
+class TxKey(NamedTuple):
+    """Bir işlemin rollup'ı etkileyen alanlarının anlık görüntüsü."""
+    user_id: int
+    occurred_at: datetime
+    category_id: int
+    type: TxnType
+    amount: Decimal
+
+
+def key_of(tx: Transaction) -> TxKey:
+    return TxKey(tx.user_id, tx.occurred_at, tx.category_id, TxnType(tx.type), Decimal(tx.amount))
+
+
+def month_key(dt: datetime | date) -> date:
+    return date(dt.year, dt.month, 1)
+
+
+def day_key(dt: datetime | date) -> date:
+    return date(dt.year, dt.month, dt.day)
+
+
+def next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+# ---------- write path ----------
+def _increment(db: Session, model, pk_cols: tuple, rows: list[dict], track_max: bool) -> None:
+    """rows: pk kolonları + total + tx_count (+ max_amount). Aynı pk iki kez gelmemeli."""
+    if not rows:
+        return
+
+    insert_ = dialect_insert(db)
+    if insert_ is None:
+        for values in rows:
+            row = db.get(model, tuple(values[c] for c in pk_cols))
+            if row is None:
+                db.add(model(**values))
+            else:
+                row.total = row.total + values["total"]
+                row.tx_count = row.tx_count + values["tx_count"]
+                if track_max:
+                    row.max_amount = max(row.max_amount, values["max_amount"])
+        db.flush()
+        return
+
+    stmt = insert_(model)
+    set_ = {
+        "total": model.total + stmt.excluded.total,
+        "tx_count": model.tx_count + stmt.excluded.tx_count,
+    }
+    if track_max:
+        set_["max_amount"] = case(
+            (stmt.excluded.max_amount > model.max_amount, stmt.excluded.max_amount),
+            else_=model.max_amount,
+        )
+    stmt = stmt.on_conflict_do_update(index_elements=list(pk_cols), set_=set_)
+    if len(rows) == 1:
+        db.execute(stmt.values(**rows[0]))
+    else:
+        db.execute(stmt, rows)
+
+
+_MONTH_PK = ("user_id", "month_start", "category_id", "type")
+_DAY_PK = ("user_id", "day", "type")
+
+
+def _expense_deltas(month_buckets, sign: int) -> dict:
+    return {
+        (m["user_id"], m["month_start"], m["category_id"]): m["total"] * sign
+        for m in month_buckets
+        if m["type"] == TxnType.expense
+    }
+
+
+def add_many(db: Session, keys) -> None:
+    """Birden çok işlemi kovalarda önceden toplayıp tek upsert (executemany) ile uygular."""
+    keys = list(keys)
+    months: dict[tuple, dict] = {}
+    days: dict[tuple, dict] = {}
+    for k in keys:
+        mk = (k.user_id, month_key(k.occurred_at), k.category_id, k.type)
+        m = months.get(mk)
+        if m is None:
+            months[mk] = dict(zip(_MONTH_PK, mk), total=k.amount, tx_count=1, max_amount=k.amount)
+        else:
+            m["total"] += k.amount
+            m["tx_count"] += 1
+            if k.amount > m["max_amount"]:
+                m["max_amount"] = k.amount
+
+        dk = (k.user_id, day_key(k.occurred_at), k.type)
+        d = days.get(dk)
+        if d is None:
+            days[dk] = dict(zip(_DAY_PK, dk), total=k.amount, tx_count=1)
+        else:
+            d["total"] += k.amount
+            d["tx_count"] += 1
+
+    _increment(db, MonthlyRollup, _MONTH_PK, list(months.values()), track_max=True)
+    _increment(db, DailyRollup, _DAY_PK, list(days.values()), track_max=False)
+    budgets.apply_expense(db, _expense_deltas(months.values(), 1))
+    anomalies.apply(db, keys, 1)
+
+
+def add(db: Session, k: TxKey) -> None:
+    add_many(db, (k,))
+
+
+def remove_many(db: Session, keys) -> None:
+    """`add_many`in tersi: kova başına tek decrement (executemany), max yeniden hesabı
+    sadece max'ı silinen tutarlardan biri olabilecek aylık kovalar için."""
+    # max yeniden hesaplanırken işlemlerin güncel hali (deleted_at / yeni alanlar) görünsün
+    db.flush()
+    months: dict[tuple, dict] = {}
+    days: dict[tuple, dict] = {}
+    for k in keys:
+        mk = (k.user_id, month_key(k.occurred_at), k.category_id, k.type)
+        m = months.setdefault(mk, dict(zip(_MONTH_PK, mk), total=Decimal(0), tx_count=0, max_amount=Decimal(0)))
+        m["total"] += k.amount
+        m["tx_count"] += 1
+        if k.amount > m["max_amount"]:
+            m["max_amount"] = k.amount
+
+        dk = (k.user_id, day_key(k.occurred_at), k.type)
+        d = days.setdefault(dk, dict(zip(_DAY_PK, dk), total=Decimal(0), tx_count=0))
+        d["total"] += k.amount
+        d["tx_count"] += 1
+    if not months:
+        return
+
+    # executemany için core tablolar (b_ önekli parametreler kolon adlarıyla çakışmasın)
+    mt, dt = MonthlyRollup.__table__, DailyRollup.__table__
+    m_pk = [mt.c[c] == bindparam(f"b_{c}") for c in _MONTH_PK]
+    d_pk = [dt.c[c] == bindparam(f"b_{c}") for c in _DAY_PK]
+    m_rows = [{f"b_{k}": v for k, v in m.items()} for m in months.values()]
+    d_rows = [{f"b_{k}": v for k, v in d.items()} for d in days.values()]
+    for r in m_rows:
+        r["b_next"] = next_month(r["b_month_start"])
+
+    db.execute(
+        update(mt).where(*m_pk).values(
+            total=mt.c.total - bindparam("b_total"),
+            tx_count=mt.c.tx_count - bindparam("b_tx_count"),
+        ),
+        m_rows,
+    )
+
+    tx = Transaction.__table__
+    new_max = (
+        select(func.coalesce(func.max(tx.c.amount), 0))
+        .where(
+            tx.c.user_id == bindparam("b_user_id"),
+            tx.c.category_id == bindparam("b_category_id"),
+            tx.c.type == bindparam("b_type"),
+            tx.c.deleted_at.is_(None),
+            tx.c.occurred_at >= bindparam("b_month_start"),
+            tx.c.occurred_at < bindparam("b_next"),
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(mt).where(*m_pk, mt.c.max_amount <= bindparam("b_max_amount")).values(max_amount=new_max),
+        m_rows,
+    )
+    # arşivlenmiş aylarda canlı tablo kovanın sadece bir kısmı: max arşivdekinin altına inmesin
+    archived = _archived_max(db, months)
+    if archived:
+        db.execute(
+            update(mt).where(*m_pk, mt.c.max_amount < bindparam("b_archived_max"))
+            .values(max_amount=bindparam("b_archived_max")),
+            [{**{f"b_{c}": v for c, v in zip(_MONTH_PK, mk)}, "b_archived_max": v} for mk, v in archived.items()],
+        )
+
+    db.execute(
+        update(dt).where(*d_pk).values(
+            total=dt.c.total - bindparam("b_total"),
+            tx_count=dt.c.tx_count - bindparam("b_tx_count"),
+        ),
+        d_rows,
+    )
+
+    for table, pk, rows in ((mt, m_pk, m_rows), (dt, d_pk, d_rows)):
+        db.execute(delete(table).where(*pk, table.c.tx_count <= 0), rows)
+
+    budgets.apply_expense(db, _expense_deltas(months.values(), -1))
+    anomalies.apply(db, keys, -1)
+
+
+def _archived_max(db: Session, months: dict[tuple, dict]) -> dict[tuple, Decimal]:
+    """Aylık kova anahtarı -> arşivdeki en büyük tutar (sadece arşivi olan kovalar)."""
+    out: dict[tuple, Decimal] = {}
+    for uid, item in iter_archived_months(db, {(uid, m) for uid, m, _, _ in months}):
+        mk = (uid, month_key(item["occurredAt"]), item["categoryId"], item["type"])
+        if mk in months and item["amount"] > out.get(mk, 0):
+            out[mk] = item["amount"]
+    return out
+
+
+def remove(db: Session, k: TxKey) -> None:
+    remove_many(db, (k,))
+
+
+def move(db: Session, old: TxKey, new: TxKey) -> None:
+    if old == new:
+        return
+    remove(db, old)
+    add(db, new)
+
+
+# ---------- rebuild ----------
+def rebuild(db: Session, user_id: Optional[int] = None, chunk_size: int = 1000) -> int:
+    """Rollup'ları (bütçe sayaçlarını, kategori istatistiklerini) ham transactions tablosundan ve arşivden
+    (transaction_archives) baştan üretir. Commit çağırana ait.
+
+    Satırlar server-side cursor ile akıtılır; bellekte sadece kovalar tutulur.
+    Üretilen aylık kova sayısını döner.
+    """
+    for model in (MonthlyRollup, DailyRollup):
+        wipe = delete(model)
+        if user_id is not None:
+            wipe = wipe.where(model.user_id == user_id)
+        db.execute(wipe)
+
+    q = (
+        select(
+            Transaction.user_id, Transaction.occurred_at, Transaction.category_id,
+            Transaction.type, Transaction.amount,
+        )
+        .where(Transaction.deleted_at.is_(None))
+    )
+    if user_id is not None:
+        q = q.where(Transaction.user_id == user_id)
+
+    buckets: dict[tuple, list] = {}
+    days: dict[tuple, list] = {}
+
+    def bucket(uid, occurred_at, category_id, typ, amount):
+        b = buckets.setdefault((uid, month_key(occurred_at), category_id, typ), [Decimal(0), 0, Decimal(0)])
+        b[0] += amount
+        b[1] += 1
+        if amount > b[2]:
+            b[2] = amount
+        d = days.setdefault((uid, day_key(occurred_at), typ), [Decimal(0), 0])
+        d[0] += amount
+        d[1] += 1
+
+    for r in db.execute(q.execution_options(yield_per=chunk_size)):
+        bucket(r.user_id, r.occurred_at, r.category_id, TxnType(r.type), r.amount)
+    for uid, item in iter_archived(db, user_id):
+        bucket(uid, item["occurredAt"], item["categoryId"], item["type"], item["amount"])
+
+    rows = [
+        {
+            "user_id": uid, "month_start": m, "category_id": cid, "type": typ,
+            "total": v[0], "tx_count": v[1], "max_amount": v[2],
+        }
+        for (uid, m, cid, typ), v in buckets.items()
+    ]
+    day_rows = [
+        {"user_id": uid, "day": d, "type": typ, "total": v[0], "tx_count": v[1]}
+        for (uid, d, typ), v in days.items()
+    ]
+    for model, data in ((MonthlyRollup, rows), (DailyRollup, day_rows)):
+        for i in range(0, len(data), chunk_size):
+            db.execute(insert(model), data[i:i + chunk_size])
+    budgets.recount(db, user_id=user_id)
+    anomalies.backfill(db, user_id=user_id, chunk_size=chunk_size)
+    return len(rows)
@@ -0,0 +1,121 @@
+# app/services/search.py
+"""
+Transaction title/note için indeksli tam metin arama.
+
+- PostgreSQL: `to_tsvector('simple', title || ' ' || note)` üzerinde GIN expression index
+  (+ alt dizgi aramaları için pg_trgm GIN). İndeks ifadesi satırdan türediği için
+  yazmalarda ayrıca senkron gerekmez.
+- SQLite: FTS5 external-content tablo (transactions_fts) + INSERT/UPDATE/DELETE trigger'ları.
+  FTS5 sadece kelime başından eşleşir; alt dizgiler ("ffee" -> "Coffee") için LIKE ile
+  birleştirilir (indekssiz, ama kullanıcının/dönemin satırlarıyla sınırlı).
+- Diğer / FTS5 olmayan kurulumlar: eski ILIKE davranışı.
+
+Her kelime ön ek olarak aranır ("mark" -> "market"), kelimeler AND ile bağlanır; terimin
+tamamını alt dizgi olarak içeren satırlar da eşleşir (eski ILIKE davranışı). Alaka
+sıralamasında tam metin eşleşmeleri önce gelir.
+"""
+from __future__ import annotations
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, Integer, func, literal, literal_column, or_, text
+from sqlalchemy.orm import Query, Session
+
+from app.models.transaction import Transaction
+
+MAX_TOKENS = 8
+
+# migration'daki index ifadesiyle birebir aynı olmalı (planner ifadeyi eşleştirir)
+PG_DOCUMENT = literal_column(
+    "to_tsvector('simple'::regconfig, coalesce(transactions.title, '') || ' ' || coalesce(transactions.note, ''))"
+)
+PG_CONFIG = literal_column("'simple'::regconfig")
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        title, note, content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, title, note) VALUES (new.id, new.title, new.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, title, note) VALUES ('delete', old.id, old.title, old.note);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF title, note ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, title, note) VALUES ('delete', old.id, old.title, old.note);
+        INSERT INTO transactions_fts(rowid, title, note) VALUES (new.id, new.title, new.note);
+    END""",
+]
+
+_sqlite_fts: Optional[bool] = None   # process başına bir kez tespit edilir
+
+
+def install_sqlite(conn) -> bool:
+    """SQLite'ta FTS5 tablo + trigger'ları kurar (idempotent). FTS5 yoksa False."""
+    global _sqlite_fts
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='transactions_fts'"
+    ).first()
+    try:
+        for ddl in SQLITE_DDL:
+            conn.exec_driver_sql(ddl)
+    except Exception:
+        _sqlite_fts = False
+        return False
+    if not exists:
+        conn.exec_driver_sql("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+    _sqlite_fts = True
+    return True
+
+
+def _sqlite_fts_available(db: Session) -> bool:
+    global _sqlite_fts
+    if _sqlite_fts is None:
+        _sqlite_fts = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='transactions_fts'")
+        ).first() is not None
+    return _sqlite_fts
+
+
+def tokens(term: str) -> list[str]:
+    return re.findall(r"\w+", term.lower())[:MAX_TOKENS]
+
+
+def apply(db: Session, qs: Query, term: str) -> Tuple[Query, Optional[object]]:
+    """`qs`'e arama filtresini ekler. (query, alaka sıralaması | None) döner;
+    sıralama ifadesi doğrudan order_by'a verilir (en alakalı önce)."""
+    toks = tokens(term)
+    dialect = db.get_bind().dialect.name
+
+    if toks and dialect == "postgresql":
+        tsq = func.to_tsquery(PG_CONFIG, literal(" & ".join(f"{t}:*" for t in toks)))
+        like = f"%{term.lower()}%"
+        qs = qs.filter(or_(
+            PG_DOCUMENT.op("@@")(tsq),
+            Transaction.title.ilike(like),     # alt dizgi (pg_trgm GIN)
+            Transaction.note.ilike(like),
+        ))
+        return qs, func.ts_rank(PG_DOCUMENT, tsq).desc()
+
+    if toks and dialect == "sqlite" and _sqlite_fts_available(db):
+        match = " ".join(f'"{t}"*' for t in toks)
+        fts = (
+            text(
+                "SELECT rowid AS id, bm25(transactions_fts) AS rank "
+                "FROM transactions_fts WHERE transactions_fts MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(id=Integer, rank=Float)
+            .subquery("fts")
+        )
+        like = f"%{term.lower()}%"
+        qs = qs.outerjoin(fts, fts.c.id == Transaction.id).filter(or_(
+            fts.c.id.is_not(None),
+            Transaction.title.ilike(like),     # alt dizgi
+            Transaction.note.ilike(like),
+        ))
+        return qs, fts.c.rank.asc().nulls_last()   # bm25: küçük = daha alakalı; sadece LIKE en sonda
+
+    like = f"%{term.lower()}%"
+    return qs.filter(or_(Transaction.title.ilike(like), Transaction.note.ilike(like))), None
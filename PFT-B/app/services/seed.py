@@ -0,0 +1,196 @@
+# app/services/seed.py
+"""
+Benchmark / yük testi için sentetik veri üretimi.
+
+Her kullanıcıya gerçekçi dağılımlarla kategori, işlem ve bütçe üretir:
+- sabit aylık ödemeler (kira, faturalar, abonelik) ve maaş -> recurring örüntüler
+- günlük harcamalar kategori ağırlıklarına göre, tutarlar log-normal
+- her ay birkaç kategori + genel bütçe
+Satırlar `batch_size`'lık executemany INSERT'lerle yazılır, rollup'lar kullanıcı başına
+`rollups.rebuild` ile üretilir. Aynı `seed` ile aynı veri üretilir.
+"""
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.transaction import Transaction, TxnType
+from app.models.user import User
+from app.services import rollups
+
+DEFAULT_PASSWORD = "benchpass123"
+
+
+@dataclass(frozen=True)
+class _CatSpec:
+    name: str
+    icon: str
+    color: str
+    is_expense: bool
+    weight: float            # serbest (recurring olmayan) işlemler içindeki payı
+    median: float            # log-normal medyan tutar (TRY)
+    sigma: float
+    titles: tuple[str, ...]
+
+
+CATEGORIES = (
+    _CatSpec("Market", "🛒", "#2E7D32", True, 0.32, 320, 0.7, ("Migros", "A101", "BİM", "CarrefourSA", "Şok Market")),
+    _CatSpec("Restoran", "🍽️", "#EF6C00", True, 0.16, 260, 0.6, ("Yemeksepeti", "Getir Yemek", "Kahve Dünyası", "Starbucks", "Köfteci")),
+    _CatSpec("Ulaşım", "🚌", "#1565C0", True, 0.18, 55, 0.8, ("İstanbulkart", "BiTaksi", "Shell", "Opet", "Otopark")),
+    _CatSpec("Eğlence", "🎬", "#6A1B9A", True, 0.07, 300, 0.7, ("Sinema", "Konser bileti", "Steam", "Bowling")),
+    _CatSpec("Giyim", "👕", "#AD1457", True, 0.06, 750, 0.6, ("LC Waikiki", "Zara", "Koton", "Decathlon")),
+    _CatSpec("Sağlık", "💊", "#00838F", True, 0.05, 400, 0.9, ("Eczane", "Diş hekimi", "Muayene")),
+    _CatSpec("Diğer", "📦", "#616161", True, 0.16, 200, 1.0, ("Trendyol", "Hepsiburada", "Amazon", "Kırtasiye", "Hediye")),
+    _CatSpec("Kira", "🏠", "#4E342E", True, 0.0, 0, 0, ("Kira",)),
+    _CatSpec("Faturalar", "💡", "#F9A825", True, 0.0, 0, 0, ("Elektrik", "Doğalgaz", "Su", "İnternet")),
+    _CatSpec("Abonelik", "📺", "#C62828", True, 0.0, 0, 0, ("Netflix", "Spotify", "iCloud")),
+    _CatSpec("Maaş", "💼", "#1B5E20", False, 0.0, 0, 0, ("Maaş",)),
+    _CatSpec("Ek Gelir", "💰", "#558B2F", False, 0.0, 900, 0.8, ("Freelance", "İade", "Satış")),
+)
+
+# (kategori, başlık, ayın günü, tutar çarpanı -> kullanıcı ölçeğiyle çarpılır)
+RECURRING = (
+    ("Kira", "Kira", 1, 15000),
+    ("Faturalar", "Elektrik", 6, 650),
+    ("Faturalar", "Doğalgaz", 8, 900),
+    ("Faturalar", "İnternet", 10, 450),
+    ("Abonelik", "Netflix", 12, 149.99),
+    ("Abonelik", "Spotify", 18, 59.99),
+    ("Maaş", "Maaş", 15, 48000),
+)
+
+
+class SeedStats:
+    def __init__(self):
+        self.users = 0
+        self.transactions = 0
+        self.budgets = 0
+
+
+def _months_back(today: date, months: int) -> date:
+    y, m = today.year, today.month - (months - 1)
+    while m <= 0:
+        m += 12
+        y -= 1
+    return date(y, m, 1)
+
+
+def _dt(d: date, rnd: random.Random) -> datetime:
+    return datetime(d.year, d.month, d.day, rnd.randint(7, 22), rnd.randint(0, 59), tzinfo=timezone.utc)
+
+
+def _money(x: float) -> Decimal:
+    return Decimal(f"{max(x, 1.0):.2f}")
+
+
+def _user_rows(rnd: random.Random, user_id: int, cats: dict[str, int], first: date, last: date,
+               n_tx: int) -> Iterator[dict]:
+    scale = rnd.uniform(0.6, 1.8)       # kullanıcının gelir/harcama seviyesi
+    specs = {c.name: c for c in CATEGORIES}
+
+    def row(cat_name: str, title: str, amount: Decimal, when: datetime, note: Optional[str] = None) -> dict:
+        spec = specs[cat_name]
+        return {
+            "user_id": user_id,
+            "category_id": cats[cat_name],
+            "type": TxnType.expense if spec.is_expense else TxnType.income,
+            "title": title,
+            "amount": amount,
+            "occurred_at": when,
+            "note": note,
+        }
+
+    emitted = 0
+    m = first
+    while m <= last:
+        for cat_name, title, day, base in RECURRING:
+            d = date(m.year, m.month, min(day, 28))
+            if first <= d <= last:
+                amount = base * scale * (rnd.uniform(0.85, 1.25) if cat_name == "Faturalar" else 1)
+                yield row(cat_name, title, _money(amount), _dt(d, rnd))
+                emitted += 1
+        m = rollups.next_month(m)
+
+    free = [c for c in CATEGORIES if c.weight > 0]
+    weights = [c.weight for c in free]
+    span = (last - first).days
+    extra_income = next(c for c in CATEGORIES if c.name == "Ek Gelir")
+    for _ in range(max(n_tx - emitted, 0)):
+        d = first + timedelta(days=rnd.randint(0, span))
+        if rnd.random() < 0.02:
+            spec = extra_income
+        else:
+            spec = rnd.choices(free, weights)[0]
+        amount = rnd.lognormvariate(0, spec.sigma) * spec.median * scale
+        note = "taksit" if amount > 2000 and rnd.random() < 0.3 else None
+        yield row(spec.name, rnd.choice(spec.titles), _money(amount), _dt(d, rnd), note)
+
+
+def seed(
+    db: Session,
+    *,
+    users: int,
+    tx_per_user: int,
+    months: int = 24,
+    email_prefix: str = "bench",
+    seed: int = 42,
+    batch_size: int = 5000,
+    progress=None,
+) -> SeedStats:
+    """`users` kullanıcı, kullanıcı başına ~`tx_per_user` işlem (son `months` ay). Her kullanıcı
+    kendi transaction'ında commit edilir. E-posta: {email_prefix}{i}@example.com"""
+    stats = SeedStats()
+    today = datetime.now(timezone.utc).date() - timedelta(days=1)
+    first = _months_back(today, months)
+    password_hash = get_password_hash(DEFAULT_PASSWORD)     # bcrypt bir kez
+
+    for i in range(1, users + 1):
+        rnd = random.Random(f"{seed}:{i}")
+        user = User(name=f"Bench User {i}", email=f"{email_prefix}{i}@example.com", password_hash=password_hash)
+        db.add(user)
+        db.flush()
+
+        cat_rows = [
+            {"user_id": user.id, "name": c.name, "icon": c.icon, "color_hex": c.color, "is_expense": c.is_expense}
+            for c in CATEGORIES
+        ]
+        db.execute(insert(Category), cat_rows)
+        cats = dict(db.query(Category.name, Category.id).filter(Category.user_id == user.id).all())
+
+        batch: list[dict] = []
+        for r in _user_rows(rnd, user.id, cats, first, today, tx_per_user):
+            batch.append(r)
+            if len(batch) >= batch_size:
+                db.execute(insert(Transaction), batch)
+                stats.transactions += len(batch)
+                batch = []
+        if batch:
+            db.execute(insert(Transaction), batch)
+            stats.transactions += len(batch)
+
+        budget_rows = []
+        m = first
+        while m <= today:
+            budget_rows.append({"user_id": user.id, "category_id": None, "month_start": m,
+                                "limit_amount": _money(rnd.uniform(25000, 45000)), "notify": True})
+            for name in ("Market", "Restoran", "Eğlence"):
+                budget_rows.append({"user_id": user.id, "category_id": cats[name], "month_start": m,
+                                    "limit_amount": _money(rnd.uniform(1500, 6000)), "notify": True})
+            m = rollups.next_month(m)
+        db.execute(insert(Budget), budget_rows)
+        stats.budgets += len(budget_rows)
+
+        rollups.rebuild(db, user_id=user.id)
+        db.commit()
+        stats.users += 1
+        if progress is not None:
+            progress(stats)
+    return stats
@@ -0,0 +1,100 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+# ayarlar import anında okunur: app'ten önce
+_DB_DIR = tempfile.mkdtemp(prefix="pft-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["REQUEST_LOG"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.db import session as db_session
+    from app.db.init_db import create_schema
+
+    eng = db_session.get_engine()
+    create_schema(eng)
+    return eng
+
+
+@pytest.fixture(scope="session")
+def seeded(engine):
+    from app.db.session import SessionLocal
+    from app.services import seed
+
+    db = SessionLocal()
+    try:
+        seed.seed(db, users=1, tx_per_user=400, months=6)
+    finally:
+        db.close()
+    return "bench1@example.com"
+
+
+@pytest.fixture(scope="session")
+def client(seeded):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, seeded):
+    from app.core.config import settings
+    from app.services.seed import DEFAULT_PASSWORD
+
+    r = client.post(f"{settings.API_PREFIX}/auth/login", json={"email": seeded, "password": DEFAULT_PASSWORD})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def user_id(engine, seeded):
+    from sqlalchemy import select
+    from app.db.session import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        return db.scalar(select(User.id).where(User.email == seeded))
+    finally:
+        db.close()
+
+
+def _rollup_rows(db, user_id: int) -> dict:
+    from sqlalchemy import select
+    from app.models.rollup import DailyRollup, MonthlyRollup
+
+    out = {}
+    for model in (MonthlyRollup, DailyRollup):
+        t = model.__table__
+        out[t.name] = sorted(tuple(r) for r in db.execute(select(t).where(t.c.user_id == user_id)))
+    return out
+
+
+@pytest.fixture
+def assert_rollups_rebuilt(engine):
+    """Yazma yolunun artımlı güncellediği rollup'lar `rollups.rebuild` çıktısıyla aynı olmalı."""
+    from app.db.session import SessionLocal
+    from app.services import rollups
+
+    def check(user_id: int) -> None:
+        db = SessionLocal()
+        try:
+            live = _rollup_rows(db, user_id)
+            rollups.rebuild(db, user_id=user_id)
+            db.flush()
+            assert _rollup_rows(db, user_id) == live
+        finally:
+            db.rollback()               # rebuild sadece karşılaştırma için
+            db.close()
+
+    return check
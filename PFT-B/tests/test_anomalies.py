@@ -0,0 +1,130 @@
+# tests/test_anomalies.py
+"""category_amount_stats: artımlı merge / unmerge baştan hesapla (backfill) aynı olmalı;
+örnek sayısı ANOMALY_MIN_SAMPLES altındaki kategoride işaretleme yapılmaz."""
+import math
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.category_stats import CategoryAmountStats
+from app.services import anomalies
+
+P = settings.API_PREFIX
+MOMENTS = ("n", "mean", "m2", "log_mean", "log_m2")
+
+
+def _day(n: int) -> str:
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def _category(client, headers, name) -> int:
+    r = client.post(f"{P}/categories", headers=headers,
+                    json={"name": name, "type": "expense", "color": "#123456", "emoji": "x"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _create(client, headers, cid, amount, day=5) -> int:
+    r = client.post(f"{P}/transactions", headers=headers,
+                    json={"title": "anomaly", "amount": amount, "categoryId": cid, "date": _day(day)})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _stats(db, user_id) -> dict:
+    st = CategoryAmountStats.__table__
+    return {
+        r.category_id: tuple(getattr(r, c) for c in MOMENTS)
+        for r in db.execute(select(st).where(st.c.user_id == user_id))
+    }
+
+
+def _assert_matches_backfill(user_id) -> dict:
+    db = SessionLocal()
+    try:
+        live = _stats(db, user_id)
+        anomalies.backfill(db, user_id=user_id)
+        db.flush()
+        rebuilt = _stats(db, user_id)
+    finally:
+        db.rollback()
+        db.close()
+    assert live.keys() == rebuilt.keys()
+    for cid, moments in rebuilt.items():
+        assert live[cid][0] == moments[0], cid
+        assert live[cid][1:] == pytest.approx(moments[1:], rel=1e-9, abs=1e-6), cid
+    return live
+
+
+def test_merge_then_unmerge_round_trips_to_recompute(client, auth_headers, user_id):
+    cid = _category(client, auth_headers, "anomaly-roundtrip")
+    ids = [_create(client, auth_headers, cid, a) for a in (12.5, 40, 7.25)]
+    r = client.post(f"{P}/transactions/batch", headers=auth_headers, json={"ops": [
+        {"op": "create", "data": {"title": "b", "amount": a, "categoryId": cid, "date": _day(3)}}
+        for a in (300, 19.99, 55)
+    ]})
+    assert r.status_code == 200 and r.json()["failed"] == 0, r.text
+    batch_ids = [x["id"] for x in r.json()["results"]]
+    assert _assert_matches_backfill(user_id)[cid][0] == 6
+
+    # düzenleme = unmerge + merge; gider -> gelir sadece unmerge
+    client.patch(f"{P}/transactions/{ids[0]}", headers=auth_headers, json={"amount": 1000})
+    income = next(c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json() if c["type"] == "income")
+    client.patch(f"{P}/transactions/{ids[1]}", headers=auth_headers, json={"categoryId": income})
+    assert _assert_matches_backfill(user_id)[cid][0] == 5
+
+    # çoklu silme (parti unmerge) n = 1'e: m2 sıfır
+    r = client.post(f"{P}/transactions/batch", headers=auth_headers,
+                    json={"ops": [{"op": "delete", "id": i} for i in batch_ids + [ids[0]]]})
+    assert r.status_code == 200 and r.json()["failed"] == 0, r.text
+    n, mean, m2, log_mean, log_m2 = _assert_matches_backfill(user_id)[cid]
+    assert (n, m2, log_m2) == (1, 0, 0)
+    assert (mean, log_mean) == pytest.approx((7.25, math.log(7.25)))
+
+    # son satır: istatistik satırı silinir
+    assert client.delete(f"{P}/transactions/{ids[2]}", headers=auth_headers).status_code == 204
+    assert cid not in _assert_matches_backfill(user_id)
+
+
+def _flagged(user_id, cid) -> list[dict]:
+    db = SessionLocal()
+    try:
+        found = anomalies.for_period(db, user_id, date.today() - timedelta(days=40), date.today())
+    finally:
+        db.close()
+    return [a for a in found if a["categoryId"] == cid]
+
+
+def test_min_samples_guard(client, auth_headers, user_id, monkeypatch):
+    cid = _category(client, auth_headers, "anomaly-guard")
+    typical = [20, 22, 18, 25, 21, 19, 23, 20, 24]
+    for i, a in enumerate(typical):
+        _create(client, auth_headers, cid, a, day=10 + i)
+    outlier = _create(client, auth_headers, cid, 900, day=2)
+    assert len(typical) + 1 == settings.ANOMALY_MIN_SAMPLES
+
+    monkeypatch.setattr(settings, "ANOMALY_MIN_SAMPLES", settings.ANOMALY_MIN_SAMPLES + 1)
+    assert _flagged(user_id, cid) == []                    # n < MIN_SAMPLES: aday yok
+
+    monkeypatch.setattr(settings, "ANOMALY_MIN_SAMPLES", len(typical) + 1)
+    found = _flagged(user_id, cid)
+    assert [a["transactionId"] for a in found] == [outlier]
+    # p95: ln(tutar) üzerindeki log-normal uyumundan (örneklem std, tüm n)
+    logs = [math.log(a) for a in typical + [900]]
+    mu = sum(logs) / len(logs)
+    sd = math.sqrt(sum((x - mu) ** 2 for x in logs) / (len(logs) - 1))
+    assert found[0]["p95Amount"] == pytest.approx(math.exp(mu + anomalies.P95_Z * sd), abs=0.01)
+    assert found[0]["typicalAmount"] == pytest.approx(math.exp(mu), abs=0.01)
+
+
+def test_tiny_samples_never_divide_by_zero(client, auth_headers, user_id, monkeypatch):
+    # ayar 0 olsa da n < 3 okunmaz (leave-one-out n - 2'ye böler)
+    monkeypatch.setattr(settings, "ANOMALY_MIN_SAMPLES", 0)
+    cid = _category(client, auth_headers, "anomaly-tiny")
+    _create(client, auth_headers, cid, 10)
+    assert _flagged(user_id, cid) == []
+    _create(client, auth_headers, cid, 5000)
+    assert _flagged(user_id, cid) == []
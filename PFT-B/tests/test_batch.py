@@ -0,0 +1,123 @@
+# tests/test_batch.py
+"""POST /transactions/batch: öğe bazında hata, geçerli öğeler tek transaction'da uygulanır."""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.transaction import Transaction
+
+P = settings.API_PREFIX
+
+
+def _day(n: int) -> str:
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def _batch(client, headers, ops) -> dict:
+    r = client.post(f"{P}/transactions/batch", headers=headers, json={"ops": ops})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _statuses(body) -> list[tuple[int, str | None]]:
+    return [(x["status"], x["error"]) for x in body["results"]]
+
+
+@pytest.fixture(scope="module")
+def cats(client, auth_headers) -> dict[str, int]:
+    return {c["name"]: c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json()}
+
+
+@pytest.fixture
+def tx_ids(client, auth_headers, cats):
+    ops = [{"op": "create", "data": {"title": f"batch {i}", "amount": 10 + i,
+                                     "categoryId": cats["Market"], "date": _day(i + 1)}} for i in range(4)]
+    body = _batch(client, auth_headers, ops)
+    assert body["failed"] == 0
+    return [x["id"] for x in body["results"]]
+
+
+def test_duplicate_ids_fail_after_first(client, auth_headers, tx_ids, user_id, assert_rollups_rebuilt):
+    a, b = tx_ids[:2]
+    body = _batch(client, auth_headers, [
+        {"op": "update", "id": a, "data": {"amount": 99}},
+        {"op": "delete", "id": a},
+        {"op": "delete", "id": b},
+        {"op": "update", "id": b, "data": {"title": "again"}},
+    ])
+    dup = "Transaction appears more than once in batch"
+    assert _statuses(body) == [(200, None), (409, dup), (204, None), (409, dup)]
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    # ilk öğe uygulandı, tekrarı değil
+    rows = client.get(f"{P}/transactions", headers=auth_headers, params={"limit": 200}).json()
+    by_id = {t["id"]: t for t in rows}
+    assert by_id[a]["amount"] == 99 and b not in by_id
+    assert_rollups_rebuilt(user_id)
+
+
+def test_not_found_ids(client, auth_headers, tx_ids, user_id, assert_rollups_rebuilt):
+    gone = tx_ids[0]
+    assert client.delete(f"{P}/transactions/{gone}", headers=auth_headers).status_code == 204
+    body = _batch(client, auth_headers, [
+        {"op": "update", "id": 10**9, "data": {"amount": 1}},
+        {"op": "delete", "id": gone},                       # zaten silinmiş
+        {"op": "update", "id": gone, "data": {"amount": 1}},
+        {"op": "delete", "id": tx_ids[1]},
+    ])
+    nf = "Transaction not found"
+    assert _statuses(body) == [(404, nf), (404, nf), (404, nf), (204, None)]
+    assert [x["id"] for x in body["results"]] == [10**9, gone, gone, tx_ids[1]]
+    assert_rollups_rebuilt(user_id)
+
+
+def test_bad_category(client, auth_headers, cats, tx_ids, user_id, assert_rollups_rebuilt):
+    r = client.post(f"{P}/categories", headers=auth_headers,
+                    json={"name": "batch-archived", "type": "expense", "color": "#123456", "emoji": "x"})
+    assert r.status_code == 201, r.text
+    archived = r.json()["id"]
+    r = client.patch(f"{P}/categories/{archived}", headers=auth_headers, json={"isArchived": True})
+    assert r.status_code == 200, r.text
+
+    body = _batch(client, auth_headers, [
+        {"op": "create", "data": {"title": "x", "amount": 1, "categoryId": 10**9, "date": _day(1)}},
+        {"op": "create", "data": {"title": "x", "amount": 1, "categoryId": archived, "date": _day(1)}},
+        {"op": "update", "id": tx_ids[0], "data": {"categoryId": archived}},
+        {"op": "update", "id": tx_ids[1], "data": {"categoryId": cats["Restoran"]}},
+        {"op": "create", "data": {"title": "ok", "amount": 1, "categoryId": cats["Giyim"], "date": _day(1)}},
+    ])
+    cnf = "Category not found"
+    assert _statuses(body) == [(404, cnf), (404, cnf), (404, cnf), (200, None), (201, None)]
+    assert body["results"][3]["item"]["categoryId"] == cats["Restoran"]
+    assert_rollups_rebuilt(user_id)
+
+
+def test_deletes_are_soft_and_set_based(client, auth_headers, engine, tx_ids, user_id, assert_rollups_rebuilt):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        body = _batch(client, auth_headers, [{"op": "delete", "id": i} for i in tx_ids])
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert [x["status"] for x in body["results"]] == [204] * len(tx_ids)
+
+    # tek UPDATE ... WHERE id IN (...), DELETE yok
+    soft = [s for s in statements if s.lstrip().upper().startswith("UPDATE TRANSACTIONS") and "deleted_at" in s]
+    assert len(soft) == 1 and " IN " in soft[0].upper()
+    assert not any(s.lstrip().upper().startswith("DELETE FROM TRANSACTIONS") for s in statements)
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(select(Transaction.id, Transaction.deleted_at).where(Transaction.id.in_(tx_ids))).all()
+    finally:
+        db.close()
+    assert len(rows) == len(tx_ids) and all(r.deleted_at is not None for r in rows)
+    listed = {t["id"] for t in client.get(f"{P}/transactions", headers=auth_headers, params={"limit": 200}).json()}
+    assert listed.isdisjoint(tx_ids)
+    assert_rollups_rebuilt(user_id)
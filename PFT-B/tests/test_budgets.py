@@ -0,0 +1,131 @@
+# tests/test_budgets.py
+"""Bütçe sayaçları (spent_amount) ve eşik bildirimleri: yazma yolu, sync ve genel bütçe."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.notification import Notification
+
+P = settings.API_PREFIX
+
+
+def _month(years_back: int) -> date:
+    # seed son 6 ayı doldurur; her test kendi boş ayında çalışır
+    return date(date.today().year - years_back, 3, 1)
+
+
+@pytest.fixture(scope="module")
+def cats(client, auth_headers) -> dict[str, int]:
+    return {c["name"]: c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json()}
+
+
+def _budget(client, headers, month: date, limit, category_id=None) -> dict:
+    r = client.post(f"{P}/budgets", headers=headers,
+                    json={"categoryId": category_id, "month": f"{month:%Y-%m}", "limit": limit})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _tx(client, headers, month: date, category_id: int, amount, day=10) -> int:
+    r = client.post(f"{P}/transactions", headers=headers, json={
+        "title": "budget", "amount": amount, "categoryId": category_id,
+        "date": month.replace(day=day).isoformat(),
+    })
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _spent(client, headers, budget_id: int) -> float:
+    r = client.get(f"{P}/budgets/{budget_id}", headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()["spent"]
+
+
+def _alerts(budget_id: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(
+            select(Notification.threshold).where(Notification.budget_id == budget_id).order_by(Notification.id)
+        ))
+    finally:
+        db.close()
+
+
+def test_thresholds_alert_once_per_upward_crossing(client, auth_headers, cats, user_id, assert_rollups_rebuilt):
+    m = _month(3)
+    b = _budget(client, auth_headers, m, 100, cats["Market"])["id"]
+
+    _tx(client, auth_headers, m, cats["Market"], 50)
+    _tx(client, auth_headers, m, cats["Restoran"], 500)        # başka kategori: sayılmaz
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (50, [])
+
+    _tx(client, auth_headers, m, cats["Market"], 35)           # %85
+    assert _alerts(b) == [80]
+    _tx(client, auth_headers, m, cats["Market"], 5)            # %90: aynı eşik, yeni bildirim yok
+    assert _alerts(b) == [80]
+
+    last = _tx(client, auth_headers, m, cats["Market"], 15)    # %105
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (105, [80, 100])
+
+    # eşiğin altına inmek sessiz; tekrar geçilince yeniden uyarılır
+    assert client.delete(f"{P}/transactions/{last}", headers=auth_headers).status_code == 204
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (90, [80, 100])
+    _tx(client, auth_headers, m, cats["Market"], 20)
+    assert _alerts(b) == [80, 100, 100]
+    assert_rollups_rebuilt(user_id)
+
+
+def test_crossing_both_thresholds_in_one_write_alerts_once(client, auth_headers, cats):
+    m = _month(4)
+    b = _budget(client, auth_headers, m, 100, cats["Giyim"])["id"]
+    ops = [{"op": "create", "data": {"title": f"b{i}", "amount": 40, "categoryId": cats["Giyim"],
+                                     "date": m.replace(day=5 + i).isoformat()}} for i in range(3)]
+    r = client.post(f"{P}/transactions/batch", headers=auth_headers, json={"ops": ops})
+    assert r.status_code == 200 and r.json()["failed"] == 0, r.text
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (120, [100])
+
+
+def test_budget_update_resyncs_counter(client, auth_headers, cats):
+    m = _month(5)
+    _tx(client, auth_headers, m, cats["Market"], 90)
+    _tx(client, auth_headers, m.replace(month=4), cats["Eğlence"], 30)
+    b = _budget(client, auth_headers, m, 1000, cats["Market"])["id"]
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (90, [])
+
+    def patch(**body):
+        r = client.patch(f"{P}/budgets/{b}", headers=auth_headers, json=body)
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    assert patch(limit=100)["spent"] == 90                      # limit düştü: %90
+    assert _alerts(b) == [80]
+    assert patch(categoryId=cats["Eğlence"])["spent"] == 0      # yeni kapsam, bu ayda harcama yok
+    assert patch(month=f"{m.replace(month=4):%Y-%m}", limit=25)["spent"] == 30
+    assert _alerts(b) == [80, 100]
+    assert patch(notify=False)["spent"] == 30                   # sayacı etkilemez
+
+
+def test_general_budget_counts_all_expenses(client, auth_headers, cats, user_id, assert_rollups_rebuilt):
+    # categoryId = NULL: ayın tüm giderleri (gelirler hariç)
+    m = _month(6)
+    b = _budget(client, auth_headers, m, 200)["id"]
+    _tx(client, auth_headers, m, cats["Market"], 60)
+    _tx(client, auth_headers, m, cats["Kira"], 70)
+    _tx(client, auth_headers, m, cats["Maaş"], 5000)
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (130, [])
+
+    tx = _tx(client, auth_headers, m, cats["Sağlık"], 40)          # %85
+    assert (_spent(client, auth_headers, b), _alerts(b)) == (170, [80])
+    r = client.patch(f"{P}/transactions/{tx}", headers=auth_headers, json={"categoryId": cats["Ek Gelir"]})
+    assert r.status_code == 200, r.text
+    assert _spent(client, auth_headers, b) == 130
+
+    # harcaması olan aya sonradan açılan genel bütçe de sync ile hepsini sayar
+    later = m.replace(month=5)
+    _tx(client, auth_headers, later, cats["Market"], 15)
+    _tx(client, auth_headers, later, cats["Faturalar"], 25)
+    assert _spent(client, auth_headers, _budget(client, auth_headers, later, 1000)["id"]) == 40
+    assert_rollups_rebuilt(user_id)
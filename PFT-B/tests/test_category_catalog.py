@@ -0,0 +1,90 @@
+# tests/test_category_catalog.py
+"""Yazma yolu kategori doğrulaması cache'ten yapılır; cache bayat olsa da (başka worker'da
+silinmiş kategori) FK reddi 500 (IntegrityError) değil 404/400 dönmeli."""
+from datetime import date
+
+from sqlalchemy import delete, event
+
+from app.core.catalog import category_catalog
+from app.core.config import settings
+from app.models.category import Category
+from app.db.session import SessionLocal
+
+P = settings.API_PREFIX
+
+
+def _stale_category(client, auth_headers, name):
+    """(user_id, kategori id): cache'e girmiş, sonra invalidation olmadan DB'den silinmiş."""
+    r = client.post(f"{P}/categories", headers=auth_headers,
+                    json={"name": name, "type": "expense", "color": "#123456", "emoji": "x"})
+    assert r.status_code in (200, 201), r.text
+    cid = r.json()["id"]
+
+    db = SessionLocal()
+    try:
+        user_id = db.get(Category, cid).user_id
+        assert cid in category_catalog.for_user(db, user_id)
+        db.execute(delete(Category).where(Category.id == cid))   # başka worker: cache'e haber yok
+        db.commit()
+        assert cid in category_catalog.for_user(db, user_id)
+    finally:
+        db.close()
+    return user_id, cid
+
+
+def test_write_paths_reject_category_deleted_elsewhere(client, auth_headers):
+    today = date.today().isoformat()
+    _, cid = _stale_category(client, auth_headers, "stale-1")
+
+    r = client.post(f"{P}/transactions", headers=auth_headers,
+                    json={"title": "t", "amount": 10, "categoryId": cid, "date": today})
+    assert r.status_code == 404, r.text
+
+    r = client.post(f"{P}/budgets", headers=auth_headers,
+                    json={"categoryId": cid, "month": today[:7], "limit": 100})
+    assert r.status_code == 400, r.text
+
+    tx = client.get(f"{P}/transactions", headers=auth_headers).json()
+    tx = tx[0] if isinstance(tx, list) else tx["items"][0]
+    r = client.patch(f"{P}/transactions/{tx['id']}", headers=auth_headers, json={"categoryId": cid})
+    assert r.status_code == 404, r.text
+
+
+def test_batch_retries_without_category_deleted_elsewhere(client, auth_headers):
+    today = date.today().isoformat()
+    _, cid = _stale_category(client, auth_headers, "stale-batch")
+    ok = next(c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json() if c["type"] == "expense")
+    r = client.post(f"{P}/transactions/batch", headers=auth_headers, json={"ops": [
+        {"op": "create", "data": {"title": "a", "amount": 1, "categoryId": ok, "date": today}},
+        {"op": "create", "data": {"title": "b", "amount": 1, "categoryId": cid, "date": today}},
+    ]})
+    assert r.status_code == 200, r.text
+    assert [(x["status"], x["error"]) for x in r.json()["results"]] == [(201, None), (404, "Category not found")]
+
+
+def test_cached_category_is_validated_without_a_query(client, auth_headers, engine):
+    cid = next(c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json() if c["type"] == "expense")
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        r = client.post(f"{P}/transactions", headers=auth_headers,
+                        json={"title": "t", "amount": 10, "categoryId": cid, "date": date.today().isoformat()})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert r.status_code == 201, r.text
+    assert not [s for s in statements if "FROM categories" in s]
+
+
+def test_stale_cache_is_dropped_on_write(client, auth_headers):
+    user_id, cid = _stale_category(client, auth_headers, "stale-2")
+    client.post(f"{P}/transactions", headers=auth_headers,
+                json={"title": "t", "amount": 10, "categoryId": cid, "date": date.today().isoformat()})
+    db = SessionLocal()
+    try:
+        assert cid not in category_catalog.for_user(db, user_id)
+    finally:
+        db.close()
@@ -0,0 +1,8 @@
+# tests/test_db_session.py
+from app.db.session import InstrumentedQueuePool
+
+
+def test_pool_logs_outside_app_namespace(engine):
+    # app.* handler'ı INFO'da; havuz logları sqlalchemy.* altında kalmalı
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.logger.name == "sqlalchemy.pool.impl.QueuePool"
@@ -0,0 +1,61 @@
+# tests/test_explain.py
+"""
+Endpoint sorgularının planları (app/explain.py senaryoları): uygulama tablolarında sequential
+scan olmamalı. Index silinir ya da sorgu şekli index'i kullanamayacak hale gelirse burada düşer.
+"""
+import pytest
+
+from app import explain
+
+
+@pytest.fixture(scope="module")
+def plans(client, seeded, engine):
+    return explain.plans(client, seeded, months=6)
+
+
+def test_scenarios_were_captured(plans):
+    # aynı sorgu bir kez EXPLAIN edilir; cache'ten dönen (kategori kataloğu) senaryo sorgu atmaz
+    names = {name for name, *_ in plans}
+    assert {"transactions.list", "transactions.search", "dashboard.summary", "reports.month",
+            "reports.multi_year", "transactions.export", "budgets.list"} <= names
+
+
+def test_no_sequential_scans(plans):
+    failures = [
+        f"{name}: {', '.join(sorted(set(scans)))}\n    {' '.join(statement.split())[:300]}\n    {plan}"
+        for name, statement, scans, plan in plans if scans
+    ]
+    assert not failures, "\n".join(failures)
+    for *_, plan in plans:
+        assert "SCAN transactions\n" not in plan + "\n"
+        assert "Seq Scan" not in plan
+
+
+def _index_names(plan: dict) -> set[str]:
+    out, stack = set(), [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            out.add(node["Index Name"])
+        stack.extend(node.get("Plans", ()))
+    return out
+
+
+def test_list_uses_partial_live_index(plans, engine):
+    if engine.dialect.name != "postgresql":
+        pytest.skip("partial INCLUDE index'ler postgres'e özgü")
+    import ast
+
+    with engine.connect() as conn:
+        predicate = conn.exec_driver_sql(
+            "SELECT pg_get_expr(i.indpred, i.indrelid) FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = 'ix_tx_live_user_date'"
+        ).scalar()
+    assert predicate is not None and "deleted_at IS NULL" in predicate
+
+    used = set()
+    for name, _, _, plan in plans:
+        if name in ("transactions.list", "transactions.cursor"):
+            used |= _index_names(ast.literal_eval(plan))
+    # partition'larda index adı ebeveynden türetilir (…_user_id_occurred_at_id_idx)
+    assert any(n == "ix_tx_live_user_date" or n.endswith("user_id_occurred_at_id_idx") for n in used), used
@@ -0,0 +1,212 @@
+# tests/test_import.py
+"""CSV / OFX içe aktarımı: satır bazında hata raporu, parça parça commit, rollup tutarlılığı."""
+import io
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.category import Category
+from app.services import importer
+
+P = settings.API_PREFIX
+
+
+def _categories(client, headers) -> dict[str, dict]:
+    return {c["name"]: c for c in client.get(f"{P}/categories", headers=headers).json()}
+
+
+def _day(n: int) -> str:
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def test_csv_reports_bad_rows(client, auth_headers, user_id, assert_rollups_rebuilt):
+    future = (date.today() + timedelta(days=3)).isoformat()
+    csv = (
+        "Date;Description;Amount;Category\n"
+        f"{_day(3)};Migros;-120,50;Market\n"          # 2
+        f"not-a-date;Migros;-10;Market\n"             # 3
+        f"{_day(3)};;-10;Market\n"                    # 4 başlık yok
+        f"{_day(2)};Kahve;-45.00;Yok Böyle\n"         # 5 bilinmeyen kategori
+        f"{future};Migros;-10;Market\n"               # 6 gelecek tarih
+        f"{_day(2)};Migros;0;Market\n"                # 7 sıfır tutar
+        f"{_day(1)};Maaş;\"1.234,56\";Maaş\n"         # 8
+    )
+    r = client.post(f"{P}/transactions/import", headers=auth_headers,
+                    files={"file": ("ekstre.csv", csv.encode(), "text/csv")})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["imported"] == 2
+    assert body["failed"] == 5
+    assert [e["row"] for e in body["errors"]] == [3, 4, 5, 6, 7]
+    assert "Unknown category" in body["errors"][2]["error"]
+    assert body["batches"] == [{"firstRow": 2, "lastRow": 8, "imported": 2}]
+    assert_rollups_rebuilt(user_id)
+
+
+def test_ofx_uses_default_categories(client, auth_headers, user_id, assert_rollups_rebuilt):
+    cats = _categories(client, auth_headers)
+    d = date.today() - timedelta(days=4)
+    ofx = (
+        "OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+        f"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>{d:%Y%m%d}120000[-3:TRT]<TRNAMT>-75.20<NAME>Shell<MEMO>yakıt\n</STMTTRN>\n"
+        f"<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>{d:%Y%m%d}<TRNAMT>500.00<NAME>İade\n</STMTTRN>\n"
+        f"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>{d:%Y%m%d}<TRNAMT>abc<NAME>Bozuk\n</STMTTRN>\n"
+        "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+    )
+    r = client.post(
+        f"{P}/transactions/import", headers=auth_headers,
+        files={"file": ("ekstre.ofx", ofx.encode(), "application/x-ofx")},
+        data={"expenseCategoryId": str(cats["Ulaşım"]["id"]), "incomeCategoryId": str(cats["Ek Gelir"]["id"])},
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["imported"], body["failed"]) == (2, 1)
+    assert body["errors"][0]["row"] == 3 and "amount" in body["errors"][0]["error"].lower()
+    assert_rollups_rebuilt(user_id)
+
+
+def test_ofx_tokens_split_across_chunks():
+    ofx = b"<STMTTRN><DTPOSTED>20250102<TRNAMT>-1.50<NAME>A</STMTTRN><STMTTRN><DTPOSTED>20250103<TRNAMT>2<NAME>B</STMTTRN>"
+    rows = list(importer.iter_ofx(_Chunked(ofx, 7)))
+    assert [(n, r["title"], r["amount"]) for n, r in rows] == [(1, "A", "-1.50"), (2, "B", "2")]
+
+
+class _Chunked(io.RawIOBase):
+    """read() her seferinde en fazla `size` byte döner (etiketler parça sınırında bölünür)."""
+
+    def __init__(self, data: bytes, size: int):
+        self._buf = io.BytesIO(data)
+        self._size = size
+
+    def read(self, n=-1):
+        return self._buf.read(self._size)
+
+
+class _Counting(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, n=-1):
+        out = super().read(n)
+        self.bytes_read += len(out)
+        return out
+
+    def read1(self, n=-1):
+        out = super().read1(n)
+        self.bytes_read += len(out)
+        return out
+
+    def readinto(self, b):
+        n = super().readinto(b)
+        self.bytes_read += n
+        return n
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ofx"])
+def test_readers_stream(fmt):
+    # ilk satır dosyanın tamamı okunmadan gelmeli
+    if fmt == "csv":
+        src = _Counting(b"date,title,amount\n" + b"2025-01-02,Migros,-10.00\n" * 200_000)
+        rows = importer.iter_csv(src)
+    else:
+        src = _Counting(b"<STMTTRN><DTPOSTED>20250102<TRNAMT>-10<NAME>Migros</STMTTRN>\n" * 100_000)
+        rows = importer.iter_ofx(src)
+    first = next(rows)
+    assert first[1]["title"] == "Migros"
+    assert src.bytes_read < 256 * 1024 < len(src.getbuffer())
+
+
+def _rows(n: int, category: str, start: int = 1):
+    for i in range(start, start + n):
+        yield i, {"date": _day(i % 20 + 1), "title": f"imp {i}", "amount": f"-{i}.25",
+                  "category": category, "categoryid": None, "note": None}
+
+
+def test_multi_batch_import_matches_rebuild(user_id, assert_rollups_rebuilt):
+    def rows():
+        yield from _rows(5, "Market")
+        yield 6, {"date": "bad", "title": "x", "amount": "-1", "category": "Market", "categoryid": None, "note": None}
+        yield from _rows(6, "Restoran", start=7)
+
+    db = SessionLocal()
+    try:
+        stats = importer.import_rows(db, user_id, rows(), batch_size=3)
+    finally:
+        db.close()
+    assert (stats.imported, stats.failed) == (11, 1)
+    assert [(b["firstRow"], b["lastRow"], b["imported"]) for b in stats.batches] == [
+        (1, 3, 3), (4, 7, 3), (8, 10, 3), (11, 12, 2),
+    ]
+    assert stats.errors == [{"row": 6, "error": "Invalid date: 'bad'"}]
+    assert_rollups_rebuilt(user_id)
+
+
+def _new_category(user_id: int, name: str) -> int:
+    db = SessionLocal()
+    try:
+        cat = Category(user_id=user_id, name=name, is_expense=True, color_hex="#000000", icon="x")
+        db.add(cat)
+        db.commit()
+        return cat.id
+    finally:
+        db.close()
+
+
+def _elsewhere(stmt) -> None:
+    # başka bir istek/worker
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_category_archived_mid_import_is_not_written_by_later_batches(user_id, assert_rollups_rebuilt):
+    cid = _new_category(user_id, "imp-archived")
+
+    def rows():
+        yield from _rows(4, "imp-archived")
+        _elsewhere(update(Category).where(Category.id == cid).values(is_archived=True))
+        yield from _rows(2, "imp-archived", start=5)
+
+    db = SessionLocal()
+    try:
+        stats = importer.import_rows(db, user_id, rows(), batch_size=2)
+    finally:
+        db.close()
+    assert (stats.imported, stats.failed) == (4, 2)
+    assert [e["row"] for e in stats.errors] == [5, 6]
+    assert [b["lastRow"] for b in stats.batches] == [2, 4]
+    assert_rollups_rebuilt(user_id)
+
+
+def test_category_deleted_between_read_and_insert(user_id, assert_rollups_rebuilt):
+    cid = _new_category(user_id, "imp-deleted")
+
+    def rows():
+        yield from _rows(3, "Market")
+        yield from _rows(1, "imp-deleted", start=4)      # 2. parçanın kategorileri okundu
+        _elsewhere(delete(Category).where(Category.id == cid))
+        yield from _rows(1, "imp-deleted", start=5)
+        yield from _rows(1, "Market", start=6)
+        yield from _rows(1, "imp-deleted", start=7)
+
+    db = SessionLocal()
+    try:
+        stats = importer.import_rows(db, user_id, rows(), batch_size=3)
+    finally:
+        db.close()
+    # 2. parça (4, 5, 6) IntegrityError -> süzülüp 6 yazıldı; 7 yeni parçada bilinmeyen kategori
+    assert stats.imported == 4
+    assert [(e["row"], e["error"]) for e in stats.errors] == [
+        (4, "Category was deleted during import"),
+        (5, "Category was deleted during import"),
+        (7, "Unknown category: imp-deleted"),
+    ]
+    assert [(b["firstRow"], b["lastRow"]) for b in stats.batches] == [(1, 3), (6, 6)]
+    assert_rollups_rebuilt(user_id)
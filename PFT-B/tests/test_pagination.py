@@ -0,0 +1,83 @@
+# tests/test_pagination.py
+"""GET /transactions?cursor= : (occurred_at, id) üzerinde keyset sayfalama."""
+import base64
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import settings
+
+P = settings.API_PREFIX
+# seed son 6 ayı doldurur; bu gün sadece bu testlerin satırlarını içerir
+DAY = (date.today() - timedelta(days=300)).isoformat()
+
+
+def _create(client, headers, category_id, title, day=DAY) -> int:
+    r = client.post(f"{P}/transactions", headers=headers,
+                    json={"title": title, "amount": 10, "categoryId": category_id, "date": day})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _page(client, headers, cursor="", limit=3) -> dict:
+    r = client.get(f"{P}/transactions", headers=headers,
+                   params={"start": DAY, "end": DAY, "limit": limit, "cursor": cursor})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _all_pages(client, headers, limit=3) -> list[int]:
+    ids, cursor = [], ""
+    while True:
+        page = _page(client, headers, cursor, limit)
+        ids += [t["id"] for t in page["items"]]
+        if page["nextCursor"] is None:
+            return ids
+        cursor = page["nextCursor"]
+
+
+@pytest.fixture(scope="module")
+def same_day_ids(client, auth_headers):
+    cats = client.get(f"{P}/categories", headers=auth_headers).json()
+    cid = next(c["id"] for c in cats if c["type"] == "expense")
+    return [_create(client, auth_headers, cid, f"page {i}") for i in range(7)], cid
+
+
+def test_pages_across_equal_timestamps(client, auth_headers, same_day_ids):
+    ids, _ = same_day_ids
+    got = _all_pages(client, auth_headers)
+    # hepsi aynı occurred_at: sıra id'ye göre azalan, tekrar ya da atlama yok
+    assert got == sorted(ids, reverse=True)
+    whole = _page(client, auth_headers, limit=7)
+    assert len(whole["items"]) == 7 and whole["nextCursor"] is None
+
+
+def test_inserts_between_pages_do_not_shift_later_pages(client, auth_headers, same_day_ids):
+    _, cid = same_day_ids
+    before = _all_pages(client, auth_headers)
+
+    first = _page(client, auth_headers)
+    new_id = _create(client, auth_headers, cid, "inserted between pages")
+    rest, cursor = [], first["nextCursor"]
+    while cursor:
+        page = _page(client, auth_headers, cursor)
+        rest += [t["id"] for t in page["items"]]
+        cursor = page["nextCursor"]
+
+    # offset modunda yeni satır her şeyi bir kaydırırdı (tekrar); cursor'da sonraki sayfalar aynı
+    assert [t["id"] for t in first["items"]] + rest == before
+    assert new_id not in rest
+    assert _all_pages(client, auth_headers)[0] == new_id
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!!",
+    base64.urlsafe_b64encode(b"no separator").decode(),
+    base64.urlsafe_b64encode(b"2025-01-01T00:00:00+00:00|abc").decode(),
+    base64.urlsafe_b64encode(b"yesterday|12").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_malformed_cursor_is_400(client, auth_headers, cursor):
+    r = client.get(f"{P}/transactions", headers=auth_headers, params={"cursor": cursor})
+    assert r.status_code == 400, r.text
+    assert r.json()["detail"] == "Invalid cursor"
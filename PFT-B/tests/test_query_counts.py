@@ -0,0 +1,70 @@
+# tests/test_query_counts.py
+"""
+Dashboard / rapor endpoint'lerinin attığı SQL sayısı sabit kalmalı (analytics.summarize:
+kategori/bütçe/işlem sayısından bağımsız, birkaç round-trip). Sayı değişirse bilerek
+güncellenmeli; sessizce N sorguya büyümemeli.
+"""
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.core.cache import result_cache
+from app.core.config import settings
+
+PREFIX = settings.API_PREFIX or ""
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+
+
+def _month(offset: int = 0) -> str:
+    today = date.today()
+    y, m = divmod(today.year * 12 + today.month - 1 - offset, 12)
+    return f"{y:04d}-{m + 1:02d}"
+
+
+def _get(client, engine, headers, path, params):
+    client.get(PREFIX + path, params=params, headers=headers)     # auth / katalog / recurring ısınsın
+    result_cache.clear()
+    with count_queries(engine) as statements:
+        r = client.get(PREFIX + path, params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return statements
+
+
+# data_version (1) + analytics.summarize: rollup/bütçe birleşimi (1) + son işlemler (1)
+@pytest.mark.parametrize("month_offset", [0, 2])
+def test_dashboard_summary_query_count(client, engine, auth_headers, month_offset):
+    statements = _get(client, engine, auth_headers, "/dashboard/summary", {"month": _month(month_offset)})
+    assert len(statements) == 3, statements
+
+
+# data_version (1) + summarize: aggregate union (1) + son işlemler (1) + anomalies: istatistik (1)
+# + adaylar (1); recurring aynı data_version'da sorgusuz. Aralık uzunluğu/granularity sayıyı değiştirmez.
+@pytest.mark.parametrize("params", [
+    {"month": _month(0)},
+    {"month": _month(2)},
+    {"start": _month(5), "end": _month(0)},
+    {"start": _month(3), "end": _month(1), "granularity": "week"},
+])
+def test_reports_query_count(client, engine, auth_headers, params):
+    statements = _get(client, engine, auth_headers, "/reports", params)
+    assert len(statements) == 5, statements
+
+
+def test_reports_sections_only_query_what_they_need(client, engine, auth_headers):
+    statements = _get(client, engine, auth_headers, "/reports", {"month": _month(0), "include": "recent"})
+    assert len(statements) == 2, statements
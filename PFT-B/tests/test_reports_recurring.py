@@ -0,0 +1,36 @@
+# tests/test_reports_recurring.py
+"""recurring'deki `active` bugüne bağlı: veri değişmese de gün dönünce ETag ve cache değişmeli."""
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.services import recurring
+
+P = settings.API_PREFIX
+
+
+def _report(client, headers, include, etag=None):
+    h = dict(headers)
+    if etag:
+        h["If-None-Match"] = etag
+    return client.get(f"{P}/reports", headers=h,
+                      params={"month": date.today().strftime("%Y-%m"), "include": include})
+
+
+def test_recurring_etag_and_cache_follow_the_day(client, auth_headers, monkeypatch):
+    r = _report(client, auth_headers, "recurring")
+    assert r.status_code == 200, r.text
+    etag = r.headers["ETag"]
+    assert _report(client, auth_headers, "recurring", etag).status_code == 304
+
+    later = date.today() + timedelta(days=400)
+    monkeypatch.setattr(recurring, "current_day", lambda: later)
+    r = _report(client, auth_headers, "recurring", etag)
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert not any(s["active"] for s in r.json()["recurring"])
+
+
+def test_etag_without_recurring_ignores_the_day(client, auth_headers, monkeypatch):
+    etag = _report(client, auth_headers, "kpis").headers["ETag"]
+    monkeypatch.setattr(recurring, "current_day", lambda: date.today() + timedelta(days=400))
+    assert _report(client, auth_headers, "kpis", etag).status_code == 304
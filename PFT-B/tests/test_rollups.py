@@ -0,0 +1,95 @@
+# tests/test_rollups.py
+"""Yazma yolu rollup'ları artımlı günceller; sonuç her adımda `rollups.rebuild` ile aynı olmalı."""
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.rollup import MonthlyRollup
+from app.models.transaction import Transaction
+from app.services import retention
+
+P = settings.API_PREFIX
+
+
+def _cats(client, headers) -> dict[str, int]:
+    return {c["name"]: c["id"] for c in client.get(f"{P}/categories", headers=headers).json()}
+
+
+def _day(n: int) -> str:
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def test_single_writes_match_rebuild(client, auth_headers, user_id, assert_rollups_rebuilt):
+    cats = _cats(client, auth_headers)
+    r = client.post(f"{P}/transactions", headers=auth_headers,
+                    json={"title": "rollup", "amount": 100.5, "categoryId": cats["Market"], "date": _day(10)})
+    assert r.status_code == 201, r.text
+    tx_id = r.json()["id"]
+    assert_rollups_rebuilt(user_id)
+
+    for patch in (
+        {"amount": 99999.99},                    # kovanın yeni max'ı
+        {"amount": 12.3},                        # max geri hesaplanır
+        {"categoryId": cats["Restoran"]},        # kova değişir
+        {"categoryId": cats["Maaş"]},            # gider -> gelir
+        {"date": _day(45)},                      # başka ay / gün
+    ):
+        r = client.patch(f"{P}/transactions/{tx_id}", headers=auth_headers, json=patch)
+        assert r.status_code == 200, r.text
+        assert_rollups_rebuilt(user_id)
+
+    assert client.delete(f"{P}/transactions/{tx_id}", headers=auth_headers).status_code == 204
+    assert_rollups_rebuilt(user_id)
+
+
+def test_batch_matches_rebuild(client, auth_headers, user_id, assert_rollups_rebuilt):
+    cats = _cats(client, auth_headers)
+    existing = client.get(f"{P}/transactions", headers=auth_headers, params={"limit": 3}).json()
+    ops = [
+        {"op": "create", "data": {"title": "b1", "amount": 5000, "categoryId": cats["Giyim"], "date": _day(3)}},
+        {"op": "create", "data": {"title": "b2", "amount": 7, "categoryId": cats["Giyim"], "date": _day(3)}},
+        {"op": "update", "id": existing[0]["id"], "data": {"amount": 1.5, "categoryId": cats["Eğlence"]}},
+        {"op": "update", "id": existing[1]["id"], "data": {"date": _day(70)}},
+        {"op": "delete", "id": existing[2]["id"]},
+    ]
+    r = client.post(f"{P}/transactions/batch", headers=auth_headers, json={"ops": ops})
+    assert r.status_code == 200, r.text
+    assert r.json()["failed"] == 0
+    assert_rollups_rebuilt(user_id)
+
+
+def test_delete_in_archived_month_keeps_archived_max(client, auth_headers, user_id, assert_rollups_rebuilt):
+    db = SessionLocal()
+    try:
+        oldest = db.scalar(select(func.min(Transaction.occurred_at)).where(
+            Transaction.user_id == user_id, Transaction.deleted_at.is_(None)))
+        month = date(oldest.year, oldest.month, 1)
+        cutoff = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        retention.archive_before(db, cutoff=cutoff, user_id=user_id)     # sadece en eski ay
+        bucket = db.execute(
+            select(MonthlyRollup)
+            .where(MonthlyRollup.user_id == user_id, MonthlyRollup.month_start == month)
+            .order_by(MonthlyRollup.max_amount.desc())
+        ).scalars().first()
+        archived_max = bucket.max_amount
+        key = (bucket.category_id, bucket.type)
+    finally:
+        db.close()
+    assert archived_max > 0
+
+    # arşivlenmiş aya geriye dönük işlem: kovanın max'ı olur, silinince arşivdekine dönmeli
+    r = client.post(f"{P}/transactions", headers=auth_headers, json={
+        "title": "backdated", "amount": float(archived_max) + 1000, "categoryId": key[0],
+        "date": (month + timedelta(days=2)).isoformat(),
+    })
+    assert r.status_code == 201, r.text
+    assert client.delete(f"{P}/transactions/{r.json()['id']}", headers=auth_headers).status_code == 204
+
+    db = SessionLocal()
+    try:
+        assert db.get(MonthlyRollup, (user_id, month, *key)).max_amount == archived_max
+    finally:
+        db.close()
+    assert_rollups_rebuilt(user_id)
@@ -0,0 +1,59 @@
+# tests/test_search.py
+"""?q= araması: kelime başı (FTS / tsvector) ve alt dizgi (LIKE) eşleşmeleri."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import settings
+
+P = settings.API_PREFIX
+DAY = (date.today() - timedelta(days=320)).isoformat()
+
+
+@pytest.fixture(scope="module")
+def rows(client, auth_headers) -> dict[str, int]:
+    cid = next(c["id"] for c in client.get(f"{P}/categories", headers=auth_headers).json() if c["type"] == "expense")
+    out = {}
+    for title, note in (
+        ("Qoffeehouse latte", None),
+        ("Morning Qcoffee", "with Zyxcroissant"),
+        ("Qtea shop", "bought Qcoffee beans"),
+        ("Çiğköfte Qdürüm", None),
+        ("Qcoffeemaker descaler", None),
+        ("Maxiqteapot refill", None),
+    ):
+        r = client.post(f"{P}/transactions", headers=auth_headers,
+                        json={"title": title, "amount": 10, "categoryId": cid, "date": DAY, "note": note})
+        assert r.status_code == 201, r.text
+        out[title] = r.json()["id"]
+    return out
+
+
+def _search(client, headers, q, **params) -> list[int]:
+    r = client.get(f"{P}/transactions", headers=headers, params={"q": q, "start": DAY, "end": DAY, **params})
+    assert r.status_code == 200, r.text
+    return [t["id"] for t in r.json()]
+
+
+def test_prefix_match(client, auth_headers, rows):
+    assert sorted(_search(client, auth_headers, "qcoff")) == sorted(
+        [rows["Morning Qcoffee"], rows["Qtea shop"], rows["Qcoffeemaker descaler"]])
+    assert _search(client, auth_headers, "qcoffee qtea") == [rows["Qtea shop"]]     # kelimeler AND
+    assert _search(client, auth_headers, "zyxcro") == [rows["Morning Qcoffee"]]     # note
+    assert _search(client, auth_headers, "qdür") == [rows["Çiğköfte Qdürüm"]]
+
+
+def test_substring_match(client, auth_headers, rows):
+    # kelime ortası: FTS ön eki bulmaz, alt dizgi bulur
+    assert set(_search(client, auth_headers, "ffee")) == {
+        rows["Qoffeehouse latte"], rows["Morning Qcoffee"], rows["Qtea shop"], rows["Qcoffeemaker descaler"]}
+    assert _search(client, auth_headers, "house lat") == [rows["Qoffeehouse latte"]]
+    assert _search(client, auth_headers, "xcroiss") == [rows["Morning Qcoffee"]]
+    assert _search(client, auth_headers, "nothing-like-this") == []
+
+
+def test_relevance_puts_word_matches_first(client, auth_headers, rows):
+    # "Qtea shop" kelime başı (FTS), "Maxiqteapot" sadece alt dizgi; id sırası tersi
+    assert rows["Maxiqteapot refill"] > rows["Qtea shop"]
+    assert _search(client, auth_headers, "qtea", sort="relevance") == [rows["Qtea shop"], rows["Maxiqteapot refill"]]
+    assert _search(client, auth_headers, "qtea") == [rows["Maxiqteapot refill"], rows["Qtea shop"]]
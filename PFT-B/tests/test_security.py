@@ -0,0 +1,79 @@
+# tests/test_security.py
+import threading
+import time
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+
+
+@pytest.fixture
+def hash_pool(monkeypatch):
+    # import'tan sonra yapılan ayar değişikliği pool ve slot sayısına yansımalı
+    security.shutdown_hash_pool()
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_TIMEOUT_SECONDS", 0.2)
+    yield
+    security.shutdown_hash_pool()
+
+
+def test_slot_held_until_timed_out_job_finishes(hash_pool):
+    with pytest.raises(security.PasswordHasherBusy):
+        security._run_hashing(time.sleep, 1.0)
+    # istek timeout ile döndü ama iş hâlâ pool'da: tek slot dolu
+    assert not security._get_pool()[1].acquire(blocking=False)
+
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            assert security._run_hashing(abs, -1) == 1
+            break
+        except security.PasswordHasherBusy:
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+
+
+def test_shutdown_keeps_in_flight_jobs_on_their_own_slots(hash_pool):
+    _, old_slots = security._get_pool()
+    with pytest.raises(security.PasswordHasherBusy):
+        security._run_hashing(time.sleep, 0.5)
+    security.shutdown_hash_pool()
+
+    # yeni pool yeni slot'larla gelir; eski iş bittiğinde kendi semaforunu bırakır
+    pool, slots = security._get_pool()
+    assert slots is not old_slots
+    assert slots.acquire(blocking=False)
+    slots.release()
+    deadline = time.monotonic() + 10
+    while not old_slots.acquire(blocking=False):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_requests_during_shutdown_fail_as_busy(hash_pool, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 4)
+    errors, stop = [], threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                assert security._run_hashing(abs, -1) == 1
+            except security.PasswordHasherBusy:
+                pass
+            except BaseException as e:      # None slot, kapanmış pool'a submit, ...
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(3):
+            time.sleep(0.3)
+            security.shutdown_hash_pool()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join(timeout=30)
+    assert errors == []
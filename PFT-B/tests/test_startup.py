@@ -0,0 +1,68 @@
+# tests/test_startup.py
+"""app.main import'u yan etkisiz olmalı; şema sqlite'ta startup'ta, postgres'te Alembic ile kurulur.
+Her senaryo ayrı bir interpreter'da (bu oturum app.main'i zaten import etti)."""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(code: str, tmp_path, **env) -> subprocess.CompletedProcess:
+    full_env = {k: v for k, v in os.environ.items() if k != "DB_AUTO_CREATE"}
+    full_env.update(DATABASE_URL=f"sqlite:///{tmp_path}/fresh.db", **env)
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=full_env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_import_opens_no_connection(tmp_path):
+    proc = _python(
+        "import sys, app.main, app.db.session as s\n"
+        "assert s._engine is None, 'engine created at import'\n"
+        "lazy = [m for m in ('passlib', 'jose', 'concurrent.futures.process') if m in sys.modules]\n"
+        "assert not lazy, lazy\n",
+        tmp_path,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert not (tmp_path / "fresh.db").exists()
+
+
+def test_sqlite_schema_created_on_startup(tmp_path):
+    proc = _python(
+        "from fastapi.testclient import TestClient\n"
+        "from sqlalchemy import inspect\n"
+        "from app.main import app\n"
+        "from app.db.session import get_engine\n"
+        "with TestClient(app) as c:\n"
+        "    assert inspect(get_engine()).has_table('transactions')\n"
+        "    assert c.get('/health').status_code == 200\n",
+        tmp_path,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_missing_schema_is_logged_when_auto_create_off(tmp_path):
+    proc = _python(
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "with TestClient(app):\n"
+        "    pass\n",
+        tmp_path, DB_AUTO_CREATE="false",
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "database has no schema" in proc.stderr
+
+
+def test_import_time_gate(tmp_path):
+    # CLI kapısı: motor import'ta kurulursa ya da süre sınırı aşılırsa exit != 0
+    out = tmp_path / "import.json"
+    proc = subprocess.run(
+        [sys.executable, "-m", "app.cli", "import-time", "--runs", "1", "--max-ms", "5000", "--out", str(out)],
+        cwd=ROOT, env={**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/fresh.db"},
+        capture_output=True, text=True, timeout=300,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    result = json.loads(out.read_text())
+    assert 0 < result["importAppMainMs"] <= 5000
+    assert not (tmp_path / "fresh.db").exists()
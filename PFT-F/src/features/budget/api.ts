@@ -1,5 +1,5 @@
 import { getJSON, postJSON, apiFetch } from "../../lib/api";
-import type { Budget, BudgetCreate, BudgetUpdate } from "../../types/budget";
+import type { Budget, BudgetCreate, BudgetUpdate, BudgetNotification } from "../../types/budget";
 
 // Liste
 export async function fetchBudgets(month?: string): Promise<Budget[]> {
@@ -31,3 +31,12 @@ export async function deleteBudget(id: string): Promise<{ id: string }> {
   if (!res.ok) throw new Error(await res.text());
   return res.json(); 
 }
+
+// Eşik bildirimleri
+export async function fetchNotifications(unread = false): Promise<BudgetNotification[]> {
+  return getJSON<BudgetNotification[]>(`/notifications${unread ? "?unread=true" : ""}`);
+}
+
+export async function markNotificationRead(id: number): Promise<BudgetNotification> {
+  return postJSON<BudgetNotification>(`/notifications/${id}/read`, {});
+}
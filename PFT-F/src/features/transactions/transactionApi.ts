@@ -1,5 +1,5 @@
-import { getJSON, postJSON } from "../../lib/api";
-import type { Tx, TxCreate, TxUpdate } from "../../types/transactions";
+import { apiFetch, getJSON, postJSON, postForm } from "../../lib/api";
+import type { Tx, TxCreate, TxUpdate, TxPage, TxImportResult, TxBatchOp, TxBatchResult } from "../../types/transactions";
 
 export type TxListParams = {
   start?: string;               // YYYY-MM-DD
@@ -28,6 +28,43 @@ export async function listTransactions(params?: TxListParams): Promise<Tx[]> {
   return getJSON<Tx[]>(`/transactions${qs(params)}`);
 }
 
+/** Keyset sayfalama: ilk sayfa için cursor verme, sonra nextCursor'ı geri gönder */
+export async function listTransactionsPage(
+  params?: Omit<TxListParams, "offset">,
+  cursor?: string | null,
+): Promise<TxPage> {
+  const s = qs(params);
+  const c = `cursor=${encodeURIComponent(cursor ?? "")}`;
+  return getJSON<TxPage>(`/transactions${s ? `${s}&${c}` : `?${c}`}`);
+}
+
+// Filtrelenmiş tüm işlemler (limit yok); dosya olarak indirmek için Blob döner
+export async function exportTransactions(
+  params?: Omit<TxListParams, "limit" | "offset">,
+  format: "csv" | "ndjson" = "csv",
+): Promise<Blob> {
+  const res = await apiFetch(`/transactions/export${qs({ ...params, format })}`);
+  if (!res.ok) throw new Error(`${res.status} ${res.statusText}`);
+  return res.blob();
+}
+
+export async function importTransactions(
+  file: File,
+  opts?: { format?: "csv" | "ofx"; expenseCategoryId?: number; incomeCategoryId?: number },
+): Promise<TxImportResult> {
+  const form = new FormData();
+  form.append("file", file);
+  if (opts?.format) form.append("format", opts.format);
+  if (opts?.expenseCategoryId != null) form.append("expenseCategoryId", String(opts.expenseCategoryId));
+  if (opts?.incomeCategoryId != null) form.append("incomeCategoryId", String(opts.incomeCategoryId));
+  return postForm<TxImportResult>("/transactions/import", form);
+}
+
+// Toplu işlem (en fazla 1000 öğe); öğe bazında sonuç döner
+export async function batchTransactions(ops: TxBatchOp[]): Promise<TxBatchResult> {
+  return postJSON<TxBatchResult>("/transactions/batch", { ops });
+}
+
 export async function createTransaction(payload: TxCreate): Promise<Tx> {
   return postJSON<Tx>("/transactions", payload);
 }
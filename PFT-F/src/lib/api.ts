@@ -58,6 +58,16 @@ export async function postJSON<T>(path: string, body: unknown): Promise<T> {
   return res.json();
 }
 
+// multipart (dosya yükleme); Content-Type'ı boundary ile tarayıcı koyar
+export async function postForm<T>(path: string, form: FormData): Promise<T> {
+  const res = await apiFetch(path, { method: "POST", body: form });
+  if (!res.ok) {
+    const msg = await safeError(res);
+    throw new Error(msg);
+  }
+  return res.json();
+}
+
 export async function getJSON<T>(path: string): Promise<T> {
   const res = await apiFetch(path);
   if (!res.ok) {
@@ -24,6 +24,8 @@ import type {
   CashflowMonthly,
   CatStat,
   BudgetUsage,
+  RecurringItem,
+  AnomalyItem,
 } from "../types/reports";
 
 /* ------------------------ helpers ------------------------ */
@@ -296,12 +298,12 @@ export default function ReportsPage() {
             <Largest tx={data?.kpis.largestExpense ?? null} currency={currency} loading={isLoading} />
           </Card>
 
-          <Card title="Recurring (preview)" subtitle="Detected patterns">
-            <TinyList rows={data?.recurring ?? []} />
+          <Card title="Recurring" subtitle="Detected patterns">
+            <RecurringList rows={data?.recurring ?? []} currency={currency} loading={isLoading} />
           </Card>
 
-          <Card title="Anomalies (preview)" subtitle="Outliers & spikes">
-            <TinyList rows={data?.anomalies ?? []} />
+          <Card title="Anomalies" subtitle="Unusually large expenses">
+            <AnomalyList rows={data?.anomalies ?? []} currency={currency} loading={isLoading} />
           </Card>
         </div>
 
@@ -490,13 +492,43 @@ function Largest({ tx, currency, loading }: { tx: ReportTxMini | null | undefine
   );
 }
 
-function TinyList({ rows }: { rows: Array<Record<string, unknown>> }) {
-  if (!rows?.length) return <div className="text-sm text-white/60">No data.</div>;
+function RecurringList({ rows, currency, loading }: { rows: RecurringItem[]; currency: string; loading?: boolean }) {
+  if (loading) return <Skeleton w={220} h={64} />;
+  if (!rows.length) return <div className="text-sm text-white/60">No data.</div>;
   return (
     <ul className="space-y-2 text-sm">
-      {rows.slice(0, 6).map((r, i) => (
-        <li key={i} className="rounded-lg border border-white/10 bg-white/5 p-2 text-white/70">
-          {JSON.stringify(r)}
+      {rows.slice(0, 6).map((r) => (
+        <li
+          key={`${r.type}:${r.title}:${r.cadence}:${r.amount}`}
+          className={cn("flex items-center justify-between rounded-lg border border-white/10 bg-white/5 p-2", !r.active && "opacity-60")}
+        >
+          <div>
+            <div className="text-white/80">{r.title}</div>
+            <div className="text-[11px] text-white/50">
+              {r.cadence} · next {r.nextDate}
+            </div>
+          </div>
+          <span className={r.type === "income" ? "text-emerald-300" : "text-white/70"}>{fmtCurrency(r.amount, currency)}</span>
+        </li>
+      ))}
+    </ul>
+  );
+}
+
+function AnomalyList({ rows, currency, loading }: { rows: AnomalyItem[]; currency: string; loading?: boolean }) {
+  if (loading) return <Skeleton w={220} h={64} />;
+  if (!rows.length) return <div className="text-sm text-white/60">No data.</div>;
+  return (
+    <ul className="space-y-2 text-sm">
+      {rows.slice(0, 6).map((r) => (
+        <li key={r.transactionId} className="flex items-center justify-between rounded-lg border border-white/10 bg-white/5 p-2">
+          <div>
+            <div className="text-white/80">{r.title}</div>
+            <div className="text-[11px] text-white/50">
+              {r.date} · typical {fmtCurrency(r.typicalAmount, currency)}
+            </div>
+          </div>
+          <span className="text-rose-300">{fmtCurrency(r.amount, currency)}</span>
         </li>
       ))}
     </ul>
@@ -16,9 +16,24 @@ export const BudgetSchema = z.object({
   limit: z.number().nonnegative(),
   month: z.string(), // yyyy-mm
   note: z.string().optional(),
+  spent: z.number().optional(), // ayın gider toplamı
 });
 export type Budget = z.infer<typeof BudgetSchema>;
 
+// bütçe eşiği (%80 / %100) geçildiğinde backend'in yazdığı bildirim
+export type BudgetNotification = {
+  id: number;
+  kind: "budget_threshold";
+  budgetId: number | null;
+  categoryId: number | null;
+  month: string | null;
+  threshold: number | null;
+  spent: number | null;
+  limit: number | null;
+  createdAt: string;
+  read: boolean;
+};
+
 
 export const BudgetCreateSchema = BudgetSchema.pick({
   categoryId: true, limit: true, month: true, note: true,
@@ -59,6 +59,35 @@ export type BudgetUsage = {
   status: "ok" | "hit" | "over";
 };
 
+// app/services/recurring.py: normalize başlık + düzenli aralık
+export type RecurringItem = {
+  title: string;
+  type: TxType;
+  categoryId: number | null;
+  cadence: "weekly" | "biweekly" | "monthly" | "quarterly" | "yearly";
+  intervalDays: number;
+  amount: number;      // medyan
+  lastAmount: number;
+  count: number;
+  firstDate: string;   // "YYYY-MM-DD"
+  lastDate: string;
+  nextDate: string;    // beklenen sonraki tarih
+  active: boolean;
+};
+
+// app/services/anomalies.py: kategori başına ln(tutar) z-skoru
+export type AnomalyItem = {
+  transactionId: number;
+  title: string;
+  categoryId: number | null;
+  amount: number;
+  date: string;          // "YYYY-MM-DD"
+  score: number | null;  // null: kategoride sapma yok
+  typicalAmount: number;
+  p95Amount: number;
+  reason: "amount";
+};
+
 export type ReportOut = {
   period: { start: string; end: string };       // YYYY-MM
   currency: string;                              // e.g. "USD"
@@ -66,12 +95,13 @@ export type ReportOut = {
   cashflow: {
     daily: CashflowDaily[];
     monthly: CashflowMonthly[];
+    granularity?: "day" | "week" | "month" | "quarter"; // daily[].date = kovanın ilk günü
   };
   byCategory: CatStat[];
   budgetUsage: BudgetUsage[];
   recent: ReportTxMini[];
-  recurring: Array<Record<string, unknown>>;     // optional stub
-  anomalies: Array<Record<string, unknown>>;     // optional stub
+  recurring: RecurringItem[];
+  anomalies: AnomalyItem[];
 };
 
 // Sorgu parametreleri: ya month ya da (start & end)
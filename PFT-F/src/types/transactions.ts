@@ -38,6 +38,40 @@ export type TxListParams = {
 
 export type TxListResponse = Tx[];   // simple array
 
+// ?cursor= modu (keyset sayfalama)
+export type TxPage = {
+  items: Tx[];
+  nextCursor: string | null;   // null => son sayfa
+};
+
+// POST /transactions/import
+export type TxImportResult = {
+  imported: number;
+  failed: number;
+  errors: { row: number; error: string }[];   // en fazla 500 satır
+  // commit edilen parçalar: aralıktaki geçerli satırlar yazıldı (hatalılar `errors`da)
+  batches: { firstRow: number; lastRow: number; imported: number }[];
+};
+
+// POST /transactions/batch
+export type TxBatchOp =
+  | { op: "create"; data: TxCreate }
+  | { op: "update"; id: number; data: TxUpdate }
+  | { op: "delete"; id: number };
+
+export type TxBatchResult = {
+  succeeded: number;
+  failed: number;
+  results: {
+    index: number;
+    op: TxBatchOp["op"];
+    status: number;        // 201 | 200 | 204 | 404 | 409
+    id?: number | null;
+    item?: Tx | null;
+    error?: string | null;
+  }[];
+};
+
 export type TxDetailResponse = Tx;
 
 export type TxDeleteResponse = {